@@ -0,0 +1,68 @@
+# benchmark_api_model.py
+# Memory and lookup speed of the raw framework_api_details.json dicts versus the slotted ApiModel.
+# Usage: python benchmark_api_model.py [framework_api_details.json]
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from framework_training.generators.utils.api_model import ApiModel
+
+DEFAULT_FILE = "framework_api_details.json"
+
+
+def load_dicts(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('api_objects', []) if isinstance(data, dict) else data
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def best_of(function, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE
+    api_objects, dict_bytes, dict_peak = measure(lambda: load_dicts(filepath))
+    model, model_bytes, model_peak = measure(lambda: ApiModel.from_json_file(filepath))
+
+    names = [obj['object_name'].lower() for obj in api_objects if obj.get('object_type_short') == 'P'] * 20
+
+    def dict_lookups():
+        # What each analyzer did: rebuild the lookup, then re-derive full names per hit
+        procedures = {obj['object_name'].lower(): obj for obj in api_objects if obj.get('object_type_short') == 'P'}
+        for name in names:
+            obj = procedures[name]
+            f"{obj['schema_name']}.{obj['object_name']}"
+
+    def model_lookups():
+        procedures = model.procedures_by_lower_name
+        for name in names:
+            procedures[name].full_name
+
+    dict_seconds, model_seconds = best_of(dict_lookups), best_of(model_lookups)
+    print(f"--- API Model Benchmark ({len(api_objects)} objects, {len(names):,} lookups) ---")
+    print(f"{'':<14} {'Retained bytes':>15} {'Peak bytes':>15} {'Lookup s':>10}")
+    print(f"{'raw dicts':<14} {dict_bytes:>15,} {dict_peak:>15,} {dict_seconds:>10.4f}")
+    print(f"{'ApiModel':<14} {model_bytes:>15,} {model_peak:>15,} {model_seconds:>10.4f}")
+    print(f"Memory saved: {1 - model_bytes / dict_bytes:.0%}, lookups {dict_seconds / model_seconds:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
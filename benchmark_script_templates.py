@@ -0,0 +1,331 @@
+# benchmark_script_templates.py
+# Examples per second of the compiled script templates versus the line-by-line builders they replaced.
+# Usage: python benchmark_script_templates.py [framework_api_details.json]
+
+import sys
+import time
+from framework_training.generators.utils.api_model import ApiModel
+from framework_training.generators.utils.script_shapes import SCRIPT_TEMPLATES
+from framework_training.generators.synthetic_training_generator import (
+    crud_script_context, error_handling_script_context, generate_sample_value, multi_procedure_script_context
+)
+
+DEFAULT_FILE = "framework_api_details.json"
+ROUNDS = 5
+
+
+# --- Previous implementations (string literals appended line by line), kept as the baseline ---
+
+def legacy_create_pattern(proc):
+    """Generate creation workflow pattern."""
+    lines = []
+    
+    lines.append("-- Validation before creation")
+    lines.append("IF @user_id IS NULL")
+    lines.append("BEGIN")
+    lines.append("    RAISERROR('User context required for creation', 16, 1);")
+    lines.append("    RETURN;")
+    lines.append("END;")
+    lines.append("")
+    
+    lines.append("-- Create new record")
+    lines.append("BEGIN TRY")
+    lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
+    
+    # Add sample parameters
+    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
+    if params:
+        sample_params = []
+        for param in params[:4]:  # Limit for readability
+            param_name = param['name']
+            if 'user_id' in param_name.lower():
+                sample_params.append(f"{param_name} = @user_id")
+            elif 'id' in param_name.lower() and param_name != '@user_id':
+                sample_params.append(f"{param_name} = @card_id")
+            else:
+                sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
+                sample_params.append(f"{param_name} = {sample_value}")
+        
+        lines.append("        " + ", ".join(sample_params) + ";")
+    else:
+        lines[-1] += ";"
+    
+    lines.append("")
+    lines.append("    PRINT 'Record created successfully';")
+    lines.append("END TRY")
+    lines.append("BEGIN CATCH")
+    lines.append("    PRINT 'Creation failed: ' + ERROR_MESSAGE();")
+    lines.append("    THROW;")
+    lines.append("END CATCH;")
+    
+    return lines
+
+
+def legacy_error_handling_script(proc, patterns):
+    """Generate comprehensive error handling script."""
+    script_lines = []
+    
+    script_lines.append(f"-- Comprehensive error handling example for {proc['object_name']}")
+    script_lines.append("")
+    
+    script_lines.append("-- Error handling variables")
+    script_lines.append("DECLARE @error_number int;")
+    script_lines.append("DECLARE @error_message nvarchar(4000);")
+    script_lines.append("DECLARE @error_severity int;")
+    script_lines.append("DECLARE @error_state int;")
+    script_lines.append("")
+    
+    # Add procedure parameters
+    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
+    if params:
+        script_lines.append("-- Procedure parameters")
+        for param in params[:3]:
+            param_name = param['name']
+            param_type = param.get('type_from_sys', 'nvarchar(255)')
+            sample_value = generate_sample_value(param_name, param_type)
+            script_lines.append(f"DECLARE {param_name} {param_type} = {sample_value};")
+        script_lines.append("")
+    
+    script_lines.append("-- Main execution with comprehensive error handling")
+    script_lines.append("BEGIN TRY")
+    script_lines.append("    -- Pre-execution validation")
+    script_lines.append("    IF @user_id IS NULL")
+    script_lines.append("        THROW 50001, 'User context is required', 1;")
+    script_lines.append("")
+    script_lines.append("    -- Execute the procedure")
+    script_lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
+    
+    if params:
+        param_assignments = [f"{p['name']} = {p['name']}" for p in params[:3]]
+        script_lines.append("        " + ", ".join(param_assignments) + ";")
+    else:
+        script_lines[-1] += ";"
+    
+    script_lines.append("")
+    script_lines.append("    -- Success handling")
+    script_lines.append("    PRINT 'Operation completed successfully';")
+    script_lines.append("")
+    script_lines.append("END TRY")
+    script_lines.append("BEGIN CATCH")
+    script_lines.append("    -- Capture error details")
+    script_lines.append("    SELECT")
+    script_lines.append("        @error_number = ERROR_NUMBER(),")
+    script_lines.append("        @error_message = ERROR_MESSAGE(),")
+    script_lines.append("        @error_severity = ERROR_SEVERITY(),")
+    script_lines.append("        @error_state = ERROR_STATE();")
+    script_lines.append("")
+    script_lines.append("    -- Log the error (if logging procedure exists)")
+    script_lines.append("    -- EXEC sp_sys_log_error @error_message, @error_number;")
+    script_lines.append("")
+    script_lines.append("    -- Handle different types of errors")
+    script_lines.append("    IF @error_number = 2 -- File not found")
+    script_lines.append("        PRINT 'Resource not found: ' + @error_message;")
+    script_lines.append("    ELSE IF @error_number BETWEEN 50000 AND 59999 -- Custom errors")
+    script_lines.append("        PRINT 'Business logic error: ' + @error_message;")
+    script_lines.append("    ELSE")
+    script_lines.append("        PRINT 'System error occurred: ' + @error_message;")
+    script_lines.append("")
+    script_lines.append("    -- Re-throw the error for upstream handling")
+    script_lines.append("    THROW;")
+    script_lines.append("END CATCH;")
+    
+    return "\n".join(script_lines)
+
+
+def legacy_multi_procedure_script(proc_names, framework_api_details, patterns):
+    """Generate script using multiple related procedures."""
+    script_lines = []
+    
+    script_lines.append(f"-- Multi-procedure workflow using {len(proc_names)} related procedures")
+    script_lines.append(f"-- Procedures: {', '.join([name.split('.')[-1] for name in proc_names])}")
+    script_lines.append("")
+    
+    script_lines.append("-- Common context and workflow variables")
+    script_lines.append("DECLARE @user_id int = @user_id; -- From context")
+    script_lines.append("DECLARE @card_id int = @card_id; -- From context")
+    script_lines.append("DECLARE @workflow_success bit = 1;")
+    script_lines.append("DECLARE @step_result int;")
+    script_lines.append("")
+    
+    script_lines.append("-- Begin transaction for data consistency")
+    script_lines.append("BEGIN TRANSACTION;")
+    script_lines.append("")
+    script_lines.append("BEGIN TRY")
+    
+    # Generate calls for each procedure
+    for i, proc_name in enumerate(proc_names[:4], 1):  # Limit to 4 for readability
+        proc_obj = next(
+            (obj for obj in framework_api_details 
+             if f"{obj['schema_name']}.{obj['object_name']}" == proc_name),
+            None
+        )
+        
+        if proc_obj:
+            script_lines.append("")
+            script_lines.append(f"    -- Step {i}: {proc_obj['object_name']}")
+            script_lines.append(f"    EXEC {proc_name}")
+            
+            # Add relevant parameters
+            params = [p for p in proc_obj.get('parameters', []) if p.get('name') != '[Return Value]']
+            if params:
+                sample_params = []
+                for param in params[:3]:
+                    param_name = param['name']
+                    if 'user_id' in param_name.lower():
+                        sample_params.append(f"{param_name} = @user_id")
+                    elif 'id' in param_name.lower() and 'user_id' not in param_name.lower():
+                        sample_params.append(f"{param_name} = @card_id")
+                    else:
+                        sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
+                        sample_params.append(f"{param_name} = {sample_value}")
+                
+                script_lines.append("        " + ", ".join(sample_params) + ";")
+            else:
+                script_lines[-1] += ";"
+            
+            script_lines.append(f"    ")
+            script_lines.append(f"    -- Verify step {i} success")
+            script_lines.append("    IF @@ROWCOUNT = 0")
+            script_lines.append("    BEGIN")
+            script_lines.append(f"        SET @workflow_success = 0;")
+            script_lines.append(f"        RAISERROR('Step {i} failed - no rows affected', 16, 1);")
+            script_lines.append("    END;")
+    
+    script_lines.append("")
+    script_lines.append("    -- All steps completed successfully")
+    script_lines.append("    COMMIT TRANSACTION;")
+    script_lines.append("    PRINT 'Multi-procedure workflow completed successfully';")
+    script_lines.append("")
+    script_lines.append("END TRY")
+    script_lines.append("BEGIN CATCH")
+    script_lines.append("    -- Rollback on any error")
+    script_lines.append("    IF @@TRANCOUNT > 0")
+    script_lines.append("        ROLLBACK TRANSACTION;")
+    script_lines.append("")
+    script_lines.append("    PRINT 'Workflow failed: ' + ERROR_MESSAGE();")
+    script_lines.append("    THROW;")
+    script_lines.append("END CATCH;")
+    
+    return "\n".join(script_lines)
+
+
+def legacy_batch_processing(framework_api_details):
+    """Generate batch processing pattern."""
+    lines = []
+    
+    lines.append("-- Batch processing pattern with cursor and error handling")
+    lines.append("")
+    lines.append("-- Batch configuration")
+    lines.append("DECLARE @batch_size int = 100;")
+    lines.append("DECLARE @total_processed int = 0;")
+    lines.append("DECLARE @error_count int = 0;")
+    lines.append("DECLARE @current_batch_start int = 1;")
+    lines.append("")
+    lines.append("-- Temporary table for batch items")
+    lines.append("CREATE TABLE #batch_items (")
+    lines.append("    id int IDENTITY(1,1),")
+    lines.append("    item_id int,")
+    lines.append("    item_data nvarchar(255),")
+    lines.append("    processed bit DEFAULT 0,")
+    lines.append("    error_message nvarchar(1000) NULL")
+    lines.append(");")
+    lines.append("")
+    lines.append("-- Populate batch items (example data)")
+    lines.append("INSERT INTO #batch_items (item_id, item_data)")
+    lines.append("SELECT id, 'Sample data ' + CAST(id AS nvarchar)")
+    lines.append("FROM (VALUES (1),(2),(3),(4),(5)) AS v(id);")
+    lines.append("")
+    lines.append("-- Process batches")
+    lines.append("WHILE EXISTS (SELECT 1 FROM #batch_items WHERE processed = 0)")
+    lines.append("BEGIN")
+    lines.append("    DECLARE @current_item_id int;")
+    lines.append("    DECLARE @current_item_data nvarchar(255);")
+    lines.append("    ")
+    lines.append("    -- Get next unprocessed item")
+    lines.append("    SELECT TOP 1 @current_item_id = item_id, @current_item_data = item_data")
+    lines.append("    FROM #batch_items")
+    lines.append("    WHERE processed = 0")
+    lines.append("    ORDER BY id;")
+    lines.append("    ")
+    lines.append("    BEGIN TRY")
+    lines.append("        -- Process individual item")
+    lines.append("        -- EXEC dbo.sp_process_item @current_item_id, @current_item_data;")
+    lines.append("        ")
+    lines.append("        -- Mark as processed")
+    lines.append("        UPDATE #batch_items SET processed = 1")
+    lines.append("        WHERE item_id = @current_item_id;")
+    lines.append("        ")
+    lines.append("        SET @total_processed = @total_processed + 1;")
+    lines.append("    END TRY")
+    lines.append("    BEGIN CATCH")
+    lines.append("        -- Log error and continue")
+    lines.append("        UPDATE #batch_items")
+    lines.append("        SET processed = 1, error_message = ERROR_MESSAGE()")
+    lines.append("        WHERE item_id = @current_item_id;")
+    lines.append("        ")
+    lines.append("        SET @error_count = @error_count + 1;")
+    lines.append("    END CATCH;")
+    lines.append("END;")
+    lines.append("")
+    lines.append("-- Report results")
+    lines.append("PRINT 'Batch processing completed';")
+    lines.append("PRINT 'Total processed: ' + CAST(@total_processed AS nvarchar);")
+    lines.append("PRINT 'Errors encountered: ' + CAST(@error_count AS nvarchar);")
+    lines.append("")
+    lines.append("-- Cleanup")
+    lines.append("DROP TABLE #batch_items;")
+    
+    return lines
+
+
+def best_rate(function, count, repeat=ROUNDS):
+    """Best examples/second over several rounds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def normalized(script):
+    # The templates write whitespace-only lines as empty lines
+    return "\n".join(line if line.strip() else "" for line in script.split("\n"))
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE
+    model = ApiModel.from_json_file(filepath)
+    procedures = model.procedures
+    names = [proc.full_name for proc in procedures]
+    workflows = [names[i:i + 4] for i in range(0, len(names), 4)]
+
+    cases = [
+        ("create_pattern", lambda: ["\n".join(legacy_create_pattern(proc)) for proc in procedures],
+         lambda: (crud_script_context(proc, "create") for proc in procedures)),
+        ("error_handling", lambda: [legacy_error_handling_script(proc, {}) for proc in procedures],
+         lambda: (error_handling_script_context(proc) for proc in procedures)),
+        ("multi_procedure", lambda: [legacy_multi_procedure_script(workflow, model, {}) for workflow in workflows],
+         lambda: (multi_procedure_script_context(workflow, model) for workflow in workflows)),
+        ("batch_processing", lambda: ["\n".join(legacy_batch_processing(model)) for _ in procedures],
+         lambda: ({} for _ in procedures)),
+    ]
+
+    print(f"--- Script Template Benchmark ({len(procedures)} procedures, best of {ROUNDS}) ---")
+    print(f"{'Shape':<18} {'Line builders/s':>16} {'Templates/s':>14} {'Speedup':>8} {'Render only/s':>14}")
+    for shape, legacy, build_contexts in cases:
+        template = SCRIPT_TEMPLATES[shape]
+        contexts = list(build_contexts())
+        if [normalized(script) for script in legacy()] != template.render_many(contexts):
+            print(f"{shape:<18} ✗ template output differs from the line builders")
+            continue
+        legacy_rate = best_rate(legacy, len(contexts))
+        template_rate = best_rate(lambda: template.render_many(build_contexts()), len(contexts))
+        render_rate = best_rate(lambda: template.render_many(contexts), len(contexts))
+        print(f"{shape:<18} {legacy_rate:>16,.0f} {template_rate:>14,.0f} {template_rate / legacy_rate:>7.1f}x "
+              f"{render_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# benchmark_serialization.py
+# Bytes on disk and encode/decode time for each JSON output format on the bundled files.
+# Usage: python benchmark_serialization.py [file.json ...]
+
+import os
+import sys
+from framework_training.serialization import ORJSON_AVAILABLE, benchmark_formats
+
+DEFAULT_FILES = ["framework_api_details.json", "action_scripts_corpus.json", "tsql_app_training_guide_data.json"]
+
+
+def main():
+    filepaths = sys.argv[1:] or [path for path in DEFAULT_FILES if os.path.exists(path)]
+    if not filepaths:
+        print("No JSON files found to benchmark.")
+        return
+    print(f"--- JSON Serialization Benchmark (orjson {'available' if ORJSON_AVAILABLE else 'not installed'}) ---")
+    print(f"{'File':<36} {'Format':<16} {'Bytes':>12} {'Encode s':>10} {'Decode s':>10}")
+    for result in benchmark_formats(filepaths):
+        print(f"{result['file']:<36} {result['format']:<16} {result['bytes']:>12,} "
+              f"{result['encode_seconds']:>10.4f} {result['decode_seconds']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,40 +8,89 @@ and generates generic training materials for learning the framework.
 from .pattern_analyzer import FrameworkPatternAnalyzer
 from .training_generator import TrainingExampleGenerator  
 from .relationship_analyzer import ProcedureRelationshipAnalyzer
+from .dependency_graph import ProcedureDependencyGraph
+from .relationship_rules import RelationshipRuleIndex
+from .corpus_blob import CorpusBlobStore
+from .generators.utils.api_model import ApiModel, ApiObject, Parameter, ensure_api_model
+from .similarity_index import corpus_version
+from .columnar_export import DEFAULT_FORMATS as COLUMNAR_FORMATS, export_columnar, script_feature_rows
+from .stage_cache import StageCache, hash_file, hash_value
 from .utils import save_json_file, load_json_file
 
 __version__ = "1.0.0"
 __author__ = "TSQL.APP Training System"
 
-def generate_all_training_materials(framework_api_details, action_scripts_corpus, output_dir="training_output"):
+def generate_all_training_materials(framework_api_details, action_scripts_corpus, output_dir="training_output",
+                                    framework_knowledge_file="framework_knowledge.json",
+                                    cache_dir=".training_cache", columnar_formats=COLUMNAR_FORMATS):
     """
     Main function to generate all training materials.
     Call this from your main script.
+    action_scripts_corpus may be the corpus list, a CorpusBlobStore or the path of
+    action_scripts_corpus.json (read through its memory-mapped blob).
+    Stage outputs are cached in cache_dir, keyed by their inputs and code version
+    (cache_dir=None recomputes everything). Per-script features, object usage and the
+    co-occurrence edge list are exported to output_dir/analytics in columnar_formats
+    (npz, csv, parquet; None skips the export).
+    framework_api_details may be the list of API dicts or an ApiModel; the model is
+    built once here and shared by every analyzer and generator.
     """
     print(f"\n=== TSQL.APP FRAMEWORK TRAINING GENERATOR v{__version__} ===")
+    if isinstance(action_scripts_corpus, str):
+        action_scripts_corpus = CorpusBlobStore.from_corpus_file(action_scripts_corpus)
+    
+    cache = StageCache(cache_dir) if cache_dir else None
+    api_hash = hash_value(framework_api_details) if cache else None
+    framework_api_details = ensure_api_model(framework_api_details)
+    corpus_hash = None
+    if cache:
+        corpus_hash = getattr(action_scripts_corpus, "version", None) or corpus_version(action_scripts_corpus)
+    
+    def run_stage(stage, inputs, code_paths, compute):
+        if cache is None:
+            return compute(), None
+        return cache.run(stage, inputs, compute, code_paths=code_paths)
     
     # Initialize analyzers
     pattern_analyzer = FrameworkPatternAnalyzer(framework_api_details)
-    relationship_analyzer = ProcedureRelationshipAnalyzer(framework_api_details)
+    relationship_analyzer = ProcedureRelationshipAnalyzer(framework_api_details, framework_knowledge_file)
     training_generator = TrainingExampleGenerator(framework_api_details)
     
     results = {}
     
     # 1. Analyze framework usage patterns
     print("\n1. Analyzing framework usage patterns...")
-    usage_patterns = pattern_analyzer.analyze_scripts(action_scripts_corpus)
+    usage_patterns, patterns_hash = run_stage(
+        "usage_patterns",
+        {"api": api_hash, "corpus": corpus_hash},
+        ("pattern_analyzer.py", "pattern_clustering.py", "utils.py", "generators/pattern_analyzer",
+         "generators/synthetic_training_generator.py", "generators/utils/api_model.py"),
+        lambda: pattern_analyzer.analyze_scripts(action_scripts_corpus)
+    )
     results['usage_patterns'] = usage_patterns
     save_json_file(f"{output_dir}/framework_usage_patterns.json", usage_patterns)
     
     # 2. Analyze procedure relationships
     print("\n2. Analyzing procedure relationships...")
-    relationships = relationship_analyzer.analyze_relationships(action_scripts_corpus)
+    relationships, relationships_hash = run_stage(
+        "relationships",
+        {"api": api_hash, "corpus": corpus_hash, "knowledge": hash_file(framework_knowledge_file)},
+        ("relationship_analyzer.py", "relationship_rules.py", "utils.py", "generators/utils/api_model.py"),
+        lambda: relationship_analyzer.analyze_relationships(action_scripts_corpus)
+    )
     results['relationships'] = relationships
     save_json_file(f"{output_dir}/procedure_relationships.json", relationships)
     
     # 3. Generate training examples
     print("\n3. Generating training examples...")
-    training_examples = training_generator.generate_examples(usage_patterns, relationships)
+    # Markdown rendering is not part of this stage, so editing it does not invalidate examples
+    training_examples, _ = run_stage(
+        "training_examples",
+        {"api": api_hash, "usage_patterns": patterns_hash, "relationships": relationships_hash},
+        # The whole generators package: the pipeline, engine and generators all shape the examples
+        ("training_generator.py", "utils.py", "serialization.py", "generators"),
+        lambda: training_generator.generate_examples(usage_patterns, relationships)
+    )
     results['training_examples'] = training_examples
     save_json_file(f"{output_dir}/training_examples.json", training_examples)
     
@@ -50,10 +99,31 @@ def generate_all_training_materials(framework_api_details, action_scripts_corpus
     summary = create_summary_report(results)
     save_json_file(f"{output_dir}/training_summary.json", summary)
     
+    # 5. Export columnar analytics tables
+    if columnar_formats:
+        print("\n5. Exporting columnar analytics tables...")
+        # Only the per-script analysis is cached; the tables are rebuilt from it and the relationships
+        feature_rows, _ = run_stage(
+            "script_features",
+            {"api": api_hash, "corpus": corpus_hash},
+            ("columnar_export.py", "pattern_analyzer.py", "utils.py", "generators/utils/api_model.py"),
+            lambda: script_feature_rows(framework_api_details, action_scripts_corpus, pattern_analyzer)
+        )
+        export_columnar(framework_api_details, action_scripts_corpus, relationships,
+                        f"{output_dir}/analytics", columnar_formats, feature_rows=feature_rows)
+    
     print(f"\n=== TRAINING GENERATION COMPLETE ===")
     print(f"Generated {len(training_examples.get('examples', []))} training examples")
     print(f"Found {len(usage_patterns.get('patterns', []))} usage patterns")
     print(f"Output files saved to '{output_dir}/' directory")
+    if cache:
+        report = cache.report()
+        print(f"Stage cache: {len(report['hits'])} hit(s) {report['hits']}, "
+              f"{len(report['misses'])} miss(es) {report['misses']}")
+        removed = cache.gc()
+        if removed:
+            print(f"Stage cache: removed {removed} old entr{'y' if removed == 1 else 'ies'}")
+        results['cache_report'] = report
     
     return results
 
@@ -0,0 +1,274 @@
+import csv
+import json
+import os
+from array import array
+from collections import Counter
+from .pattern_analyzer import FrameworkPatternAnalyzer
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# column dtype -> (array typecode, numpy dtype); "dictionary" columns hold uint32 codes into a vocabulary
+COLUMN_TYPES = {
+    "bool": ('B', "bool"),
+    "uint16": ('H', "uint16"),
+    "uint32": ('I', "uint32"),
+    "uint64": ('Q', "uint64"),
+    "int64": ('q', "int64"),
+    "dictionary": ('I', "uint32"),
+}
+DEFAULT_FORMATS = ("npz", "csv", "parquet")
+MISSING_ID = -1
+
+
+class Vocabulary:
+    """Dictionary encoding: each distinct string gets a stable uint32 code in first-seen order."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        value = "" if value is None else str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ColumnarTable:
+    """Typed columns backed by array.array; dictionary columns share Vocabulary objects."""
+
+    def __init__(self, name, schema, vocabularies=None):
+        self.name = name
+        self.schema = list(schema)
+        self.vocabularies = vocabularies or {}
+        self.columns = {column: array(COLUMN_TYPES[dtype][0]) for column, dtype in self.schema}
+
+    def append(self, **row):
+        for column, dtype in self.schema:
+            value = row[column]
+            if dtype == "dictionary":
+                value = self.vocabularies[column].encode(value)
+            self.columns[column].append(int(value))
+
+    def __len__(self):
+        return len(self.columns[self.schema[0][0]]) if self.schema else 0
+
+    def decoded(self, column):
+        """Column values with dictionary codes replaced by their strings."""
+        values = self.columns[column]
+        vocabulary = self.vocabularies.get(column)
+        if vocabulary is None:
+            return values
+        return [vocabulary.values[code] for code in values]
+
+    def describe(self):
+        return {
+            "rows": len(self),
+            "columns": {
+                column: ({"type": "dictionary", "index_type": "uint32", "value_type": "string",
+                          "cardinality": len(self.vocabularies[column])} if dtype == "dictionary" else {"type": dtype})
+                for column, dtype in self.schema
+            }
+        }
+
+
+def script_feature_rows(framework_api_details, action_scripts_corpus, pattern_analyzer=None):
+    """
+    The per-script analysis behind script_features as JSON-serializable rows
+    (source table, action id, calls per procedure, flags, complexity), so the
+    pipeline can cache it as a stage.
+    """
+    analyzer = pattern_analyzer or FrameworkPatternAnalyzer(framework_api_details)
+    rows = []
+    for script_info in action_scripts_corpus:
+        pattern = analyzer.analyze_script(script_info) or {}
+        rows.append({
+            "source_table": script_info.get('source_table'),
+            "action_id": script_info.get('action_id'),
+            "calls": dict(Counter(call["procedure"] for call in pattern.get("framework_calls", []))),
+            "call_count": pattern.get("call_count", 0),
+            "has_error_handling": pattern.get("has_error_handling", False),
+            "has_transactions": pattern.get("has_transactions", False),
+            "has_validation": pattern.get("has_validation", False),
+            "complexity_score": pattern.get("complexity_score", 0),
+        })
+    return rows
+
+
+def build_script_features(feature_rows, usage=None, procedures=None):
+    """
+    One row per corpus script (see script_feature_rows): ids, source table, framework
+    call counts, flags and complexity. When usage is a dict, per-procedure totals are
+    accumulated into usage["calls"] and usage["scripts"] (Counters) during the same
+    pass, for build_object_usage.
+    """
+    procedures = procedures if procedures is not None else Vocabulary()
+    if usage is not None:
+        usage.setdefault("calls", Counter())
+        usage.setdefault("scripts", Counter())
+    table = ColumnarTable("script_features", [
+        ("script_index", "uint32"),
+        ("source_table", "dictionary"),
+        ("action_id", "int64"),
+        ("call_count", "uint32"),
+        ("distinct_procedures", "uint16"),
+        ("primary_procedure", "dictionary"),
+        ("has_error_handling", "bool"),
+        ("has_transactions", "bool"),
+        ("has_validation", "bool"),
+        ("complexity_score", "uint32"),
+    ], {"source_table": Vocabulary(), "primary_procedure": procedures})
+
+    for index, row in enumerate(feature_rows):
+        calls = Counter(row["calls"])
+        if usage is not None:
+            usage["calls"].update(calls)
+            usage["scripts"].update(calls.keys())
+        table.append(
+            script_index=index,
+            source_table=row["source_table"],
+            action_id=MISSING_ID if row["action_id"] is None else row["action_id"],
+            call_count=row["call_count"],
+            distinct_procedures=min(len(calls), 0xFFFF),
+            primary_procedure=calls.most_common(1)[0][0] if calls else "",
+            has_error_handling=row["has_error_handling"],
+            has_transactions=row["has_transactions"],
+            has_validation=row["has_validation"],
+            complexity_score=row["complexity_score"],
+        )
+    return table
+
+
+def build_object_usage(framework_api_details, usage, relationships=None, procedures=None, pattern_analyzer=None):
+    """One row per framework procedure: total calls, scripts using it and relationship count."""
+    analyzer = pattern_analyzer or FrameworkPatternAnalyzer(framework_api_details)
+    call_counts, script_counts = usage.get("calls", Counter()), usage.get("scripts", Counter())
+
+    relationship_procedures = (relationships or {}).get("procedures", {})
+    table = ColumnarTable("object_usage", [
+        ("object", "dictionary"),
+        ("call_count", "uint64"),
+        ("script_count", "uint32"),
+        ("relationship_count", "uint32"),
+    ], {"object": procedures if procedures is not None else Vocabulary()})
+    for full_name in sorted(obj.full_name for obj in analyzer.framework_procedures.values()):
+        table.append(
+            object=full_name,
+            call_count=call_counts.get(full_name, 0),
+            script_count=script_counts.get(full_name, 0),
+            relationship_count=relationship_procedures.get(full_name, {}).get("relationship_count", 0),
+        )
+    return table
+
+
+def build_co_occurrence_edges(relationships, procedures=None):
+    """Edge list (source < target) from procedure_relationships data."""
+    vocabulary = procedures if procedures is not None else Vocabulary()
+    table = ColumnarTable("co_occurrence", [
+        ("source", "dictionary"),
+        ("target", "dictionary"),
+        ("co_occurrence_count", "uint32"),
+    ], {"source": vocabulary, "target": vocabulary})
+    for procedure, data in sorted((relationships or {}).get("procedures", {}).items()):
+        for related, stats in sorted(data.get("related_procedures", {}).items()):
+            if procedure < related:
+                table.append(source=procedure, target=related, co_occurrence_count=stats.get("co_occurrence_count", 0))
+    return table
+
+
+def write_csv(table, filepath):
+    """Decoded values, one header row; booleans as 0/1."""
+    with open(filepath, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([column for column, _ in table.schema])
+        writer.writerows(zip(*(table.decoded(column) for column, _ in table.schema)))
+
+
+def write_npz(table, filepath):
+    """One array per column; dictionary columns add '<column>__dictionary' with the vocabulary."""
+    arrays = {}
+    for column, dtype in table.schema:
+        arrays[column] = np.frombuffer(table.columns[column], dtype=COLUMN_TYPES[dtype][1]) if len(table) else \
+            np.zeros(0, dtype=COLUMN_TYPES[dtype][1])
+        if dtype == "dictionary":
+            arrays[f"{column}__dictionary"] = np.array(table.vocabularies[column].values, dtype=str)
+    np.savez_compressed(filepath, **arrays)
+
+
+def write_parquet(table, filepath):
+    """Dictionary columns become Arrow dictionary<uint32, string> columns."""
+    arrow_columns = {}
+    for column, dtype in table.schema:
+        if dtype == "bool":
+            values = pa.array([bool(value) for value in table.columns[column]], type=pa.bool_())
+        else:
+            values = pa.array(table.columns[column].tolist(), type=pa.type_for_alias(COLUMN_TYPES[dtype][1]))
+        if dtype == "dictionary":
+            values = pa.DictionaryArray.from_arrays(values.cast(pa.uint32()),
+                                                    pa.array(table.vocabularies[column].values, type=pa.string()))
+        arrow_columns[column] = values
+    pq.write_table(pa.table(arrow_columns), filepath)
+
+
+def export_columnar(framework_api_details, action_scripts_corpus, relationships=None,
+                    output_dir="training_output/analytics", formats=DEFAULT_FORMATS, feature_rows=None):
+    """
+    Write script_features, object_usage and co_occurrence tables in the requested
+    formats (npz needs numpy, parquet needs pyarrow; missing ones are skipped) plus
+    schema.json describing column types. feature_rows (from script_feature_rows)
+    skips re-analyzing the corpus. Returns the schema dict.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    analyzer = FrameworkPatternAnalyzer(framework_api_details)
+    if feature_rows is None:
+        feature_rows = script_feature_rows(framework_api_details, action_scripts_corpus, analyzer)
+    procedures, usage = Vocabulary(), {}
+    tables = [
+        build_script_features(feature_rows, usage, procedures),
+        build_object_usage(framework_api_details, usage, relationships, procedures, analyzer),
+        build_co_occurrence_edges(relationships, procedures),
+    ]
+
+    writers = {"csv": write_csv}
+    if NUMPY_AVAILABLE:
+        writers["npz"] = write_npz
+    if PYARROW_AVAILABLE:
+        writers["parquet"] = write_parquet
+    skipped = [fmt for fmt in formats if fmt not in writers]
+    if skipped:
+        print(f"  ⚠ Skipping columnar formats {skipped} (numpy/pyarrow not installed)")
+
+    schema = {"tables": {}, "formats": [fmt for fmt in formats if fmt in writers]}
+    for table in tables:
+        files = []
+        for fmt in schema["formats"]:
+            filepath = os.path.join(output_dir, f"{table.name}.{fmt}")
+            try:
+                writers[fmt](table, filepath)
+                files.append(os.path.basename(filepath))
+            except Exception as e:
+                print(f"  ✗ Error writing {filepath}: {e}")
+        schema["tables"][table.name] = dict(table.describe(), files=files)
+        print(f"  ✓ Exported {table.name}: {len(table)} rows ({', '.join(files)})")
+
+    with open(os.path.join(output_dir, "schema.json"), 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2)
+    return schema
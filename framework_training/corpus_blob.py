@@ -0,0 +1,180 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from .similarity_index import corpus_version
+
+INDEX_MAGIC = b'TSQLCB01'
+INDEX_HEADER = struct.Struct('<8sQI')  # magic, script count, metadata length
+MISSING_ACTION_ID = -(1 << 63)
+NULL_LENGTH = 0xFFFFFFFF  # stored length for a None sql_source/action_name (no bytes in the blob)
+
+
+def index_path_for(blob_path):
+    return blob_path + ".idx"
+
+
+class CorpusBlobStore(Sequence):
+    """
+    Action script corpus laid out as one contiguous UTF-8 blob (SQL text followed by
+    the action name for every script) plus a compact index of fixed-width arrays:
+    offset, SQL length, name length, source table id and action id.
+    The blob is memory-mapped read-only, so worker processes share the OS page cache
+    and get SQL as memoryview slices without copying. Items behave like the corpus
+    dicts ({source_table, action_id, action_name, sql_source}), so code that iterates
+    the corpus list can take a store instead. Pickling only carries the path.
+    """
+
+    def __init__(self, blob_path):
+        self.blob_path = blob_path
+        with open(index_path_for(blob_path), 'rb') as f:
+            magic, count, metadata_length = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+            if magic != INDEX_MAGIC:
+                raise ValueError(f"{index_path_for(blob_path)} is not a corpus blob index")
+            self.metadata = json.loads(f.read(metadata_length).decode('utf-8'))
+            self.offsets = self._read_array(f, 'Q', count)
+            self.sql_lengths = self._read_array(f, 'I', count)
+            self.name_lengths = self._read_array(f, 'I', count)
+            self.table_ids = self._read_array(f, 'H', count)
+            self.action_ids = self._read_array(f, 'q', count)
+        self.source_tables = self.metadata.get("source_tables", [])
+        self._file = open(blob_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._view = memoryview(self._blob)
+
+    @staticmethod
+    def _read_array(f, typecode, count):
+        values = array(typecode)
+        values.frombytes(f.read(values.itemsize * count))
+        return values
+
+    def __reduce__(self):
+        return (self.__class__, (self.blob_path,))
+
+    def close(self):
+        self._view.release()
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._file.close()
+
+    @property
+    def version(self):
+        return self.metadata.get("corpus_version")
+
+    @classmethod
+    def build(cls, action_scripts_corpus, blob_path):
+        """Write the blob and index for a corpus list; returns an open store."""
+        source_tables, table_ids = [], {}
+        offsets, sql_lengths, name_lengths = array('Q'), array('I'), array('I')
+        script_table_ids, action_ids = array('H'), array('q')
+
+        temp_blob = blob_path + ".tmp"
+        position = 0
+        with open(temp_blob, 'wb') as blob:
+            for script_info in action_scripts_corpus:
+                sql_source, action_name = script_info.get('sql_source'), script_info.get('action_name')
+                sql_bytes = sql_source.encode('utf-8') if sql_source is not None else b''
+                name_bytes = action_name.encode('utf-8') if action_name is not None else b''
+                source_table = script_info.get('source_table') or ''
+                if source_table not in table_ids:
+                    table_ids[source_table] = len(source_tables)
+                    source_tables.append(source_table)
+                action_id = script_info.get('action_id')
+
+                offsets.append(position)
+                sql_lengths.append(len(sql_bytes) if sql_source is not None else NULL_LENGTH)
+                name_lengths.append(len(name_bytes) if action_name is not None else NULL_LENGTH)
+                script_table_ids.append(table_ids[source_table])
+                action_ids.append(MISSING_ACTION_ID if action_id is None else int(action_id))
+                blob.write(sql_bytes)
+                blob.write(name_bytes)
+                position += len(sql_bytes) + len(name_bytes)
+
+        metadata = json.dumps({
+            "corpus_version": corpus_version(action_scripts_corpus),
+            "source_tables": source_tables,
+            "total_bytes": position
+        }).encode('utf-8')
+        temp_index = index_path_for(blob_path) + ".tmp"
+        with open(temp_index, 'wb') as index:
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, len(offsets), len(metadata)))
+            index.write(metadata)
+            for values in (offsets, sql_lengths, name_lengths, script_table_ids, action_ids):
+                values.tofile(index)
+        os.replace(temp_blob, blob_path)
+        os.replace(temp_index, index_path_for(blob_path))
+        return cls(blob_path)
+
+    @classmethod
+    def ensure(cls, action_scripts_corpus, blob_path):
+        """Open the blob for this corpus, rebuilding it only if the corpus version changed."""
+        if os.path.exists(blob_path) and os.path.exists(index_path_for(blob_path)):
+            try:
+                store = cls(blob_path)
+                if store.version == corpus_version(action_scripts_corpus):
+                    return store
+                store.close()
+            except (OSError, ValueError, struct.error) as e:
+                print(f"  ⚠ Rebuilding corpus blob {blob_path}: {e}")
+        return cls.build(action_scripts_corpus, blob_path)
+
+    @classmethod
+    def from_corpus_file(cls, corpus_file, blob_path=None):
+        """Blob store for an action_scripts_corpus.json file (built next to it when missing or stale)."""
+        blob_path = blob_path or os.path.splitext(corpus_file)[0] + ".blob"
+        if os.path.exists(blob_path) and os.path.exists(index_path_for(blob_path)) and \
+                os.path.getmtime(index_path_for(blob_path)) >= os.path.getmtime(corpus_file):
+            return cls(blob_path)
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            corpus = json.load(f)
+        return cls.build(corpus.get("scripts", []) if isinstance(corpus, dict) else corpus, blob_path)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _sql_length(self, index):
+        length = self.sql_lengths[index]
+        return 0 if length == NULL_LENGTH else length
+
+    def sql_view(self, index):
+        """Zero-copy memoryview of one script's UTF-8 SQL."""
+        start = self.offsets[index]
+        return self._view[start:start + self._sql_length(index)]
+
+    def sql_text(self, index):
+        if self.sql_lengths[index] == NULL_LENGTH:
+            return None
+        return str(self.sql_view(index), 'utf-8')
+
+    def action_name(self, index):
+        length = self.name_lengths[index]
+        if length == NULL_LENGTH:
+            return None
+        start = self.offsets[index] + self._sql_length(index)
+        return str(self._view[start:start + length], 'utf-8')
+
+    def script_ref(self, index):
+        """(source_table, action_id) for one script."""
+        action_id = self.action_ids[index]
+        return self.source_tables[self.table_ids[index]], (None if action_id == MISSING_ACTION_ID else action_id)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        source_table, action_id = self.script_ref(index)
+        return {
+            "sql_source": self.sql_text(index),
+            "action_id": action_id,
+            "action_name": self.action_name(index),
+            "source_table": source_table
+        }
+
+    def iter_sql_views(self, start=0, stop=None):
+        """(index, memoryview) pairs for a range of scripts, e.g. one worker's share."""
+        for index in range(start, len(self) if stop is None else min(stop, len(self))):
+            yield index, self.sql_view(index)
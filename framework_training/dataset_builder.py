@@ -0,0 +1,524 @@
+"""
+Large-scale dataset builder.
+
+    python -m framework_training.dataset_builder --examples 1000000 --output-dir dataset
+
+Generates examples in fixed-size chunks with the seeded generation engine, passes
+them through validation, dedup and enrichment, and writes each split (assigned by
+the hash of the normalized script) as sharded JSON Lines under output_dir/<split>/,
+until the requested number of records is written or the generators saturate (dedup
+rejects nearly every example of a chunk). A checkpoint is written after every chunk;
+rerunning the same command resumes after the last completed chunk and produces the
+same dataset as an uninterrupted run.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+
+from .corpus_blob import CorpusBlobStore
+from .metadata_store import METADATA_STORE_FILE, MetadataStore
+from .pattern_analyzer import FrameworkPatternAnalyzer
+from .persistence import atomic_write_bytes, checksum_path, read_verified_json, verify_file
+from .utils import load_json_file, save_json_file
+from .generators.example_pipeline import (DedupStage, EnrichmentStage, ExamplePipeline, StatisticsStage,
+                                          ValidationStage)
+from .generators.generation_engine import GENERATOR_CLASSES, SeededGenerationEngine, derive_seed
+from .generators.output.jsonl_writer import MANIFEST_FILE, ShardedJsonlWriter
+from .generators.synthetic_training_generator import analyze_script_patterns
+from .generators.utils.api_model import ensure_api_model
+from .generators.utils.dedup import DEFAULT_ERROR_RATE, ExampleDeduplicator, script_hash
+
+DEFAULT_SPLITS = (("train", 0.98), ("validation", 0.01), ("test", 0.01))
+DEFAULT_CHUNK_SIZE = 100000
+# A chunk whose dedup rejection rate reaches this ends the build as saturated
+DEFAULT_SATURATION = 0.99
+# Examples per category generated to find categories that produce no valid output
+PROBE_EXAMPLES = 50
+CHECKPOINT_FILE = "checkpoint.json"
+STATE_FILE = "pipeline.state"
+SUMMARY_FILE = "dataset_summary.json"
+
+
+def parse_splits(text):
+    """'train=0.98,validation=0.01,test=0.01' -> [(name, fraction)], fractions scaled to sum to 1."""
+    splits = []
+    for part in text.split(","):
+        name, _, fraction = part.partition("=")
+        if not name.strip() or not fraction:
+            raise ValueError(f"invalid split '{part}' (expected name=fraction)")
+        splits.append((name.strip(), float(fraction)))
+    total = sum(fraction for _, fraction in splits)
+    if total <= 0 or any(fraction < 0 for _, fraction in splits):
+        raise ValueError("split fractions must be non-negative and not all zero")
+    return [(name, fraction / total) for name, fraction in splits]
+
+
+def assign_split(script, splits):
+    """Split for a script from the hash of its normalized text, so near-duplicates never straddle splits."""
+    position = (script_hash(script) >> 64) / 2.0 ** 64
+    cumulative = 0.0
+    for name, fraction in splits:
+        cumulative += fraction
+        if position < cumulative:
+            return name
+    return splits[-1][0]
+
+
+def category_counts(total, categories=tuple(GENERATOR_CLASSES)):
+    """total examples spread evenly over the generator categories (remainder to the first ones)."""
+    share, remainder = divmod(total, len(categories))
+    return {category: share + (1 if index < remainder else 0) for index, category in enumerate(categories)}
+
+
+def productive_categories(framework_api, script_patterns, seed=0, usage_counts=None, sample=PROBE_EXAMPLES):
+    """
+    Generator categories with at least one example passing validation in a seeded
+    sample of `sample` examples each; the others would only waste their share.
+    """
+    engine = SeededGenerationEngine(framework_api, script_patterns, seed=derive_seed(seed, "probe"),
+                                    usage_counts=usage_counts)
+    validation = ValidationStage()
+    valid = dict.fromkeys(GENERATOR_CLASSES, 0)
+    for category, example in engine.generate(dict.fromkeys(GENERATOR_CLASSES, sample)):
+        if validation.process(category, example) is not None:
+            valid[category] += 1
+    return [category for category, count in valid.items() if count]
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class SplitSink:
+    """One ShardedJsonlWriter per split for the current chunk (output_dir/<split>/chunk-NNNNN/)."""
+
+    def __init__(self, output_dir, splits, max_shard_records, max_shard_bytes):
+        self.output_dir = output_dir
+        self.splits = splits
+        self.max_shard_records = max_shard_records
+        self.max_shard_bytes = max_shard_bytes
+        self.writers = {}
+
+    def open_chunk(self, chunk_index):
+        self.writers = {
+            name: ShardedJsonlWriter(
+                os.path.join(self.output_dir, name, f"chunk-{chunk_index:05d}"),
+                prefix=name,
+                max_shard_bytes=self.max_shard_bytes,
+                max_shard_records=self.max_shard_records,
+                count_fields=["category", "complexity_level"]
+            )
+            for name, _ in self.splits
+        }
+
+    def write(self, record):
+        self.writers[assign_split(record["example_script"], self.splits)].write(record)
+
+    def close(self):
+        """Close the chunk's writers; returns {split: manifest}."""
+        manifests = {name: writer.close() for name, writer in self.writers.items()}
+        self.writers = {}
+        return manifests
+
+
+class DatasetBuilder:
+    """
+    Builds a dataset of `examples` records, generating chunks of chunk_size examples
+    until that many have passed validation and dedup. Chunk i is generated from
+    derive_seed(seed, 'chunk', i), so the output depends only on the configuration,
+    not on worker count or on where a previous run was interrupted. The build stops
+    early as saturated when dedup rejects `saturation` or more of a chunk's examples
+    or a chunk writes nothing; the summary then reports the shortfall.
+    """
+
+    def __init__(self, framework_api_details, script_patterns, output_dir, examples, seed=0, workers=1,
+                 splits=DEFAULT_SPLITS, chunk_size=DEFAULT_CHUNK_SIZE, max_shard_records=100000,
+                 max_shard_bytes=64 * 1024 * 1024, dedup=True, dedup_error_rate=DEFAULT_ERROR_RATE,
+                 usage_counts=None, progress=True, saturation=DEFAULT_SATURATION, categories=None):
+        self.framework_api = ensure_api_model(framework_api_details)
+        self.script_patterns = script_patterns
+        self.output_dir = output_dir
+        self.examples = examples
+        self.seed = seed
+        self.workers = workers
+        self.splits = list(splits)
+        self.chunk_size = chunk_size
+        self.max_shard_records = max_shard_records
+        self.max_shard_bytes = max_shard_bytes
+        self.dedup = dedup
+        self.dedup_error_rate = dedup_error_rate
+        self.usage_counts = usage_counts
+        self.progress = progress
+        self.saturation = saturation
+        if categories is None:
+            categories = productive_categories(self.framework_api, script_patterns, seed, usage_counts)
+        if not categories:
+            raise ValueError("no generator category produces examples that pass validation")
+        self.categories = list(categories)
+
+    def config(self):
+        """Everything that changes the output; a checkpoint is only resumed with an equal config."""
+        return {
+            "examples": self.examples,
+            "seed": self.seed,
+            "splits": [[name, fraction] for name, fraction in self.splits],
+            "chunk_size": self.chunk_size,
+            "max_shard_records": self.max_shard_records,
+            "max_shard_bytes": self.max_shard_bytes,
+            "dedup": self.dedup,
+            "dedup_error_rate": self.dedup_error_rate,
+            "saturation": self.saturation,
+            "categories": self.categories
+        }
+
+    @property
+    def excluded_categories(self):
+        return [category for category in GENERATOR_CLASSES if category not in self.categories]
+
+    def _path(self, filename):
+        return os.path.join(self.output_dir, filename)
+
+    def _new_state(self):
+        stages = [ValidationStage()]
+        if self.dedup:
+            stages.append(DedupStage(ExampleDeduplicator(error_rate=self.dedup_error_rate)))
+        stages.extend([EnrichmentStage(id_prefix="example_"), StatisticsStage()])
+        return {"stages": stages, "checkpoint": {
+            "config": self.config(),
+            "status": "running",
+            "completed_chunks": 0,
+            "generated": 0,
+            "written": 0,
+            "chunks": [],
+            "timings": {},
+            "elapsed_seconds": 0.0
+        }}
+
+    def _load_state(self):
+        """State saved after the last completed chunk, or None when there is none to resume."""
+        checkpoint, reason = read_verified_json(self._path(CHECKPOINT_FILE)) \
+            if os.path.exists(self._path(CHECKPOINT_FILE)) else (None, None)
+        if checkpoint is None:
+            if reason:
+                print(f"  ⚠ Ignoring checkpoint: {reason}")
+            return None
+        if checkpoint["config"] != self.config():
+            raise ValueError(f"{self.output_dir} holds a dataset built with a different configuration; "
+                             "use another output directory or --fresh")
+        state_file = checkpoint.get("state_file", STATE_FILE)
+        ok, reason = verify_file(self._path(state_file))
+        if not ok:
+            raise ValueError(f"cannot resume: {state_file} {reason}")
+        with open(self._path(state_file), 'rb') as f:
+            stages = pickle.load(f)
+        return {"stages": stages, "checkpoint": checkpoint}
+
+    def _save_state(self, state):
+        # Each chunk's stage state goes to its own file and the checkpoint names it, so
+        # the two switch over together: a crash before the checkpoint is replaced leaves
+        # the previous checkpoint pointing at the previous, still present, state file
+        checkpoint = state["checkpoint"]
+        state_file = f"{STATE_FILE}.{checkpoint['completed_chunks']}"
+        atomic_write_bytes(self._path(state_file), pickle.dumps(state["stages"], protocol=pickle.HIGHEST_PROTOCOL))
+        checkpoint["state_file"] = state_file
+        atomic_write_bytes(self._path(CHECKPOINT_FILE), json.dumps(checkpoint).encode('utf-8'))
+        for entry in os.listdir(self.output_dir):
+            if entry.startswith(STATE_FILE) and entry not in (state_file, checksum_path(state_file)):
+                os.remove(self._path(entry))
+
+    def _remove_incomplete_chunks(self, completed_chunks):
+        for name, _ in self.splits:
+            split_dir = os.path.join(self.output_dir, name)
+            if not os.path.isdir(split_dir):
+                continue
+            for entry in os.listdir(split_dir):
+                if entry.startswith("chunk-") and int(entry[len("chunk-"):]) >= completed_chunks:
+                    shutil.rmtree(os.path.join(split_dir, entry))
+
+    def build(self, resume=True):
+        """Generate chunks until the target is written or saturated, then write split manifests; returns the summary."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        state = self._load_state() if resume else None
+        if state is None:
+            state = self._new_state()
+        checkpoint = state["checkpoint"]
+        start_chunk = checkpoint["completed_chunks"]
+        self._remove_incomplete_chunks(start_chunk)
+        if self.excluded_categories and not start_chunk:
+            print(f"  ⚠ Leaving out {', '.join(self.excluded_categories)}: no valid examples in a "
+                  f"{PROBE_EXAMPLES}-example sample")
+        if start_chunk:
+            print(f"  ✓ Resuming after chunk {start_chunk} ({checkpoint['written']:,} of {self.examples:,} "
+                  f"records written, {checkpoint['generated']:,} examples generated)")
+
+        pipeline = ExamplePipeline(state["stages"], timed=True)
+        for name in pipeline.timings:
+            pipeline.timings[name] = list(checkpoint["timings"].get(name, [0, 0.0]))
+        generation = checkpoint["timings"].get("generation", [0, 0.0])
+        writing = checkpoint["timings"].get("write", [0, 0.0])
+        dedup = next((stage.deduplicator for stage in state["stages"] if isinstance(stage, DedupStage)), None)
+        sink = SplitSink(self.output_dir, self.splits, self.max_shard_records, self.max_shard_bytes)
+        session_start = time.perf_counter()
+        elapsed_before = checkpoint["elapsed_seconds"]
+        session_written = 0
+        last_report = 0.0
+        clock = time.perf_counter
+
+        chunk_index = start_chunk
+        while checkpoint["status"] == "running":
+            engine = SeededGenerationEngine(self.framework_api, self.script_patterns,
+                                            seed=derive_seed(self.seed, "chunk", chunk_index),
+                                            workers=self.workers, usage_counts=self.usage_counts)
+            produced = iter(engine.generate(category_counts(self.chunk_size, self.categories)))
+
+            def timed_generation():
+                while True:
+                    started = clock()
+                    item = next(produced, None)
+                    generation[1] += clock() - started
+                    if item is None:
+                        return
+                    generation[0] += 1
+                    yield item
+
+            generated_before = generation[0]
+            seen_before, rejected_before = (dedup.seen, dedup.rejected) if dedup else (0, 0)
+            chunk_written = 0
+            sink.open_chunk(chunk_index)
+            for _, record in pipeline.stream(timed_generation()):
+                started = clock()
+                sink.write(record)
+                writing[1] += clock() - started
+                writing[0] += 1
+                chunk_written += 1
+                session_written += 1
+                now = clock()
+                if self.progress and now - last_report >= 1.0:
+                    last_report = now
+                    self._report_progress(checkpoint["written"] + chunk_written, generation[0],
+                                          session_written, now - session_start)
+                if checkpoint["written"] + chunk_written >= self.examples:
+                    break
+            manifests = sink.close()
+
+            checkpoint["completed_chunks"] = chunk_index + 1
+            checkpoint["generated"] = generation[0]
+            checkpoint["written"] += chunk_written
+            chunk_seen = dedup.seen - seen_before if dedup else 0
+            chunk_rejection = (dedup.rejected - rejected_before) / chunk_seen if chunk_seen else 0.0
+            checkpoint["chunks"].append({name: {"records": manifest["total_records"],
+                                                "shards": manifest["shards"],
+                                                "field_counts": manifest["field_counts"]}
+                                         for name, manifest in manifests.items()})
+            if checkpoint["written"] >= self.examples:
+                checkpoint["status"] = "complete"
+            elif chunk_written == 0 or chunk_rejection >= self.saturation:
+                checkpoint["status"] = "saturated"
+                checkpoint["saturation"] = {
+                    "chunk": chunk_index,
+                    "chunk_generated": generation[0] - generated_before,
+                    "chunk_written": chunk_written,
+                    "chunk_dedup_rejection_rate": round(chunk_rejection, 4)
+                }
+            checkpoint["timings"] = {**{name: list(timing) for name, timing in pipeline.timings.items()},
+                                     "generation": list(generation), "write": list(writing)}
+            checkpoint["elapsed_seconds"] = elapsed_before + clock() - session_start
+            self._save_state(state)
+            chunk_index += 1
+
+        if self.progress and session_written:
+            self._report_progress(checkpoint["written"], generation[0], session_written, clock() - session_start)
+            print()
+        return self._finish(state, pipeline)
+
+    def _report_progress(self, written, generated, session_written, session_seconds):
+        rate = session_written / session_seconds if session_seconds else 0.0
+        remaining = self.examples - written
+        eta = format_duration(remaining / rate) if rate else "--:--"
+        sys.stdout.write(f"\r  {written:,}/{self.examples:,} records ({written / self.examples:.1%}), "
+                         f"{generated:,} generated  {rate:,.0f}/s  ETA {eta}   ")
+        sys.stdout.flush()
+
+    def _write_split_manifests(self, checkpoint):
+        """One manifest per split over every chunk's shards, readable with JsonlShardReader."""
+        split_counts = {}
+        for name, _ in self.splits:
+            shards, field_counts, total_records, total_bytes = [], {}, 0, 0
+            for chunk_index, chunk in enumerate(checkpoint["chunks"]):
+                for shard in chunk[name]["shards"]:
+                    prefix = f"chunk-{chunk_index:05d}/"
+                    shards.append({**shard, "file": prefix + shard["file"], "index_file": prefix + shard["index_file"],
+                                   "first_record": total_records + shard["first_record"]})
+                    total_bytes += shard["bytes"]
+                total_records += chunk[name]["records"]
+                for field, counts in chunk[name]["field_counts"].items():
+                    merged = field_counts.setdefault(field, {})
+                    for value, count in counts.items():
+                        merged[value] = merged.get(value, 0) + count
+            split_dir = os.path.join(self.output_dir, name)
+            os.makedirs(split_dir, exist_ok=True)
+            with open(os.path.join(split_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+                json.dump({"metadata": {"split": name, "config": checkpoint["config"]},
+                           "total_records": total_records, "total_bytes": total_bytes,
+                           "shards": shards, "field_counts": field_counts}, f, indent=2)
+            split_counts[name] = total_records
+        return split_counts
+
+    def _finish(self, state, pipeline):
+        checkpoint = state["checkpoint"]
+        split_counts = self._write_split_manifests(checkpoint)
+        timings = checkpoint["timings"]
+        throughput = {}
+        for name in ["generation"] + [stage.name for stage in state["stages"]] + ["write"]:
+            items, seconds = timings.get(name, [0, 0.0])
+            throughput[name] = {"items": int(items), "seconds": round(seconds, 3),
+                                "per_second": round(items / seconds) if seconds else None}
+        written = sum(split_counts.values())
+        summary = {
+            "config": checkpoint["config"],
+            "status": checkpoint["status"],
+            "examples_requested": self.examples,
+            "examples_written": written,
+            "shortfall": max(0, self.examples - written),
+            "examples_generated": checkpoint["generated"],
+            "excluded_categories": self.excluded_categories,
+            "saturation": checkpoint.get("saturation"),
+            "splits": split_counts,
+            "elapsed_seconds": round(checkpoint["elapsed_seconds"], 3),
+            "stage_throughput": throughput
+        }
+        summary.update(pipeline.summary())
+        save_json_file(self._path(SUMMARY_FILE), summary, json_format="pretty")
+        return summary
+
+
+def open_store(store_file):
+    """The MetadataStore at store_file, or None when there is no store file (the JSON files are used)."""
+    if not store_file or not os.path.exists(store_file):
+        return None
+    return MetadataStore(store_file)
+
+
+def load_api(api_file, store=None, corpus=None):
+    """
+    API model from the metadata store when it holds one, else from the explorer's
+    API details file, with its usage examples bound to corpus when given.
+    """
+    if store is not None and store.has_document("api"):
+        return ensure_api_model(list(store.iter_objects()))
+    api_data = load_json_file(api_file, corpus)
+    if api_data is None:
+        raise ValueError(f"cannot load framework API details from {api_file}")
+    return ensure_api_model(api_data["api_objects"] if isinstance(api_data, dict) else api_data)
+
+
+def load_corpus(corpus_file, store=None):
+    """CorpusBlobStore of the store's corpus, else of corpus_file; None when neither has one."""
+    if store is not None and store.has_document("corpus"):
+        blob_path = os.path.splitext(store.db_path)[0] + ".blob"
+        return CorpusBlobStore.ensure(list(store.iter_corpus_scripts()), blob_path)
+    if corpus_file and os.path.exists(corpus_file):
+        return CorpusBlobStore.from_corpus_file(corpus_file)
+    return None
+
+
+def load_inputs(api_file, corpus_file, store_file=None):
+    """API model, synthesis patterns and per-procedure usage counts from the store or the explorer's files."""
+    store = open_store(store_file)
+    try:
+        corpus = load_corpus(corpus_file, store)
+        framework_api = load_api(api_file, store, corpus)
+    finally:
+        if store is not None:
+            store.close()
+    if corpus is None:
+        print(f"  ⚠ No corpus in {store_file} or at {corpus_file}; generating without usage patterns")
+        return framework_api, analyze_script_patterns(None, framework_api), None
+    script_patterns = analyze_script_patterns(corpus, framework_api)
+    usage_counts = FrameworkPatternAnalyzer(framework_api).analyze_scripts(corpus).get("procedure_usage")
+    return framework_api, script_patterns, usage_counts
+
+
+def print_summary(summary):
+    print("\n=== DATASET BUILD COMPLETE ===")
+    print(f"Wrote {summary['examples_written']:,} of {summary['examples_requested']:,} examples "
+          f"({summary['examples_generated']:,} generated) in {format_duration(summary['elapsed_seconds'])}")
+    if summary["status"] == "saturated":
+        saturation = summary["saturation"]
+        print(f"  ⚠ Saturated: dedup rejected {saturation['chunk_dedup_rejection_rate']:.1%} of chunk "
+              f"{saturation['chunk'] + 1}'s {saturation['chunk_generated']:,} examples "
+              f"({saturation['chunk_written']:,} written); the generators cannot produce "
+              f"{summary['examples_requested']:,} distinct examples. Shortfall: {summary['shortfall']:,}. "
+              f"Lower --examples or pass --no-dedup.")
+    if summary["excluded_categories"]:
+        print(f"  ⚠ Left out categories without valid output: {', '.join(summary['excluded_categories'])}")
+    print("Splits: " + ", ".join(f"{name} {count:,}" for name, count in summary["splits"].items()))
+    print("Stage throughput:")
+    for name, stage in summary["stage_throughput"].items():
+        rate = f"{stage['per_second']:,}/s" if stage["per_second"] else "-"
+        print(f"  {name:<14} {stage['items']:>12,} items  {stage['seconds']:>10.2f}s  {rate:>14}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a sharded, split fine-tuning dataset of generated examples")
+    parser.add_argument("--examples", type=int, required=True, help="Number of examples to write")
+    parser.add_argument("--output-dir", default="dataset")
+    parser.add_argument("--store", default=METADATA_STORE_FILE,
+                        help="Metadata store to load the API and corpus from (if it exists)")
+    parser.add_argument("--api", default="framework_api_details.json", help="Framework API details file without a store")
+    parser.add_argument("--corpus", default="action_scripts_corpus.json", help="Action scripts corpus file without a store")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--splits", default="train=0.98,validation=0.01,test=0.01")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Examples per checkpoint")
+    parser.add_argument("--max-shard-records", type=int, default=100000)
+    parser.add_argument("--max-shard-bytes", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--no-dedup", action="store_true", help="Keep near-duplicate scripts")
+    parser.add_argument("--dedup-error-rate", type=float, default=DEFAULT_ERROR_RATE)
+    parser.add_argument("--saturation", type=float, default=DEFAULT_SATURATION,
+                        help="Stop when dedup rejects this fraction of a chunk's examples")
+    parser.add_argument("--fresh", action="store_true", help="Delete any previous build in output-dir first")
+    parser.add_argument("--quiet", action="store_true", help="No live progress line")
+    args = parser.parse_args(argv)
+
+    try:
+        splits = parse_splits(args.splits)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.examples <= 0 or args.chunk_size <= 0:
+        parser.error("--examples and --chunk-size must be positive")
+    if not 0 < args.saturation <= 1:
+        parser.error("--saturation must be in (0, 1]")
+    if args.fresh and os.path.isdir(args.output_dir):
+        shutil.rmtree(args.output_dir)
+
+    try:
+        framework_api, script_patterns, usage_counts = load_inputs(args.api, args.corpus, args.store)
+        builder = DatasetBuilder(framework_api, script_patterns, args.output_dir, args.examples,
+                                 seed=args.seed, workers=args.workers or None, splits=splits,
+                                 chunk_size=args.chunk_size, max_shard_records=args.max_shard_records,
+                                 max_shard_bytes=args.max_shard_bytes, dedup=not args.no_dedup,
+                                 dedup_error_rate=args.dedup_error_rate, usage_counts=usage_counts,
+                                 progress=not args.quiet, saturation=args.saturation)
+        print(f"\nDATASET_BUILDER: {args.examples:,} examples in chunks of {args.chunk_size:,} -> {args.output_dir}/")
+        summary = builder.build()
+    except ValueError as e:
+        print(f"  ✗ {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n  ⚠ Interrupted; rerun the same command to resume after the last completed chunk")
+        return 130
+    print_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
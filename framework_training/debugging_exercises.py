@@ -0,0 +1,193 @@
+"""
+Batch builder for debugging exercises.
+
+    python -m framework_training.debugging_exercises --variants 3 --output-dir debugging_exercises
+
+Takes every script of the action scripts corpus (or, with --generated N, N examples
+from the seeded generation engine), creates up to --variants buggy versions of each
+with the MutationEngine and writes one exercise per version as sharded JSON Lines:
+the buggy script, the original and the answer key (mutation, line, column, original
+and mutated text). The same seed gives the same exercises for any worker count.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from collections import deque
+
+from .dataset_builder import category_counts, format_duration, load_api, load_corpus, load_inputs, open_store
+from .metadata_store import METADATA_STORE_FILE
+from .utils import save_json_file
+from .generators.generation_engine import SeededGenerationEngine, derive_seed
+from .generators.mutation_engine import MUTATIONS, MutationEngine
+from .generators.output.jsonl_writer import ShardedJsonlWriter
+
+SUMMARY_FILE = "exercises_summary.json"
+
+
+def corpus_scripts(corpus):
+    """(source id, script) for every non-empty script of a CorpusBlobStore."""
+    for index in range(len(corpus)):
+        script = corpus.sql_text(index)
+        if script and script.strip():
+            source_table, action_id = corpus.script_ref(index)
+            yield f"{source_table}:{action_id if action_id is not None else index}", script
+
+
+def generated_scripts(framework_api, script_patterns, count, seed=0, workers=1, usage_counts=None):
+    """(example id, script) for count examples from the seeded generation engine."""
+    engine = SeededGenerationEngine(framework_api, script_patterns, seed=derive_seed(seed, "exercises"),
+                                    workers=workers, usage_counts=usage_counts)
+    for number, (category, example) in enumerate(engine.generate(category_counts(count)), 1):
+        yield f"{category}_{number}", example["example_script"]
+
+
+class ExerciseBuilder:
+    """Mutates a stream of (source id, script) pairs and writes the variants as exercises."""
+
+    def __init__(self, engine, writer, variants=3, progress=True):
+        self.engine = engine
+        self.writer = writer
+        self.variants = variants
+        self.progress = progress
+        self.scripts = 0
+        self.scripts_without_sites = 0
+        self.exercises = 0
+        self.mutations = dict.fromkeys(engine.mutation_names, 0)
+
+    def build(self, sources):
+        """Write every exercise; returns the summary statistics."""
+        # Sources are read ahead by the engine's worker chunks; ids wait here in input order
+        waiting = deque()
+
+        def scripts():
+            for source_id, script in sources:
+                waiting.append((source_id, script))
+                yield script
+
+        started = last_report = time.perf_counter()
+        for variants in self.engine.iter_variants(scripts(), self.variants):
+            source_id, script = waiting.popleft()
+            self.scripts += 1
+            if not variants:
+                self.scripts_without_sites += 1
+            for variant in variants:
+                self.exercises += 1
+                for entry in variant["answer_key"]:
+                    self.mutations[entry["mutation"]] += 1
+                self.writer.write({
+                    "exercise_id": f"exercise_{self.exercises}",
+                    "source_id": source_id,
+                    "variant": variant["variant"],
+                    "mutation_count": len(variant["answer_key"]),
+                    "buggy_script": variant["buggy_script"],
+                    "original_script": script,
+                    "answer_key": variant["answer_key"]
+                })
+            now = time.perf_counter()
+            if self.progress and now - last_report >= 1.0:
+                last_report = now
+                self._report_progress(now - started)
+        seconds = time.perf_counter() - started
+        if self.progress:
+            self._report_progress(seconds)
+            print()
+        return {
+            "scripts": self.scripts,
+            "scripts_without_mutation_sites": self.scripts_without_sites,
+            "exercises": self.exercises,
+            "mutations": dict(self.mutations),
+            "elapsed_seconds": round(seconds, 3),
+            "exercises_per_second": round(self.exercises / seconds) if seconds else None
+        }
+
+    def _report_progress(self, seconds):
+        rate = self.exercises / seconds if seconds else 0.0
+        sys.stdout.write(f"\r  {self.scripts:,} scripts, {self.exercises:,} exercises  {rate:,.0f}/s   ")
+        sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build debugging exercises (buggy scripts with answer keys)")
+    parser.add_argument("--output-dir", default="debugging_exercises")
+    parser.add_argument("--store", default=METADATA_STORE_FILE,
+                        help="Metadata store to load the API and corpus from (if it exists)")
+    parser.add_argument("--api", default="framework_api_details.json", help="Framework API details file without a store")
+    parser.add_argument("--corpus", default="action_scripts_corpus.json", help="Action scripts corpus file without a store")
+    parser.add_argument("--generated", type=int, metavar="N",
+                        help="Mutate N generated examples instead of the corpus scripts")
+    parser.add_argument("--variants", type=int, default=3, help="Buggy versions per script")
+    parser.add_argument("--mutations", default=",".join(MUTATIONS),
+                        help="Comma-separated mutation kinds (default: all)")
+    parser.add_argument("--min-mutations", type=int, default=1)
+    parser.add_argument("--max-mutations", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Scripts per worker task")
+    parser.add_argument("--max-shard-records", type=int, default=100000)
+    parser.add_argument("--max-shard-bytes", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--fresh", action="store_true", help="Replace an existing output-dir")
+    parser.add_argument("--quiet", action="store_true", help="No live progress line")
+    args = parser.parse_args(argv)
+
+    if args.variants <= 0 or args.chunk_size <= 0 or (args.generated is not None and args.generated <= 0):
+        parser.error("--variants, --chunk-size and --generated must be positive")
+    if os.path.isdir(args.output_dir) and os.listdir(args.output_dir) and not args.fresh:
+        parser.error(f"{args.output_dir} is not empty; pass --fresh to replace it")
+    mutations = [name.strip() for name in args.mutations.split(",") if name.strip()]
+
+    try:
+        if args.generated is not None:
+            framework_api, script_patterns, usage_counts = load_inputs(args.api, args.corpus, args.store)
+            sources = generated_scripts(framework_api, script_patterns, args.generated, seed=args.seed,
+                                        workers=args.workers or None, usage_counts=usage_counts)
+            source = f"generated ({args.generated:,} examples)"
+        else:
+            store = open_store(args.store)
+            try:
+                corpus = load_corpus(args.corpus, store)
+                framework_api = load_api(args.api, store, corpus)
+                source = args.store if store is not None and store.has_document("corpus") else args.corpus
+            finally:
+                if store is not None:
+                    store.close()
+            if corpus is None:
+                raise ValueError(f"no corpus in {args.store} or at {args.corpus} "
+                                 "(pass --generated N to mutate generated examples)")
+            sources = corpus_scripts(corpus)
+        engine = MutationEngine(framework_api, mutations=mutations, seed=args.seed,
+                                min_mutations=args.min_mutations, max_mutations=args.max_mutations,
+                                workers=args.workers or None, chunk_size=args.chunk_size)
+    except ValueError as e:
+        print(f"  ✗ {e}")
+        return 1
+
+    if args.fresh and os.path.isdir(args.output_dir):
+        shutil.rmtree(args.output_dir)
+    writer = ShardedJsonlWriter(args.output_dir, prefix="exercises", max_shard_bytes=args.max_shard_bytes,
+                                max_shard_records=args.max_shard_records, count_fields=["mutation_count"])
+    print(f"\nDEBUGGING_EXERCISES: {args.variants} variant(s) per script from {source} -> {args.output_dir}/")
+    builder = ExerciseBuilder(engine, writer, variants=args.variants, progress=not args.quiet)
+    try:
+        stats = builder.build(sources)
+    except KeyboardInterrupt:
+        print("\n  ⚠ Interrupted; the output directory is incomplete")
+        return 130
+    config = {"source": source, "variants": args.variants, "mutations": engine.mutation_names,
+              "min_mutations": engine.min_mutations, "max_mutations": engine.max_mutations, "seed": args.seed}
+    writer.close({"config": config, **stats})
+    save_json_file(os.path.join(args.output_dir, SUMMARY_FILE), {"config": config, **stats}, json_format="pretty")
+
+    print("\n=== DEBUGGING EXERCISES COMPLETE ===")
+    print(f"Wrote {stats['exercises']:,} exercises from {stats['scripts']:,} scripts "
+          f"in {format_duration(stats['elapsed_seconds'])} ({stats['exercises_per_second'] or 0:,}/s)")
+    if stats["scripts_without_mutation_sites"]:
+        print(f"  ⚠ {stats['scripts_without_mutation_sites']:,} scripts had nothing to mutate")
+    print("Mutations: " + ", ".join(f"{name} {count:,}" for name, count in stats["mutations"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
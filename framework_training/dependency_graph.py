@@ -0,0 +1,183 @@
+import re
+from collections import deque
+from datetime import datetime
+from .utils import clean_sql_text
+
+# EXEC [schema.]proc and [schema.]func( references inside a module definition
+EXEC_CALL_REGEX = re.compile(r'\bEXEC(?:UTE)?\s+(?:@\w+\s*=\s*)?(?:\[?(\w+)\]?\s*\.\s*)?\[?(\w+)\]?', re.IGNORECASE)
+FUNCTION_CALL_REGEX = re.compile(r'\b(?:\[?(\w+)\]?\s*\.\s*)?\[?(\w+)\]?\s*\(', re.IGNORECASE)
+
+
+class ProcedureDependencyGraph:
+    """
+    Dependency graph between framework objects (procedures calling procedures/functions).
+    Adjacency, transitive closure and reverse index are stored as arrays of object ids,
+    so every lookup after construction is a single list index.
+    """
+
+    def __init__(self, object_names, edges=(), source="unknown"):
+        self.source = source
+        self.names = list(object_names)
+        self.name_to_id = self._build_name_index(self.names)
+
+        adjacency = [set() for _ in self.names]
+        for caller_id, callee_id in edges:
+            if caller_id != callee_id:
+                adjacency[caller_id].add(callee_id)
+        self.adjacency = [sorted(callees) for callees in adjacency]
+        self.reverse_adjacency = self._reverse(self.adjacency)
+        self.closure = self._transitive_closure(self.adjacency)
+        self.reverse_closure = self._transitive_closure(self.reverse_adjacency)
+
+    @staticmethod
+    def _build_name_index(names):
+        """Map full and bare lowercase names to object ids."""
+        index = {}
+        for object_id, full_name in enumerate(names):
+            index.setdefault(full_name.lower(), object_id)
+            index.setdefault(full_name.split('.')[-1].lower(), object_id)
+        return index
+
+    @staticmethod
+    def _reverse(adjacency):
+        """Build the reverse adjacency arrays (callee -> callers)."""
+        reverse = [[] for _ in adjacency]
+        for caller_id, callees in enumerate(adjacency):
+            for callee_id in callees:
+                reverse[callee_id].append(caller_id)
+        return reverse
+
+    @staticmethod
+    def _transitive_closure(adjacency):
+        """Compute the set of reachable ids for every node (BFS per node)."""
+        closure = []
+        for start_id in range(len(adjacency)):
+            seen = set()
+            queue = deque(adjacency[start_id])
+            while queue:
+                node_id = queue.popleft()
+                if node_id in seen:
+                    continue
+                seen.add(node_id)
+                queue.extend(adjacency[node_id])
+            seen.discard(start_id)
+            closure.append(sorted(seen))
+        return closure
+
+    @classmethod
+    def build(cls, framework_api_details, definitions=None, dependency_rows=None):
+        """
+        Build the graph from module definitions (full name -> definition text) and/or
+        rows from sys.sql_expression_dependencies (ReferencingSchema, ReferencingName,
+        ReferencedSchema, ReferencedName). Edges from both sources are merged.
+        """
+        names = [f"{obj.get('schema_name', 'dbo')}.{obj['object_name']}" for obj in framework_api_details]
+        name_to_id = cls._build_name_index(names)
+        edges = set()
+        sources = []
+
+        if dependency_rows:
+            sources.append("sql_expression_dependencies")
+            for row in dependency_rows:
+                caller_id = cls._lookup(name_to_id, row.get('ReferencingSchema'), row.get('ReferencingName'))
+                callee_id = cls._lookup(name_to_id, row.get('ReferencedSchema'), row.get('ReferencedName'))
+                if caller_id is not None and callee_id is not None:
+                    edges.add((caller_id, callee_id))
+
+        if definitions:
+            sources.append("definition_parsing")
+            for full_name, definition_text in definitions.items():
+                caller_id = name_to_id.get(full_name.lower())
+                if caller_id is None or not definition_text:
+                    continue
+                for callee_id in cls._parse_definition_references(definition_text, name_to_id):
+                    edges.add((caller_id, callee_id))
+
+        return cls(names, edges, source="+".join(sources) or "empty")
+
+    @staticmethod
+    def _lookup(name_to_id, schema_name, object_name):
+        """Resolve a (schema, name) pair to an object id."""
+        if not object_name:
+            return None
+        if schema_name:
+            object_id = name_to_id.get(f"{schema_name}.{object_name}".lower())
+            if object_id is not None:
+                return object_id
+        return name_to_id.get(object_name.lower())
+
+    @classmethod
+    def _parse_definition_references(cls, definition_text, name_to_id):
+        """Find framework objects referenced by EXEC or function-call syntax."""
+        sql_text = clean_sql_text(definition_text)
+        referenced = set()
+        for regex in (EXEC_CALL_REGEX, FUNCTION_CALL_REGEX):
+            for match in regex.finditer(sql_text):
+                object_id = cls._lookup(name_to_id, match.group(1), match.group(2))
+                if object_id is not None:
+                    referenced.add(object_id)
+        return referenced
+
+    def _id(self, object_name):
+        """Resolve 'name', 'schema.name' or '[schema].[name]' to an object id."""
+        clean_name = object_name.replace('[', '').replace(']', '').strip().lower()
+        return self.name_to_id.get(clean_name)
+
+    def _names_for(self, arrays, object_name):
+        object_id = self._id(object_name)
+        if object_id is None:
+            return []
+        return [self.names[i] for i in arrays[object_id]]
+
+    def direct_callees(self, object_name):
+        """Objects called directly by object_name."""
+        return self._names_for(self.adjacency, object_name)
+
+    def direct_callers(self, object_name):
+        """Objects that call object_name directly."""
+        return self._names_for(self.reverse_adjacency, object_name)
+
+    def transitive_callees(self, object_name):
+        """Everything object_name eventually calls."""
+        return self._names_for(self.closure, object_name)
+
+    def transitive_callers(self, object_name):
+        """Everything that eventually depends on object_name."""
+        return self._names_for(self.reverse_closure, object_name)
+
+    def edge_count(self):
+        return sum(len(callees) for callees in self.adjacency)
+
+    def to_dict(self):
+        """Serialize the graph (arrays of ids indexed by position in 'objects')."""
+        return {
+            "metadata": {
+                "source": self.source,
+                "generated_at": datetime.now().isoformat(),
+                "object_count": len(self.names),
+                "edge_count": self.edge_count()
+            },
+            "objects": self.names,
+            "adjacency": self.adjacency,
+            "transitive_closure": self.closure,
+            "reverse_index": self.reverse_closure
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a graph from to_dict() output, reusing the cached closure if present."""
+        names = data.get("objects", [])
+        adjacency = data.get("adjacency", [])
+        edges = [(caller_id, callee_id) for caller_id, callees in enumerate(adjacency) for callee_id in callees]
+        if data.get("transitive_closure") is None or data.get("reverse_index") is None:
+            return cls(names, edges, source=data.get("metadata", {}).get("source", "file"))
+
+        graph = cls.__new__(cls)
+        graph.source = data.get("metadata", {}).get("source", "file")
+        graph.names = list(names)
+        graph.name_to_id = cls._build_name_index(graph.names)
+        graph.adjacency = [list(callees) for callees in adjacency]
+        graph.reverse_adjacency = cls._reverse(graph.adjacency)
+        graph.closure = [list(ids) for ids in data["transitive_closure"]]
+        graph.reverse_closure = [list(ids) for ids in data["reverse_index"]]
+        return graph
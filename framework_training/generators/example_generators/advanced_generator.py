@@ -1,6 +1,5 @@
 from .base_generator import ExampleGenerator
 from typing import Dict, List
-import random
 
 
 class AdvancedExampleGenerator(ExampleGenerator):
@@ -9,12 +8,8 @@ class AdvancedExampleGenerator(ExampleGenerator):
     def generate_example(self) -> Dict:
         """Generate an advanced example."""
         # Select a random procedure with parameters
-        proc = random.choice([
-            p for p in self.framework_api
-            if p.get('object_type_short') == 'P' and
-            p.get('parameters') and
-            len(p.get('parameters', [])) > 3  # Consider procedures with more parameters as complex
-        ])
+        # Procedures with more than 3 parameters count as complex
+        proc = self.pools.choice("complex", self.rng, fallback=None)
         
         # Generate script with parameters
         params = []
@@ -28,7 +23,8 @@ class AdvancedExampleGenerator(ExampleGenerator):
             "complexity": "complex",
             "learning_objectives": ["Demonstrate advanced procedure usage", "Show complex parameter handling"],
             "pattern_frequency": 50,
-            "category": "advanced"
+            "category": "advanced",
+            **self.usage_fields(proc)
         }
     
     def generate_advanced_scenario_script(self, proc: Dict, api_details: List[Dict], patterns: Dict) -> str:
@@ -1,46 +1,78 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 import random
 
+from ..utils.api_model import ensure_api_model
+from ..utils.procedure_pools import ProcedurePools
+from ..utils.value_generator import generate_sample_values
+
+# Largest batch of values drawn at once for one (parameter, type)
+MAX_VALUE_BATCH = 64
+
 
 class ExampleGenerator:
     """Base class for all example generators."""
     
-    def __init__(self, framework_api_details: List[Dict], patterns: Dict):
-        self.framework_api = framework_api_details
+    def __init__(self, framework_api_details: List[Dict], patterns: Dict, rng: Optional[random.Random] = None,
+                 procedure_pools: Optional[ProcedurePools] = None):
+        self.framework_api = ensure_api_model(framework_api_details)
+        # All draws go through self.rng so a seeded random.Random makes output reproducible
+        self.rng = rng if rng is not None else random
+        # Pass shared pools to avoid re-indexing procedures per generator
+        self.pools = procedure_pools or ProcedurePools(self.framework_api)
         self.patterns = patterns
         self.proc_map = self._create_procedure_map()
+        # (name, type) -> [values left, next batch size]; tied to the rng they were drawn from
+        self._value_batches: Dict = {}
+        self._value_rng = None
     
     def _create_procedure_map(self) -> Dict:
         """Create a lookup map for procedures."""
-        return {
-            f"{obj['schema_name']}.{obj['object_name']}": obj 
-            for obj in self.framework_api if obj.get('object_type_short') == 'P'
-        }
+        return self.framework_api.procedures_by_full_name
+    
+    def iter_examples(self, count: Optional[int] = None) -> Iterator[Dict]:
+        """Yield examples one at a time (forever when count is None)."""
+        generated = 0
+        while count is None or generated < count:
+            yield self.generate_example()
+            generated += 1
     
     def generate_examples(self, count: int) -> List[Dict]:
         """Generate multiple examples."""
-        examples = []
-        for _ in range(count):
-            examples.append(self.generate_example())
-        return examples
+        return list(self.iter_examples(count))
     
     def generate_example(self) -> Dict:
         """Generate a single example."""
         raise NotImplementedError("Subclasses must implement generate_example")
     
+    def usage_fields(self, *procs) -> Dict:
+        """procedures_used / parameters_used for an example, read by coverage tracking."""
+        return {
+            "procedures_used": [proc.full_name for proc in procs],
+            "parameters_used": [f"{proc.full_name}.{param.name}" for proc in procs for param in proc.input_parameters]
+        }
+    
     def generate_use_case_description(self, proc: Dict) -> str:
         """Generate a realistic use case description for a procedure."""
-        proc_name = f"{proc['schema_name']}.{proc['object_name']}"
+        proc_name = proc.full_name
         return f"Example demonstrating the usage of {proc_name}"
     
     def generate_sample_value(self, param_name: str, param_type: str) -> str:
-        """Generate realistic sample values based on parameter name and type."""
-        if 'nvarchar' in param_type.lower() or 'varchar' in param_type.lower():
-            # For string parameters, use the parameter name as a base
-            return f"'Sample_{param_name}'"
-        elif 'int' in param_type.lower():
-            return str(random.randint(1, 100))
-        elif 'datetime' in param_type.lower():
-            return "'2025-05-24T12:00:00'"
-        else:
-            return "DEFAULT"
+        """
+        Random SQL literal for a parameter from the shared value-provider registry.
+        Values are drawn from self.rng in batches per (name, type) that double on
+        each refill up to MAX_VALUE_BATCH, so rarely used parameters draw little.
+        Batches are dropped when self.rng is replaced (the engine reseeds it per
+        work unit), which keeps every unit reproducible on its own.
+        """
+        if self._value_rng is not self.rng:
+            self._value_rng = self.rng
+            self._value_batches = {}
+        key = (param_name, param_type)
+        batch = self._value_batches.get(key)
+        if batch is None:
+            batch = self._value_batches[key] = [[], 1]
+        if not batch[0]:
+            batch[0] = generate_sample_values(param_name, param_type, batch[1], self.rng)
+            batch[0].reverse()
+            batch[1] = min(batch[1] * 2, MAX_VALUE_BATCH)
+        return batch[0].pop()
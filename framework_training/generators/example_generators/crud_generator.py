@@ -1,6 +1,5 @@
 from .base_generator import ExampleGenerator
 from typing import Dict, List, Optional
-import random
 
 
 class CRUDExampleGenerator(ExampleGenerator):
@@ -9,7 +8,7 @@ class CRUDExampleGenerator(ExampleGenerator):
     def generate_example(self) -> Dict:
         """Generate a CRUD workflow example."""
         # Select a random CRUD operation
-        operation = random.choice(['create', 'read', 'update', 'delete'])
+        operation = self.rng.choice(['create', 'read', 'update', 'delete'])
         
         # Select an appropriate procedure
         proc = self._select_crud_procedure(operation)
@@ -24,15 +23,16 @@ class CRUDExampleGenerator(ExampleGenerator):
             "learning_objectives": [f"Demonstrate CRUD {operation} operation", 
                                   f"Show proper parameter usage for {operation} operation"],
             "pattern_frequency": 75,
-            "category": f"crud_{operation}"
+            "category": f"crud_{operation}",
+            **self.usage_fields(proc)
         }
         
         return example
     
     def _select_crud_procedure(self, operation: str) -> Dict:
         """Select an appropriate procedure for the given CRUD operation."""
-        # For testing, just select a random procedure
-        return random.choice([p for p in self.framework_api if p.get('object_type_short') == 'P'])
+        # Procedures named for the operation, or any procedure when none match
+        return self.pools.choice(f"crud_{operation}", self.rng)
     
     def generate_crud_script(self, proc: Dict, operation: str, patterns: Dict) -> str:
         """Generate a CRUD-specific script."""
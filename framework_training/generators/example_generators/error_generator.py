@@ -1,6 +1,5 @@
 from .base_generator import ExampleGenerator
 from typing import Dict, List
-import random
 
 
 class ErrorHandlingExampleGenerator(ExampleGenerator):
@@ -9,7 +8,7 @@ class ErrorHandlingExampleGenerator(ExampleGenerator):
     def generate_example(self) -> Dict:
         """Generate an error handling example."""
         # Select a random procedure
-        proc = random.choice([p for p in self.framework_api if p.get('object_type_short') == 'P'])
+        proc = self.pools.choice("all", self.rng)
         
         # Generate script with parameters
         params = []
@@ -23,7 +22,8 @@ class ErrorHandlingExampleGenerator(ExampleGenerator):
             "complexity": "medium",
             "learning_objectives": ["Demonstrate error handling with TRY-CATCH", "Show proper error message handling"],
             "pattern_frequency": 80,
-            "category": "error_handling"
+            "category": "error_handling",
+            **self.usage_fields(proc)
         }
     
     def generate_error_handling_script(self, proc: Dict, patterns: Dict) -> str:
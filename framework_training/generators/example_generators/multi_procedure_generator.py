@@ -1,13 +1,16 @@
 from .base_generator import ExampleGenerator
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 
+from ..utils.procedure_pools import ProcedurePools
+
 
 class MultiProcedureExampleGenerator(ExampleGenerator):
     """Generator for examples using multiple related procedures."""
     
-    def __init__(self, framework_api_details: List[Dict], patterns: Dict):
-        super().__init__(framework_api_details, patterns)
+    def __init__(self, framework_api_details: List[Dict], patterns: Dict, rng: Optional[random.Random] = None,
+                 procedure_pools: Optional[ProcedurePools] = None):
+        super().__init__(framework_api_details, patterns, rng, procedure_pools)
         self.relationships = self._build_relationship_map()
     
     def _build_relationship_map(self) -> Dict:
@@ -43,7 +46,7 @@ class MultiProcedureExampleGenerator(ExampleGenerator):
             }
         
         # Select a random procedure
-        proc = random.choice(procedures_with_relationships)
+        proc = self.rng.choice(procedures_with_relationships)
         proc_name = f"{proc['schema_name']}.{proc['object_name']}"
         
         # Get related procedures
@@ -69,7 +72,8 @@ class MultiProcedureExampleGenerator(ExampleGenerator):
             "complexity": "complex",
             "learning_objectives": ["Demonstrate multi-procedure workflow", "Show procedure chaining"],
             "pattern_frequency": 60,
-            "category": "multi_procedure"
+            "category": "multi_procedure",
+            **self.usage_fields(proc, *related_procedures)
         }
     
     def generate_multi_procedure_script(self, proc_names: List[str], api_details: List[Dict], patterns: Dict) -> str:
@@ -1,6 +1,5 @@
 from .base_generator import ExampleGenerator
 from typing import Dict, List
-import random
 
 
 class SimpleExampleGenerator(ExampleGenerator):
@@ -9,7 +8,7 @@ class SimpleExampleGenerator(ExampleGenerator):
     def generate_example(self) -> Dict:
         """Generate a simple example for a single procedure."""
         # Select a random procedure
-        proc = random.choice([p for p in self.framework_api if p.get('object_type_short') == 'P'])
+        proc = self.pools.choice("all", self.rng)
         
         # Generate script with parameters
         params = []
@@ -25,7 +24,8 @@ class SimpleExampleGenerator(ExampleGenerator):
             "pattern_frequency": 100,
             "example_script": f"EXEC {proc['schema_name']}.{proc['object_name']} {', '.join(params)}",
             "learning_objectives": ["Demonstrate basic procedure call with parameters"],
-            "category": "simple"
+            "category": "simple",
+            **self.usage_fields(proc)
         }
     
     def generate_simple_script(self, proc: Dict, patterns: Dict) -> str:
@@ -1,6 +1,5 @@
 from .base_generator import ExampleGenerator
 from typing import Dict, List
-import random
 
 
 class ValidationExampleGenerator(ExampleGenerator):
@@ -9,8 +8,7 @@ class ValidationExampleGenerator(ExampleGenerator):
     def generate_example(self) -> Dict:
         """Generate a validation-focused example."""
         # Select a random procedure with parameters
-        proc = random.choice([p for p in self.framework_api 
-                             if p.get('object_type_short') == 'P' and p.get('parameters')])
+        proc = self.pools.choice("with_parameters", self.rng, fallback=None)
         
         # Generate script with validation checks
         params = []
@@ -34,7 +32,8 @@ class ValidationExampleGenerator(ExampleGenerator):
             "complexity": "medium",
             "learning_objectives": ["Demonstrate input validation", "Show conditional execution"],
             "pattern_frequency": 90,
-            "category": "validation"
+            "category": "validation",
+            **self.usage_fields(proc)
         }
     
     def generate_validation_script(self, proc: Dict, patterns: Dict) -> str:
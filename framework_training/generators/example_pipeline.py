@@ -0,0 +1,259 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import time
+
+from .output.jsonl_writer import ShardedJsonlWriter
+from .utils.coverage import CoverageTracker
+from .utils.dedup import ExampleDeduplicator
+from .utils.token_packing import SequencePacker
+
+REQUIRED_FIELDS = ("complexity", "learning_objectives", "example_script")
+DIFFICULTY_LEVELS = ("simple", "medium", "complex")
+
+
+def rate_difficulty_progression(difficulty_counts: Dict[str, int]) -> str:
+    """'Good progression' when simple >= medium >= complex and simple is over 20%."""
+    total = sum(difficulty_counts.values())
+    if not total:
+        return "No examples"
+    simple_pct = (difficulty_counts.get("simple", 0) / total) * 100
+    medium_pct = (difficulty_counts.get("medium", 0) / total) * 100
+    complex_pct = (difficulty_counts.get("complex", 0) / total) * 100
+
+    # Good progression should have decreasing percentages as difficulty increases
+    if simple_pct >= medium_pct >= complex_pct and simple_pct > 20:
+        return "Good progression"
+    return f"Needs adjustment: S:{simple_pct:.0f}% M:{medium_pct:.0f}% C:{complex_pct:.0f}%"
+
+
+class PipelineStage:
+    """
+    One step of an ExamplePipeline. process() gets each (category, example) in turn
+    and returns the example to pass on (possibly a new dict) or None to drop it.
+    """
+
+    name = "stage"
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        return example
+
+    def summary(self) -> Optional[Dict]:
+        """Statistics merged into the training summary under self.name (None for none)."""
+        return None
+
+
+class CoverageStage(PipelineStage):
+    """Marks every generated example in a CoverageTracker, before anything is dropped."""
+
+    name = "coverage"
+
+    def __init__(self, tracker: CoverageTracker):
+        self.tracker = tracker
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        self.tracker.mark_example(example)
+        return example
+
+
+class ValidationStage(PipelineStage):
+    """Drops examples missing required fields or whose script has no statement besides comments."""
+
+    name = "validation"
+
+    def __init__(self, required_fields: Iterable[str] = REQUIRED_FIELDS):
+        self.required_fields = tuple(required_fields)
+        self.rejected: Dict[str, int] = {}
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        missing = [field for field in self.required_fields if not example.get(field)]
+        if missing:
+            return self._reject(f"missing_{missing[0]}")
+        script = example["example_script"]
+        if not any(line.strip() and not line.lstrip().startswith("--") for line in script.split("\n")):
+            return self._reject("comment_only_script")
+        return example
+
+    def _reject(self, reason: str) -> None:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return None
+
+    def summary(self) -> Dict:
+        return {"rejected": sum(self.rejected.values()), "rejected_by_reason": dict(self.rejected)}
+
+
+class DedupStage(PipelineStage):
+    """Drops near-duplicate scripts (see ExampleDeduplicator)."""
+
+    name = "deduplication"
+
+    def __init__(self, deduplicator: ExampleDeduplicator):
+        self.deduplicator = deduplicator
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        return example if self.deduplicator.add(example["example_script"], category) else None
+
+    def summary(self) -> Dict:
+        return self.deduplicator.summary()
+
+
+class EnrichmentStage(PipelineStage):
+    """Turns generator output into the training example record, numbering examples as they pass."""
+
+    name = "enrichment"
+
+    def __init__(self, id_prefix: str = "pattern_example_", start_id: int = 1):
+        self.id_prefix = id_prefix
+        self.next_id = start_id
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        record = {
+            "example_id": f"{self.id_prefix}{self.next_id}",
+            "complexity_level": example["complexity"],
+            "learning_objectives": example["learning_objectives"],
+            "example_script": example["example_script"],
+            "pattern_frequency": example.get("pattern_frequency", 0),
+            "procedures_used": example.get("procedures_used", []),
+            "category": category
+        }
+        self.next_id += 1
+        return record
+
+
+class StatisticsStage(PipelineStage):
+    """Running totals by category and complexity; nothing per example is kept."""
+
+    name = "statistics"
+
+    def __init__(self):
+        self.total = 0
+        self.categories: Dict[str, int] = {}
+        self.difficulties: Dict[str, int] = dict.fromkeys(DIFFICULTY_LEVELS, 0)
+
+    def process(self, category: str, example: Dict) -> Optional[Dict]:
+        self.total += 1
+        self.categories[category] = self.categories.get(category, 0) + 1
+        difficulty = example.get("complexity_level", example.get("complexity", "simple"))
+        self.difficulties[difficulty] = self.difficulties.get(difficulty, 0) + 1
+        return example
+
+    def summary(self) -> Dict:
+        return {
+            "total_examples": self.total,
+            "category_distribution": dict(self.categories),
+            "complexity_distribution": dict(self.difficulties),
+            "difficulty_progression": rate_difficulty_progression(self.difficulties)
+        }
+
+
+class ListSink:
+    """Keeps every record (needed for JSON and Markdown output)."""
+
+    def __init__(self):
+        self.records: List[Dict] = []
+
+    def write(self, record: Dict) -> None:
+        self.records.append(record)
+
+    def close(self) -> Dict:
+        return {}
+
+
+class JsonlSink:
+    """Streams records into sharded JSON Lines; only the current line is in memory."""
+
+    def __init__(self, writer: ShardedJsonlWriter, manifest_extra: Optional[Dict] = None):
+        self.writer = writer
+        self.manifest_extra = manifest_extra
+
+    def write(self, record: Dict) -> None:
+        self.writer.write(record)
+
+    def close(self) -> Dict:
+        manifest = self.writer.close(self.manifest_extra)
+        return {"shard_count": len(manifest["shards"])}
+
+
+class PackingSink:
+    """Packs records into token-budgeted sequences (SequencePacker) and writes the sequences to sink."""
+
+    def __init__(self, packer: SequencePacker, sink):
+        self.packer = packer
+        self.sink = sink
+
+    def write(self, record: Dict) -> None:
+        for sequence in self.packer.add(record):
+            self.sink.write(sequence)
+
+    def close(self) -> Dict:
+        for sequence in self.packer.flush():
+            self.sink.write(sequence)
+        return {**self.sink.close(), "packing": self.packer.summary()}
+
+
+class ExamplePipeline:
+    """
+    Pulls (category, example) pairs from a producer one at a time, passes each
+    through the stages in order and writes survivors to the sink. Nothing is
+    buffered between stages, so memory depends on the sink, not the example count.
+    """
+
+    def __init__(self, stages: List[PipelineStage], sink=None, timed: bool = False):
+        self.stages = stages
+        self.sink = sink
+        self.timed = timed
+        # stage name -> [items in, seconds]; filled only when timed
+        self.timings: Dict[str, List[float]] = {stage.name: [0, 0.0] for stage in stages}
+
+    def stream(self, items: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple[str, Dict]]:
+        """Lazily yield (category, record) for the items that pass every stage."""
+        if self.timed:
+            yield from self._stream_timed(items)
+            return
+        stages = self.stages
+        for category, example in items:
+            for stage in stages:
+                example = stage.process(category, example)
+                if example is None:
+                    break
+            else:
+                yield category, example
+
+    def _stream_timed(self, items: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple[str, Dict]]:
+        timed_stages = [(stage, self.timings[stage.name]) for stage in self.stages]
+        clock = time.perf_counter
+        for category, example in items:
+            for stage, timing in timed_stages:
+                started = clock()
+                example = stage.process(category, example)
+                timing[0] += 1
+                timing[1] += clock() - started
+                if example is None:
+                    break
+            else:
+                yield category, example
+
+    def throughput(self) -> Dict[str, Dict]:
+        """Items and items per second for each stage (timed pipelines only)."""
+        return {
+            name: {"items": int(items), "seconds": round(seconds, 3),
+                   "per_second": round(items / seconds) if seconds else None}
+            for name, (items, seconds) in self.timings.items()
+        }
+
+    def run(self, items: Iterable[Tuple[str, Dict]]) -> Dict:
+        """Drain items into the sink; returns the merged stage and sink statistics."""
+        for _, record in self.stream(items):
+            self.sink.write(record)
+        return self.summary(self.sink.close())
+
+    def summary(self, extra: Optional[Dict] = None) -> Dict:
+        summary: Dict = {}
+        for stage in self.stages:
+            stage_summary = stage.summary()
+            if stage_summary is None:
+                continue
+            if isinstance(stage, StatisticsStage):
+                summary.update(stage_summary)
+            else:
+                summary[stage.name] = stage_summary
+        summary.update(extra or {})
+        return summary
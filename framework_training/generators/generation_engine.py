@@ -0,0 +1,176 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+import random
+
+from .example_generators.simple_generator import SimpleExampleGenerator
+from .example_generators.validation_generator import ValidationExampleGenerator
+from .example_generators.crud_generator import CRUDExampleGenerator
+from .example_generators.error_generator import ErrorHandlingExampleGenerator
+from .example_generators.multi_procedure_generator import MultiProcedureExampleGenerator
+from .example_generators.advanced_generator import AdvancedExampleGenerator
+from .utils.api_model import ensure_api_model
+from .utils.coverage import CoverageTracker
+from .utils.procedure_pools import ProcedurePools
+
+GENERATOR_CLASSES = {
+    "simple": SimpleExampleGenerator,
+    "validation": ValidationExampleGenerator,
+    "crud": CRUDExampleGenerator,
+    "error_handling": ErrorHandlingExampleGenerator,
+    "multi_procedure": MultiProcedureExampleGenerator,
+    "advanced": AdvancedExampleGenerator
+}
+DEFAULT_UNIT_SIZE = 25
+
+# (category, unit_index, example_count)
+WorkUnit = Tuple[str, int, int]
+
+
+def derive_seed(master_seed: int, *keys) -> int:
+    """64-bit seed for one work unit; depends only on the master seed and the unit's keys."""
+    material = "|".join(str(key) for key in (master_seed,) + keys).encode('utf-8')
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], 'big')
+
+
+def interleave_categories(counts: Dict[str, int]) -> Iterator[str]:
+    """Categories in proportion to counts, spread evenly (smooth weighted round-robin)."""
+    weights = {category: count for category, count in counts.items() if count > 0}
+    total = sum(weights.values())
+    if not total:
+        return
+    current = dict.fromkeys(weights, 0)
+    while True:
+        for category, weight in weights.items():
+            current[category] += weight
+        category = max(current, key=current.get)
+        current[category] -= total
+        yield category
+
+
+def plan_work_units(counts: Dict[str, int], unit_size: int = DEFAULT_UNIT_SIZE) -> List[WorkUnit]:
+    """Split per-category counts into fixed-size units, in category order then unit order."""
+    units = []
+    for category, count in counts.items():
+        for unit_index, start in enumerate(range(0, count, unit_size)):
+            units.append((category, unit_index, min(unit_size, count - start)))
+    return units
+
+
+# Per-process state set by _init_worker (or directly when running in-process)
+_worker_state: Dict = {}
+
+
+def _init_worker(framework_api_details, script_patterns: Dict, master_seed: int,
+                 usage_counts: Optional[Dict[str, int]] = None) -> None:
+    framework_api = ensure_api_model(framework_api_details)
+    _worker_state.clear()
+    _worker_state.update({
+        "framework_api": framework_api,
+        "script_patterns": script_patterns,
+        "master_seed": master_seed,
+        # Indexed once per process and shared by every generator
+        "procedure_pools": ProcedurePools(framework_api, usage_counts),
+        "generators": {}
+    })
+
+
+def _run_work_unit(unit: WorkUnit) -> List[Optional[Dict]]:
+    category, unit_index, count = unit
+    generator = _worker_state["generators"].get(category)
+    if generator is None:
+        generator = GENERATOR_CLASSES[category](_worker_state["framework_api"], _worker_state["script_patterns"],
+                                                procedure_pools=_worker_state["procedure_pools"])
+        _worker_state["generators"][category] = generator
+    generator.rng = random.Random(derive_seed(_worker_state["master_seed"], category, unit_index))
+    return generator.generate_examples(count)
+
+
+def _ordered_results(pool: ProcessPoolExecutor, units: List[WorkUnit], window: int) -> Iterator[List[Optional[Dict]]]:
+    """Unit results in plan order with at most window units in flight (pool.map submits everything up front)."""
+    pending = deque()
+    for unit in units:
+        pending.append(pool.submit(_run_work_unit, unit))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class SeededGenerationEngine:
+    """
+    Runs the example generators as independent work units. Every unit draws from its
+    own random.Random seeded from (master seed, category, unit index) and results are
+    merged in plan order, so the same seed gives identical output for any worker count.
+    Procedures are drawn from ProcedurePools weighted by usage_counts (full name -> calls).
+    """
+
+    def __init__(self, framework_api_details, script_patterns: Dict, seed: int = 0,
+                 workers: Optional[int] = 1, unit_size: int = DEFAULT_UNIT_SIZE,
+                 usage_counts: Optional[Dict[str, int]] = None):
+        self.framework_api = ensure_api_model(framework_api_details)
+        self.script_patterns = script_patterns
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.unit_size = unit_size
+        self.usage_counts = usage_counts
+        self.coverage: Optional[CoverageTracker] = None
+
+    def generate(self, counts: Dict[str, int]) -> Iterator[Tuple[str, Dict]]:
+        """Yield (category, example) in a stable order; categories must be in GENERATOR_CLASSES."""
+        units = plan_work_units(counts, self.unit_size)
+        if self.workers == 1 or len(units) <= 1:
+            _init_worker(self.framework_api, self.script_patterns, self.seed, self.usage_counts)
+            results = map(_run_work_unit, units)
+            yield from self._merge(units, results)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(units)), initializer=_init_worker,
+                                 initargs=(self.framework_api, self.script_patterns, self.seed,
+                                           self.usage_counts)) as pool:
+            # Results come back in submission order regardless of completion order; the bounded
+            # window keeps memory independent of the number of units
+            yield from self._merge(units, _ordered_results(pool, units, self.workers * 2))
+
+    @staticmethod
+    def _merge(units: List[WorkUnit], results) -> Iterator[Tuple[str, Dict]]:
+        for (category, _, _), examples in zip(units, results):
+            for example in examples:
+                if example is not None:
+                    yield category, example
+
+    def generate_to_coverage(self, counts: Dict[str, int], target: float = 1.0, min_examples: int = 0,
+                             max_examples: Optional[int] = None, parameter_target: Optional[float] = None,
+                             bias: float = 0.9) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (category, example) until procedure coverage reaches target (and parameter
+        coverage reaches parameter_target, if given) with at least min_examples, or
+        max_examples (default: sum of counts) have been generated. Categories are mixed
+        in proportion to counts, and procedure picks prefer uncovered procedures with
+        probability bias. Runs in-process because each pick depends on the coverage so
+        far; each category has its own seeded stream, so output depends only on the seed.
+        Coverage is left in self.coverage.
+        """
+        if max_examples is None:
+            max_examples = sum(counts.values())
+        pools = ProcedurePools(self.framework_api, self.usage_counts)
+        pools.track_coverage(bias)
+        self.coverage = tracker = CoverageTracker(self.framework_api, pools)
+        generators = {}
+        for category in counts:
+            generator = GENERATOR_CLASSES[category](self.framework_api, self.script_patterns, procedure_pools=pools)
+            generator.rng = random.Random(derive_seed(self.seed, "coverage", category))
+            generators[category] = generator
+
+        produced = 0
+        for category in interleave_categories(counts):
+            if produced >= max_examples:
+                break
+            if produced >= min_examples and tracker.reached(target, parameter_target):
+                break
+            example = generators[category].generate_example()
+            produced += 1
+            if example is not None:
+                tracker.mark_example(example)
+                yield category, example
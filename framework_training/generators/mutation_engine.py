@@ -0,0 +1,293 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import hashlib
+import os
+import random
+import re
+
+from .generation_engine import derive_seed
+from .utils.api_model import ensure_api_model
+
+# Mutation sites inside string literals or comments are skipped
+_MASKED = re.compile(r"N?'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SEMICOLON = re.compile(r";[ \t]*$", re.MULTILINE)
+_VARIABLE_AT = re.compile(r"(?<![@\w])@(?=[A-Za-z_])")
+_TRY_CATCH = re.compile(r"\b(BEGIN|END)(\s+)(TRY|CATCH)\b", re.IGNORECASE)
+_EXEC = re.compile(r"\bEXEC(?:UTE)?\s+((?:\[?\w+\]?\.)?\[?(\w+)\]?)", re.IGNORECASE)
+_STATEMENT_END = re.compile(r";|\n[ \t]*\n|\Z")
+_ASSIGNED_PARAMETER = re.compile(r"(@\w+)(\s*=)")
+
+# (start, end, data): a span a mutation could change; data is whatever edit() needs
+Site = Tuple[int, int, object]
+# (start, end, replacement, mutation name, description)
+Edit = Tuple[int, int, str, str, str]
+
+
+class Mutation:
+    """
+    One kind of error. sites() lists every place it could be applied (once per
+    script); edit() turns a chosen site into the replacement text and its
+    description, drawing any randomness from rng, or returns None to skip it.
+    """
+
+    name = "mutation"
+
+    def sites(self, script: str, engine: "MutationEngine") -> List[Site]:
+        raise NotImplementedError
+
+    def edit(self, script: str, site: Site, rng: random.Random,
+             engine: "MutationEngine") -> Optional[Tuple[str, str]]:
+        raise NotImplementedError
+
+
+class MissingSemicolon(Mutation):
+    name = "missing_semicolon"
+
+    def sites(self, script, engine):
+        return [(match.start(), match.start() + 1, None) for match in _SEMICOLON.finditer(script)]
+
+    def edit(self, script, site, rng, engine):
+        return "", "Statement terminator ';' removed"
+
+
+class DroppedAt(Mutation):
+    name = "dropped_at"
+
+    def sites(self, script, engine):
+        return [(match.start(), match.end(), None) for match in _VARIABLE_AT.finditer(script)]
+
+    def edit(self, script, site, rng, engine):
+        variable = re.match(r"@\w+", script[site[0]:]).group(0)
+        return "", f"'@' dropped from variable {variable}"
+
+
+class BrokenTry(Mutation):
+    name = "broken_try"
+
+    def sites(self, script, engine):
+        # BEGIN TRY -> BEGIN, END CATCH -> END, ...: the block still parses as BEGIN/END but loses TRY/CATCH
+        return [(match.start(2), match.end(3), match.group(1)) for match in _TRY_CATCH.finditer(script)]
+
+    def edit(self, script, site, rng, engine):
+        return "", f"'{site[2]}{script[site[0]:site[1]]}' changed to '{site[2]}'"
+
+
+class MisspelledProcedure(Mutation):
+    name = "misspelled_procedure"
+
+    def sites(self, script, engine):
+        return [(match.start(2), match.end(2), None) for match in _EXEC.finditer(script)]
+
+    def edit(self, script, site, rng, engine):
+        name = script[site[0]:site[1]]
+        typo = engine.misspell(name, rng)
+        if typo is None:
+            return None
+        return typo, f"Procedure name '{name}' misspelled as '{typo}'"
+
+
+class WrongParameterName(Mutation):
+    """A parameter of a known procedure renamed to one that only other procedures have."""
+
+    name = "wrong_parameter_name"
+
+    def sites(self, script, engine):
+        sites = []
+        for match in _EXEC.finditer(script):
+            proc = engine.framework_api.lookup(match.group(1))
+            if proc is None:
+                continue
+            own = frozenset(param.lower_name for param in proc.input_parameters)
+            end = _STATEMENT_END.search(script, match.end()).start()
+            for assigned in _ASSIGNED_PARAMETER.finditer(script, match.end(), end):
+                if assigned.group(1).lower() in own:
+                    sites.append((assigned.start(1), assigned.end(1), (proc.full_name, own)))
+        return sites
+
+    def edit(self, script, site, rng, engine):
+        right = script[site[0]:site[1]]
+        proc_name, own = site[2]
+        wrong = engine.wrong_parameter(right, own, rng)
+        if wrong is None:
+            return None
+        return wrong, f"{wrong} is not a parameter of {proc_name} (should be {right})"
+
+
+MUTATIONS = {mutation.name: mutation for mutation in (
+    MissingSemicolon(), DroppedAt(), BrokenTry(), MisspelledProcedure(), WrongParameterName())}
+
+
+class MutationEngine:
+    """
+    Creates debugging exercises: K variants per script, each with one or more
+    mutations from the catalogue and an answer key (mutation, line, column, original
+    and mutated text). Variant v of a script draws from a random.Random seeded from
+    (seed, script content, v), so variants do not depend on batch order or workers.
+    """
+
+    def __init__(self, framework_api_details, mutations: Optional[Sequence[str]] = None, seed: int = 0,
+                 min_mutations: int = 1, max_mutations: int = 3, workers: Optional[int] = 1, chunk_size: int = 64):
+        # Required: wrong parameter names come from the real signatures, typos must not name real objects
+        self.framework_api = ensure_api_model(framework_api_details)
+        unknown = set(mutations or ()) - set(MUTATIONS)
+        if unknown:
+            raise ValueError(f"unknown mutations: {', '.join(sorted(unknown))}")
+        self.mutation_names = list(mutations or MUTATIONS)
+        self.catalogue = [MUTATIONS[name] for name in self.mutation_names]
+        self.seed = seed
+        self.min_mutations = min_mutations
+        self.max_mutations = max(min_mutations, max_mutations)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # Candidate wrong names: every parameter name in the API, grouped by first letters
+        self.parameter_names = sorted({param.name for proc in self.framework_api.procedures
+                                       for param in proc.input_parameters})
+        self._by_prefix: Dict[str, List[str]] = {}
+        for name in self.parameter_names:
+            self._by_prefix.setdefault(name[:3].lower(), []).append(name)
+
+    def misspell(self, name: str, rng: random.Random) -> Optional[str]:
+        """A typo of name that is not itself a known object (None when none is found)."""
+        if len(name) < 2:
+            return None
+        for _ in range(5):
+            kind = rng.randrange(4)
+            if kind == 0 and "_" in name:
+                underscores = [index for index, char in enumerate(name) if char == "_"]
+                index = rng.choice(underscores)
+                typo = name[:index] + name[index + 1:]
+            elif kind == 1 and len(name) > 3:
+                index = rng.randrange(1, len(name))
+                typo = name[:index] + name[index + 1:]
+            elif kind == 2 and len(name) > 3:
+                index = rng.randrange(1, len(name) - 1)
+                typo = name[:index] + name[index + 1] + name[index] + name[index + 2:]
+            else:
+                index = rng.randrange(1, len(name))
+                typo = name[:index] + name[index] + name[index:]
+            if typo != name and self.framework_api.lookup(typo) is None:
+                return typo
+        return None
+
+    def wrong_parameter(self, right: str, own: set, rng: random.Random) -> Optional[str]:
+        """A real parameter name of another procedure, preferring look-alikes of right."""
+        for pool in (self._by_prefix.get(right[:3].lower(), ()), self.parameter_names):
+            candidates = [name for name in pool if name.lower() not in own]
+            if candidates:
+                return rng.choice(candidates)
+        return None
+
+    def _rng(self, script: str, variant: int) -> random.Random:
+        digest = hashlib.blake2b(script.encode('utf-8'), digest_size=8).hexdigest()
+        return random.Random(derive_seed(self.seed, "mutation", digest, variant))
+
+    def candidate_sites(self, script: str) -> Dict[str, List[Site]]:
+        """Sites per mutation kind, outside string literals and comments."""
+        masked = [match.span() for match in _MASKED.finditer(script)]
+        sites = {}
+        for mutation in self.catalogue:
+            visible = [site for site in mutation.sites(script, self)
+                       if not any(start <= site[0] < end for start, end in masked)]
+            if visible:
+                sites[mutation.name] = visible
+        return sites
+
+    def mutate(self, script: str, variant: int = 0, sites: Optional[Dict[str, List[Site]]] = None) -> Optional[Dict]:
+        """One variant of script, or None when no mutation applies."""
+        if sites is None:
+            sites = self.candidate_sites(script)
+        if not sites:
+            return None
+        rng = self._rng(script, variant)
+        remaining = {kind: list(kind_sites) for kind, kind_sites in sites.items()}
+        kinds = sorted(remaining)
+        wanted = rng.randint(self.min_mutations, self.max_mutations)
+        chosen: List[Edit] = []
+        while kinds and len(chosen) < wanted:
+            # Spread mutations over kinds first, then over sites of the kind
+            kind = rng.choice(kinds)
+            start, end, data = remaining[kind].pop(rng.randrange(len(remaining[kind])))
+            if not remaining[kind]:
+                kinds.remove(kind)
+            if any(start < other[1] and other[0] < end for other in chosen):
+                continue
+            edit = MUTATIONS[kind].edit(script, (start, end, data), rng, self)
+            if edit is not None:
+                chosen.append((start, end, edit[0], kind, edit[1]))
+        return self._apply(script, variant, chosen) if chosen else None
+
+    def _apply(self, script: str, variant: int, edits: List[Edit]) -> Dict:
+        answer_key = []
+        for start, end, replacement, name, description in sorted(edits):
+            line_start = script.rfind("\n", 0, start) + 1
+            answer_key.append({
+                "mutation": name,
+                "line": script.count("\n", 0, start) + 1,
+                "column": start - line_start + 1,
+                "original": script[start:end],
+                "mutated": replacement,
+                "description": description
+            })
+        mutated = script
+        for start, end, replacement, _, _ in sorted(edits, reverse=True):
+            mutated = mutated[:start] + replacement + mutated[end:]
+        return {"variant": variant, "buggy_script": mutated, "answer_key": answer_key}
+
+    def variants(self, script: str, count: int) -> List[Dict]:
+        """Up to count distinct variants of one script (fewer when it has few mutation sites)."""
+        variants, seen = [], set()
+        sites = self.candidate_sites(script)
+        for variant in range(count * 2 if sites else 0):
+            result = self.mutate(script, variant, sites)
+            if result is None:
+                # Every pick of this index failed (overlaps, no typo, no wrong name); the next may not
+                continue
+            if result["buggy_script"] not in seen:
+                seen.add(result["buggy_script"])
+                result["variant"] = len(variants)
+                variants.append(result)
+                if len(variants) == count:
+                    break
+        return variants
+
+    def mutate_batch(self, scripts: Sequence[str], variants_per_script: int = 3) -> List[List[Dict]]:
+        """variants() for every script, in input order; chunks of scripts run on worker processes."""
+        return list(self.iter_variants(scripts, variants_per_script))
+
+    def iter_variants(self, scripts: Iterable[str], variants_per_script: int = 3) -> Iterator[List[Dict]]:
+        """
+        variants() for each script of an iterable of any length, yielded in input order.
+        With workers > 1, chunks of chunk_size scripts run on one process pool with at
+        most two chunks per worker in flight, so memory does not grow with the input.
+        """
+        scripts = iter(scripts)
+        chunks = iter(lambda: list(islice(scripts, self.chunk_size)), [])
+        # A single chunk is not worth starting worker processes for
+        head = list(islice(chunks, 2)) if self.workers > 1 else []
+        if len(head) <= 1:
+            for script in chain(*head, scripts):
+                yield self.variants(script, variants_per_script)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self,)) as pool:
+            pending = deque()
+            for chunk in chain(head, chunks):
+                pending.append(pool.submit(_mutate_chunk, chunk, variants_per_script))
+                if len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+# Per-process engine set by _init_worker
+_worker_state: Dict = {}
+
+
+def _init_worker(engine: MutationEngine) -> None:
+    _worker_state["engine"] = engine
+
+
+def _mutate_chunk(scripts: Sequence[str], variants_per_script: int) -> List[List[Dict]]:
+    engine = _worker_state["engine"]
+    return [engine.variants(script, variants_per_script) for script in scripts]
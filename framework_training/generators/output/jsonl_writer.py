@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from array import array
+from bisect import bisect_right
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = "manifest.json"
+
+
+class ShardedJsonlWriter:
+    """
+    Appends records as JSON Lines, rotating to a new shard once max_shard_bytes or
+    max_shard_records is reached. Every shard gets a binary offset index (.idx,
+    one unsigned 64-bit offset per record); close() writes manifest.json with
+    record counts, byte sizes, sha256 checksums and optional per-field counts.
+    Only the current line is held in memory.
+    """
+
+    def __init__(self, output_dir: str, prefix: str = "examples",
+                 max_shard_bytes: int = 64 * 1024 * 1024, max_shard_records: int = 100000,
+                 count_fields: Optional[List[str]] = None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_shard_bytes = max_shard_bytes
+        self.max_shard_records = max_shard_records
+        self.count_fields = count_fields or []
+        self.field_counts: Dict[str, Dict[str, int]] = {field: {} for field in self.count_fields}
+        self.shards: List[Dict] = []
+        self.total_records = 0
+        self._file = None
+        self._offsets = None
+        self._digest = None
+        self._shard_bytes = 0
+        self.manifest: Optional[Dict] = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self) -> "ShardedJsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _open_shard(self) -> None:
+        shard_name = f"{self.prefix}-{len(self.shards):05d}.jsonl"
+        self._file = open(os.path.join(self.output_dir, shard_name), 'wb')
+        self._offsets = array('Q')
+        self._digest = hashlib.sha256()
+        self._shard_bytes = 0
+        self.shards.append({"file": shard_name, "index_file": shard_name[:-len(".jsonl")] + ".idx",
+                            "first_record": self.total_records})
+
+    def _close_shard(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        shard = self.shards[-1]
+        with open(os.path.join(self.output_dir, shard["index_file"]), 'wb') as f:
+            self._offsets.tofile(f)
+        shard.update({"records": len(self._offsets), "bytes": self._shard_bytes, "sha256": self._digest.hexdigest()})
+        self._file = None
+
+    def write(self, record: Dict) -> int:
+        """Append one record; returns its global record number."""
+        line = (json.dumps(record, separators=(',', ':'), ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        if self._file is not None and self._offsets and (
+                self._shard_bytes + len(line) > self.max_shard_bytes or len(self._offsets) >= self.max_shard_records):
+            self._close_shard()
+        if self._file is None:
+            self._open_shard()
+        self._offsets.append(self._shard_bytes)
+        self._file.write(line)
+        self._digest.update(line)
+        self._shard_bytes += len(line)
+
+        for field in self.count_fields:
+            value = str(record.get(field, "unknown"))
+            self.field_counts[field][value] = self.field_counts[field].get(value, 0) + 1
+        self.total_records += 1
+        return self.total_records - 1
+
+    def write_all(self, records: Iterable[Dict]) -> int:
+        for record in records:
+            self.write(record)
+        return self.total_records
+
+    def close(self, metadata: Optional[Dict] = None) -> Dict:
+        """Finish the current shard and write the manifest; returns the manifest."""
+        if self.manifest is not None:
+            return self.manifest
+        self._close_shard()
+        manifest = {
+            "metadata": metadata or {},
+            "total_records": self.total_records,
+            "total_bytes": sum(shard["bytes"] for shard in self.shards),
+            "shards": self.shards,
+            "field_counts": self.field_counts
+        }
+        with open(os.path.join(self.output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        self.manifest = manifest
+        return manifest
+
+
+class JsonlShardReader:
+    """Random access and streaming over shards written by ShardedJsonlWriter."""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.shards = self.manifest["shards"]
+        self._first_records = [shard["first_record"] for shard in self.shards]
+        self._offsets: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return self.manifest["total_records"]
+
+    def _shard_offsets(self, shard_number: int) -> array:
+        offsets = self._offsets.get(shard_number)
+        if offsets is None:
+            offsets = array('Q')
+            index_path = os.path.join(self.output_dir, self.shards[shard_number]["index_file"])
+            with open(index_path, 'rb') as f:
+                offsets.frombytes(f.read())
+            self._offsets[shard_number] = offsets
+        return offsets
+
+    def __getitem__(self, record_number: int) -> Dict:
+        if record_number < 0:
+            record_number += len(self)
+        if not 0 <= record_number < len(self):
+            raise IndexError(record_number)
+        shard_number = bisect_right(self._first_records, record_number) - 1
+        shard = self.shards[shard_number]
+        offset = self._shard_offsets(shard_number)[record_number - shard["first_record"]]
+        with open(os.path.join(self.output_dir, shard["file"]), 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def __iter__(self) -> Iterator[Dict]:
+        for shard in self.shards:
+            with open(os.path.join(self.output_dir, shard["file"]), 'rb') as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def verify(self) -> List[str]:
+        """Names of shards whose size or sha256 no longer matches the manifest."""
+        damaged = []
+        for shard in self.shards:
+            digest = hashlib.sha256()
+            path = os.path.join(self.output_dir, shard["file"])
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            if os.path.getsize(path) != shard["bytes"] or digest.hexdigest() != shard["sha256"]:
+                damaged.append(shard["file"])
+        return damaged
@@ -29,11 +29,18 @@ class MarkdownGenerator:
         os.makedirs(examples_dir, exist_ok=True)
         
         for example in examples:
-            filename = f"{example['example_id']}.md"
+            # Packed sequences (pack_max_tokens) become one file holding all their examples
+            if "sequence_id" in example:
+                filename = f"{example['sequence_id']}.md"
+                content = f"# {example['sequence_id']} (~{example['token_estimate']} tokens)\n\n" + "\n\n".join(
+                    self._format_example_markdown(packed) for packed in example["examples"])
+            else:
+                filename = f"{example['example_id']}.md"
+                content = self._format_example_markdown(example)
             filepath = os.path.join(examples_dir, filename)
             
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(self._format_example_markdown(example))
+                f.write(content)
     
     def _format_example_markdown(self, example: Dict) -> str:
         """Format a single example as markdown."""
@@ -51,7 +58,7 @@ class MarkdownGenerator:
         md.append(example['example_script'])
         md.append("```")
         
-        md.append("\n## Category: {example['category']}")
+        md.append(f"\n## Category: {example['category']}")
         return '\n'.join(md)
     
     def _generate_curriculum_markdown(self, curriculum: Dict) -> None:
@@ -0,0 +1,212 @@
+from typing import Dict, List, Optional
+import base64
+import hashlib
+import math
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash of a string."""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class SpaceSavingCounter:
+    """Top-k heavy hitters in fixed memory (Space-Saving algorithm)."""
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self.counts: Dict[str, List[int]] = {}  # item -> [count, overestimation error]
+
+    def add(self, item: str, count: int = 1) -> None:
+        entry = self.counts.get(item)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = [count, 0]
+        else:
+            # Replace the current minimum; its count becomes the error bound
+            victim = min(self.counts, key=lambda key: self.counts[key][0])
+            floor = self.counts.pop(victim)[0]
+            self.counts[item] = [floor + count, floor]
+
+    def merge(self, other: "SpaceSavingCounter") -> "SpaceSavingCounter":
+        merged: Dict[str, List[int]] = {}
+        for source in (self.counts, other.counts):
+            for item, (count, error) in source.items():
+                entry = merged.setdefault(item, [0, 0])
+                entry[0] += count
+                entry[1] += error
+        top = sorted(merged.items(), key=lambda kv: (-kv[1][0], kv[0]))[:self.capacity]
+        self.counts = {item: entry for item, entry in top}
+        return self
+
+    def top(self, k: Optional[int] = None) -> List[Dict]:
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        return [{"value": item, "count": count, "error": error} for item, (count, error) in ranked[:k]]
+
+    def to_dict(self) -> Dict:
+        return {"capacity": self.capacity, "items": self.top()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpaceSavingCounter":
+        counter = cls(data.get("capacity", 16))
+        counter.counts = {item["value"]: [item["count"], item.get("error", 0)] for item in data.get("items", [])}
+        return counter
+
+
+class HyperLogLog:
+    """Distinct-count estimator with 2**precision one-byte registers."""
+
+    def __init__(self, precision: int = 8):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        hashed = _hash64(value)
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        register_count = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / register_count)
+        raw = alpha * register_count * register_count / sum(2.0 ** -r for r in self.registers)
+        zero_registers = self.registers.count(0)
+        if raw <= 2.5 * register_count and zero_registers:
+            # Small-range correction (linear counting)
+            return int(round(register_count * math.log(register_count / zero_registers)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self.registers)).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HyperLogLog":
+        sketch = cls(data.get("precision", 8))
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+
+class ParameterUsageSketch:
+    """Fixed-size usage statistics for one (procedure, parameter) pair."""
+
+    def __init__(self, top_k: int = 16, hll_precision: int = 8):
+        self.literal_values = SpaceSavingCounter(top_k)
+        self.variable_names = SpaceSavingCounter(top_k)
+        self.distinct_values = HyperLogLog(hll_precision)
+        self.named_count = 0
+        self.positional_count = 0
+
+    def add(self, value: str, positional: bool = False) -> None:
+        value = value.strip()
+        if positional:
+            self.positional_count += 1
+        else:
+            self.named_count += 1
+        if value.startswith('@'):
+            self.variable_names.add(value.split()[0].lower())
+        else:
+            self.literal_values.add(value)
+        self.distinct_values.add(value)
+
+    def merge(self, other: "ParameterUsageSketch") -> "ParameterUsageSketch":
+        self.literal_values.merge(other.literal_values)
+        self.variable_names.merge(other.variable_names)
+        self.distinct_values.merge(other.distinct_values)
+        self.named_count += other.named_count
+        self.positional_count += other.positional_count
+        return self
+
+    def to_dict(self) -> Dict:
+        total = self.named_count + self.positional_count
+        return {
+            "usage_count": total,
+            "named_count": self.named_count,
+            "positional_count": self.positional_count,
+            "named_ratio": round(self.named_count / total, 3) if total else 0.0,
+            "distinct_values_estimate": self.distinct_values.estimate(),
+            "top_literal_values": self.literal_values.to_dict(),
+            "top_variable_names": self.variable_names.to_dict(),
+            "distinct_values_sketch": self.distinct_values.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ParameterUsageSketch":
+        sketch = cls()
+        sketch.named_count = data.get("named_count", 0)
+        sketch.positional_count = data.get("positional_count", 0)
+        sketch.literal_values = SpaceSavingCounter.from_dict(data.get("top_literal_values", {}))
+        sketch.variable_names = SpaceSavingCounter.from_dict(data.get("top_variable_names", {}))
+        if "distinct_values_sketch" in data:
+            sketch.distinct_values = HyperLogLog.from_dict(data["distinct_values_sketch"])
+        return sketch
+
+
+class ParameterUsageSketches:
+    """Per-(procedure, parameter) sketches; mergeable across corpus shards."""
+
+    def __init__(self, top_k: int = 16, hll_precision: int = 8):
+        self.top_k = top_k
+        self.hll_precision = hll_precision
+        self.sketches: Dict[str, Dict[str, ParameterUsageSketch]] = {}
+
+    def _sketch(self, proc_name: str, param_name: str) -> ParameterUsageSketch:
+        proc_sketches = self.sketches.setdefault(proc_name, {})
+        sketch = proc_sketches.get(param_name)
+        if sketch is None:
+            sketch = proc_sketches[param_name] = ParameterUsageSketch(self.top_k, self.hll_precision)
+        return sketch
+
+    def record_call(self, proc_name: str, usage_pattern: Dict, parameter_names: List[str]) -> None:
+        """
+        Record one parsed call (see parse_parameter_usage). Positional arguments are
+        mapped to parameter names by declaration order.
+        """
+        for param_name, value in usage_pattern.get("named_params", {}).items():
+            self._sketch(proc_name, param_name.lower()).add(value)
+        for position, value in enumerate(usage_pattern.get("positional_params", [])):
+            param_name = parameter_names[position].lower() if position < len(parameter_names) else f"#{position + 1}"
+            self._sketch(proc_name, param_name).add(value, positional=True)
+
+    def merge(self, other: "ParameterUsageSketches") -> "ParameterUsageSketches":
+        for proc_name, proc_sketches in other.sketches.items():
+            for param_name, sketch in proc_sketches.items():
+                target = self.sketches.setdefault(proc_name, {}).get(param_name)
+                if target is None:
+                    self.sketches[proc_name][param_name] = ParameterUsageSketch.from_dict(sketch.to_dict())
+                else:
+                    target.merge(sketch)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    def to_dict(self) -> Dict:
+        return {
+            proc_name: {param_name: sketch.to_dict() for param_name, sketch in sorted(proc_sketches.items())}
+            for proc_name, proc_sketches in sorted(self.sketches.items())
+        }
+
+    def to_json(self) -> Dict:
+        """Hook for JSON encoders (json_default) so un-normalized pattern dicts serialize as data."""
+        return self.to_dict()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ParameterUsageSketches":
+        sketches = cls()
+        for proc_name, proc_sketches in data.items():
+            sketches.sketches[proc_name] = {
+                param_name: ParameterUsageSketch.from_dict(sketch_data)
+                for param_name, sketch_data in proc_sketches.items()
+            }
+        return sketches
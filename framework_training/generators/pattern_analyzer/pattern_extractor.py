@@ -1,6 +1,9 @@
 import re
 from typing import Dict, List, Optional
 
+from .parameter_sketches import ParameterUsageSketches
+from ..utils.api_model import ensure_api_model
+
 
 def analyze_script_patterns(action_scripts_corpus: List[Dict], 
                            framework_api_details: List[Dict], 
@@ -10,7 +13,7 @@ def analyze_script_patterns(action_scripts_corpus: List[Dict],
     """
     patterns = {
         "common_structures": [],
-        "parameter_usage_patterns": {},
+        "parameter_usage_patterns": ParameterUsageSketches(),
         "error_handling_patterns": [],
         "conditional_logic_patterns": [],
         "variable_naming_conventions": {},
@@ -26,8 +29,7 @@ def analyze_script_patterns(action_scripts_corpus: List[Dict],
     print("PATTERN_ANALYSIS: Analyzing existing scripts for synthesis patterns...")
     
     # Create procedure lookup map
-    proc_map = {f"{obj['schema_name']}.{obj['object_name']}": obj 
-                for obj in framework_api_details if obj.get('object_type_short') == 'P'}
+    proc_map = ensure_api_model(framework_api_details).procedures_by_full_name
     
     for script_info in action_scripts_corpus:
         sql_text = script_info.get('sql_source', '')
@@ -1,19 +1,16 @@
 from typing import Dict, Optional
 
+from .parameter_sketches import ParameterUsageSketches
+
 
 def normalize_patterns(patterns: Dict, procedure_relationships: Optional[Dict] = None) -> Dict:
     """Clean and normalize extracted patterns."""
     # Clean common structures
     patterns["common_structures"] = list(set(patterns["common_structures"]))
     
-    # Clean parameter usage patterns
-    for key, subdict in patterns["parameter_usage_patterns"].items():
-        for subkey, subsubdict in subdict.items():
-            try:
-                patterns["parameter_usage_patterns"][key][subkey] = list(set(subsubdict))
-            except TypeError:
-                # If list contains unhashable types, keep original
-                pass
+    # Summarize parameter sketches into their serializable form
+    if isinstance(patterns["parameter_usage_patterns"], ParameterUsageSketches):
+        patterns["parameter_usage_patterns"] = patterns["parameter_usage_patterns"].to_dict()
     
     # Clean error handling patterns
     patterns["error_handling_patterns"] = list(set(patterns["error_handling_patterns"]))
@@ -1,9 +1,12 @@
 from typing import Dict, List, Optional
 from datetime import datetime
+import os
+import random
 import re
 
 from .pattern_analyzer.pattern_extractor import analyze_script_patterns
 from .pattern_analyzer.pattern_normalizer import normalize_patterns
+from .pattern_analyzer.parameter_sketches import ParameterUsageSketches
 from .example_generators.simple_generator import SimpleExampleGenerator
 from .example_generators.validation_generator import ValidationExampleGenerator
 from .example_generators.crud_generator import CRUDExampleGenerator
@@ -14,7 +17,19 @@ from .curriculum.curriculum_generator import generate_comprehensive_training_cur
 from .curriculum.assessment_generator import create_skill_assessments
 from .utils.value_generator import generate_sample_value
 from .utils.script_utils import extract_procedures_from_script
+from .utils.api_model import ApiObject, ensure_api_model
+from .utils.coverage import CoverageTracker, measure_coverage
+from .utils.dedup import DEFAULT_ERROR_RATE, DEFAULT_EXACT_LIMIT, ExampleDeduplicator
+from .example_pipeline import (CoverageStage, DedupStage, EnrichmentStage, ExamplePipeline, JsonlSink, ListSink,
+                               PackingSink, StatisticsStage, ValidationStage, rate_difficulty_progression)
+from .utils.token_packing import DEFAULT_BUFFER_SIZE, SequencePacker
+from .utils.procedure_pools import CRUD_KEYWORDS, ProcedurePools
+from .utils.script_shapes import SCRIPT_TEMPLATES
 from .output.markdown_generator import MarkdownGenerator
+from .output.jsonl_writer import MANIFEST_FILE, ShardedJsonlWriter
+from .generation_engine import DEFAULT_UNIT_SIZE, GENERATOR_CLASSES, SeededGenerationEngine
+from .mutation_engine import MutationEngine
+from ..serialization import write_json
 
 # Add these new functions for synthetic training data generation
 
@@ -24,7 +39,7 @@ def analyze_script_patterns(action_scripts_corpus, framework_api_details, proced
     """
     patterns = {
         "common_structures": [],
-        "parameter_usage_patterns": {},
+        "parameter_usage_patterns": ParameterUsageSketches(),
         "error_handling_patterns": [],
         "conditional_logic_patterns": [],
         "variable_naming_conventions": {},
@@ -40,8 +55,7 @@ def analyze_script_patterns(action_scripts_corpus, framework_api_details, proced
     print("PATTERN_ANALYSIS: Analyzing existing scripts for synthesis patterns...")
     
     # Create procedure lookup map
-    proc_map = {f"{obj['schema_name']}.{obj['object_name']}": obj 
-                for obj in framework_api_details if obj.get('object_type_short') == 'P'}
+    proc_map = ensure_api_model(framework_api_details).procedures_by_full_name
     
     for script_info in action_scripts_corpus:
         sql_text = script_info.get('sql_source', '')
@@ -97,6 +111,10 @@ def categorize_script_complexity(sql_text):
 
 def extract_parameter_patterns(sql_text, patterns, proc_map):
     """Extract how parameters are typically used in procedure calls."""
+    collect_parameter_usage(sql_text, patterns["parameter_usage_patterns"], proc_map)
+
+def collect_parameter_usage(sql_text, sketches, proc_map):
+    """Feed every framework procedure call in a script into the per-parameter sketches."""
     # Find EXEC statements with parameters
     exec_pattern = r'EXEC\s+(?:dbo\.)?(\w+)\s+(.*?)(?=;|\n|$|EXEC|IF|ELSE|END)'
     exec_matches = re.finditer(exec_pattern, sql_text, re.IGNORECASE | re.DOTALL)
@@ -110,13 +128,12 @@ def extract_parameter_patterns(sql_text, patterns, proc_map):
                               if name.endswith(f'.{proc_name}')), None)
         
         if full_proc_name and params_text:
-            if full_proc_name not in patterns["parameter_usage_patterns"]:
-                patterns["parameter_usage_patterns"][full_proc_name] = []
-            
             # Parse parameter usage
             param_usage = parse_parameter_usage(params_text, proc_map[full_proc_name])
             if param_usage:
-                patterns["parameter_usage_patterns"][full_proc_name].append(param_usage)
+                parameter_names = [p['name'] for p in proc_map[full_proc_name].get('parameters', [])
+                                   if p.get('name') != '[Return Value]']
+                sketches.record_call(full_proc_name, param_usage, parameter_names)
 
 def parse_parameter_usage(params_text, proc_obj):
     """Parse how parameters are passed to a procedure."""
@@ -268,8 +285,14 @@ def extract_business_logic_patterns(sql_text, patterns, script_info):
 
 def normalize_patterns(patterns, procedure_relationships=None):
     """Clean and normalize extracted patterns."""
+    # Summarize parameter sketches into their serializable form
+    if isinstance(patterns.get("parameter_usage_patterns"), ParameterUsageSketches):
+        patterns["parameter_usage_patterns"] = patterns["parameter_usage_patterns"].to_dict()
+    
     # Remove duplicates and sort
     for key in patterns:
+        if key == "parameter_usage_patterns":
+            continue
         if isinstance(patterns[key], list):
             # Handle lists of primitives
             try:
@@ -312,22 +335,23 @@ def generate_all_training_materials(framework_api_details, script_patterns, rela
     
     # Generate examples based on patterns and relationships
     examples = []
+    pools = ProcedurePools(framework_api_details, args.get("usage_counts"))
     
     # Generate simple examples
     print("  Generating simple examples...")
-    examples.extend(generate_simple_examples(framework_api_details, script_patterns, args.get("num_examples", 10)))
+    examples.extend(generate_simple_examples(framework_api_details, script_patterns, args.get("num_examples", 10), pools=pools))
     
     # Generate validation examples
     print("  Generating validation examples...")
-    examples.extend(generate_validation_examples(framework_api_details, script_patterns, args.get("num_examples", 5)))
+    examples.extend(generate_validation_examples(framework_api_details, script_patterns, args.get("num_examples", 5), pools=pools))
     
     # Generate CRUD examples
     print("  Generating CRUD examples...")
-    examples.extend(generate_crud_examples(framework_api_details, script_patterns, args.get("num_examples", 5)))
+    examples.extend(generate_crud_examples(framework_api_details, script_patterns, args.get("num_examples", 5), pools=pools))
     
     # Generate error handling examples
     print("  Generating error handling examples...")
-    examples.extend(generate_error_handling_examples(framework_api_details, script_patterns, args.get("num_examples", 5)))
+    examples.extend(generate_error_handling_examples(framework_api_details, script_patterns, args.get("num_examples", 5), pools=pools))
     
     # Generate multi-procedure examples using relationships
     print("  Generating multi-procedure examples...")
@@ -366,16 +390,19 @@ def generate_all_training_materials(framework_api_details, script_patterns, rela
     
     return {"examples": examples, "metadata": metadata}
 
-def generate_simple_examples(framework_api_details, script_patterns, count):
-    """Generate simple examples for each procedure."""
+def generate_simple_examples(framework_api_details, script_patterns, count, rng=random, pools=None):
+    """
+    Generate simple examples for each procedure. rng: random.Random (or the random module);
+    pools: ProcedurePools shared across calls (built here when omitted).
+    """
     examples = []
-    procedures = [obj for obj in framework_api_details if obj.get('object_type_short') == 'P']
+    pools = pools or ProcedurePools(framework_api_details)
     
     for i in range(count):
-        if not procedures:
+        if not pools["all"]:
             break
             
-        proc = random.choice(procedures)
+        proc = pools.choice("all", rng)
         proc_name = f"{proc['schema_name']}.{proc['object_name']}"
         
         # Create a simple use case
@@ -400,16 +427,16 @@ def generate_simple_examples(framework_api_details, script_patterns, count):
     
     return examples
 
-def generate_validation_examples(framework_api_details, script_patterns, count):
+def generate_validation_examples(framework_api_details, script_patterns, count, rng=random, pools=None):
     """Generate examples focused on validation patterns."""
     examples = []
-    procedures = [obj for obj in framework_api_details if obj.get('object_type_short') == 'P']
+    pools = pools or ProcedurePools(framework_api_details)
     
     for i in range(count):
-        if not procedures:
+        if not pools["all"]:
             break
             
-        proc = random.choice(procedures)
+        proc = pools.choice("all", rng)
         proc_name = f"{proc['schema_name']}.{proc['object_name']}"
         
         script = generate_validation_script(proc, script_patterns)
@@ -430,31 +457,19 @@ def generate_validation_examples(framework_api_details, script_patterns, count):
     
     return examples
 
-def generate_crud_examples(framework_api_details, script_patterns, count):
+def generate_crud_examples(framework_api_details, script_patterns, count, rng=random, pools=None):
     """Generate CRUD workflow examples."""
     examples = []
-    
-    crud_patterns = {
-        "create": ["create", "add", "insert", "new"],
-        "read": ["get", "fetch", "list", "search", "find"],
-        "update": ["update", "modify", "edit", "change"],
-        "delete": ["delete", "remove", "drop"]
-    }
+    pools = pools or ProcedurePools(framework_api_details)
     
     for i in range(count):
-        operation = random.choice(list(crud_patterns.keys()))
-        keywords = crud_patterns[operation]
+        operation = rng.choice(list(CRUD_KEYWORDS.keys()))
         
-        # Find procedures that match this operation
-        matching_procs = []
-        for obj in framework_api_details:
-            if obj.get('object_type_short') == 'P':
-                proc_name = obj['object_name'].lower()
-                if any(keyword in proc_name for keyword in keywords):
-                    matching_procs.append(obj)
+        # Procedures matching this operation were indexed once in the crud_<operation> pool
+        matching_procs = pools[f"crud_{operation}"]
         
         if matching_procs:
-            proc = random.choice(matching_procs)
+            proc = matching_procs.choice(rng)
             script = generate_crud_script(proc, operation, script_patterns)
             
             examples.append({
@@ -473,16 +488,16 @@ def generate_crud_examples(framework_api_details, script_patterns, count):
     
     return examples
 
-def generate_error_handling_examples(framework_api_details, script_patterns, count):
+def generate_error_handling_examples(framework_api_details, script_patterns, count, rng=random, pools=None):
     """Generate examples with robust error handling."""
     examples = []
-    procedures = [obj for obj in framework_api_details if obj.get('object_type_short') == 'P']
+    pools = pools or ProcedurePools(framework_api_details)
     
     for i in range(count):
-        if not procedures:
+        if not pools["all"]:
             break
             
-        proc = random.choice(procedures)
+        proc = pools.choice("all", rng)
         script = generate_error_handling_script(proc, script_patterns)
         
         examples.append({
@@ -501,7 +516,7 @@ def generate_error_handling_examples(framework_api_details, script_patterns, cou
     
     return examples
 
-def generate_multi_procedure_examples(framework_api_details, script_patterns, relationships, count):
+def generate_multi_procedure_examples(framework_api_details, script_patterns, relationships, count, rng=random):
     """Generate examples using multiple related procedures."""
     examples = []
     
@@ -518,11 +533,11 @@ def generate_multi_procedure_examples(framework_api_details, script_patterns, re
         if not proc_with_relations:
             continue
             
-        main_proc_name, main_proc_data = random.choice(proc_with_relations)
+        main_proc_name, main_proc_data = rng.choice(proc_with_relations)
         related_procs = list(main_proc_data["related_procedures"].keys())
         
         # Select 1-3 related procedures
-        selected_related = random.sample(related_procs, min(3, len(related_procs)))
+        selected_related = rng.sample(related_procs, min(3, len(related_procs)))
         all_procs = [main_proc_name] + selected_related
         
         script = generate_multi_procedure_script(all_procs, framework_api_details, script_patterns)
@@ -543,7 +558,7 @@ def generate_multi_procedure_examples(framework_api_details, script_patterns, re
     
     return examples
 
-def generate_advanced_examples(framework_api_details, script_patterns, relationships, count):
+def generate_advanced_examples(framework_api_details, script_patterns, relationships, count, rng=random):
     """Generate advanced examples with complex business logic."""
     examples = []
     
@@ -556,7 +571,7 @@ def generate_advanced_examples(framework_api_details, script_patterns, relations
             "dynamic_execution"
         ]
         
-        scenario = random.choice(scenario_types)
+        scenario = rng.choice(scenario_types)
         script = generate_advanced_scenario_script(scenario, framework_api_details, script_patterns)
         
         examples.append({
@@ -590,756 +605,202 @@ def generate_use_case_description(proc):
     else:
         return f"Execute {proc['object_name']} for business operation"
 
+def _input_parameters(proc):
+    """(name, type, has_default) for each input parameter, read once per procedure."""
+    if isinstance(proc, ApiObject):
+        return [(p.name, p.type_from_sys, p.has_default or False) for p in proc.input_parameters]
+    return [(p['name'], p.get('type_from_sys', 'nvarchar(255)'), p.get('has_default', False))
+            for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
+
+def _declarations(params):
+    return [f"DECLARE {name} {param_type} = {generate_sample_value(name, param_type)};"
+            for name, param_type, _ in params]
+
+def _passthrough_arguments(params):
+    return [f"{name} = {name}" for name, _, _ in params]
+
+def _create_argument(name, param_type):
+    lowered = name.lower()
+    if 'user_id' in lowered:
+        return f"{name} = @user_id"
+    elif 'id' in lowered and name != '@user_id':
+        return f"{name} = @card_id"
+    return f"{name} = {generate_sample_value(name, param_type)}"
+
+def _read_argument(name, param_type):
+    lowered = name.lower()
+    if 'search' in lowered or 'criteria' in lowered:
+        return f"{name} = @search_criteria"
+    elif 'page' in lowered and 'size' in lowered:
+        return f"{name} = @page_size"
+    elif 'page' in lowered:
+        return f"{name} = @page_number"
+    elif 'user_id' in lowered:
+        return f"{name} = @user_id"
+    return f"{name} = {generate_sample_value(name, param_type)}"
+
+def _update_argument(name, param_type):
+    lowered = name.lower()
+    if 'id' in lowered:
+        return f"{name} = @card_id"
+    elif 'user_id' in lowered:
+        return f"{name} = @user_id"
+    elif 'modified' in lowered or 'updated' in lowered:
+        return f"{name} = GETDATE()"
+    return f"{name} = {generate_sample_value(name, param_type)}"
+
+def _workflow_argument(name, param_type):
+    lowered = name.lower()
+    if 'user_id' in lowered:
+        return f"{name} = @user_id"
+    elif 'id' in lowered:
+        return f"{name} = @card_id"
+    return f"{name} = {generate_sample_value(name, param_type)}"
+
+# operation -> (argument builder, parameters used); delete passes fixed arguments
+CRUD_ARGUMENTS = {
+    "create": (_create_argument, 4),
+    "read": (_read_argument, 3),
+    "update": (_update_argument, 4),
+    "delete": (None, 0)
+}
+
+def simple_script_context(proc, patterns=None):
+    required_params = [param for param in _input_parameters(proc) if not param[2]]
+    return {
+        "schema_name": proc['schema_name'],
+        "object_name": proc['object_name'],
+        "declarations": _declarations(required_params),
+        "arguments": _passthrough_arguments(required_params)
+    }
+
+def validation_script_context(proc, patterns=None):
+    params = _input_parameters(proc)
+    return {
+        "schema_name": proc['schema_name'],
+        "object_name": proc['object_name'],
+        "declarations": _declarations(params),
+        "required": [name for name, _, has_default in params if not has_default],
+        "arguments": _passthrough_arguments(params[:3])  # Limit for readability
+    }
+
+def crud_script_context(proc, operation, patterns=None):
+    build_argument, limit = CRUD_ARGUMENTS.get(operation, (None, 0))
+    params = _input_parameters(proc)[:limit] if build_argument else []
+    return {
+        "operation_upper": operation.upper(),
+        "schema_name": proc['schema_name'],
+        "object_name": proc['object_name'],
+        "arguments": [build_argument(name, param_type) for name, param_type, _ in params]
+    }
+
+def error_handling_script_context(proc, patterns=None):
+    params = _input_parameters(proc)[:3]
+    return {
+        "schema_name": proc['schema_name'],
+        "object_name": proc['object_name'],
+        "declarations": _declarations(params),
+        "arguments": _passthrough_arguments(params)
+    }
+
+def multi_procedure_script_context(proc_names, framework_api_details, patterns=None):
+    by_full_name = getattr(framework_api_details, 'by_full_name', None)
+    if by_full_name is None:
+        by_full_name = {}
+        for obj in framework_api_details:
+            by_full_name.setdefault(f"{obj['schema_name']}.{obj['object_name']}", obj)
+    steps = []
+    for i, proc_name in enumerate(proc_names[:4], 1):  # Limit to 4 for readability
+        proc_obj = by_full_name.get(proc_name)
+        if proc_obj:
+            steps.append({
+                "number": i,
+                "procedure": proc_name,
+                "object_name": proc_obj['object_name'],
+                "arguments": [_workflow_argument(name, param_type)
+                              for name, param_type, _ in _input_parameters(proc_obj)[:3]]
+            })
+    return {
+        "procedure_count": len(proc_names),
+        "procedure_list": ', '.join([name.split('.')[-1] for name in proc_names]),
+        "steps": steps
+    }
+
 def generate_simple_script(proc, patterns):
     """Generate a simple script for a single procedure."""
-    script_lines = []
-    
-    # Add comment header
-    script_lines.append(f"-- Simple usage example for {proc['object_name']}")
-    script_lines.append("")
-    
-    # Declare variables based on parameters
-    required_params = [p for p in proc.get('parameters', []) 
-                      if not p.get('has_default', False) and p.get('name') != '[Return Value]']
-    
-    if required_params:
-        script_lines.append("-- Declare required parameters")
-        for param in required_params:
-            param_name = param['name']
-            param_type = param.get('type_from_sys', 'nvarchar(255)')
-            sample_value = generate_sample_value(param_name, param_type)
-            script_lines.append(f"DECLARE {param_name} {param_type} = {sample_value};")
-        script_lines.append("")
-    
-    # Add the procedure call
-    script_lines.append(f"-- Execute the procedure")
-    exec_line = f"EXEC {proc['schema_name']}.{proc['object_name']}"
-    
-    if required_params:
-        param_assignments = [f"{p['name']} = {p['name']}" for p in required_params]
-        exec_line += " " + ", ".join(param_assignments)
-    
-    script_lines.append(exec_line + ";")
-    
-    return "\n".join(script_lines)
+    return SCRIPT_TEMPLATES["simple"].render(simple_script_context(proc, patterns))
 
 def generate_validation_script(proc, patterns):
     """Generate a script with validation patterns."""
-    script_lines = []
-    
-    script_lines.append(f"-- Validation example for {proc['object_name']}")
-    script_lines.append("")
-    
-    # Parameters
-    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
-    required_params = [p for p in params if not p.get('has_default', False)]
-    
-    if params:
-        script_lines.append("-- Declare and initialize parameters")
-        for param in params:
-            param_name = param['name']
-            param_type = param.get('type_from_sys', 'nvarchar(255)')
-            sample_value = generate_sample_value(param_name, param_type)
-            script_lines.append(f"DECLARE {param_name} {param_type} = {sample_value};")
-        script_lines.append("")
-    
-    # Add validation
-    if required_params:
-        script_lines.append("-- Validate required parameters")
-        for param in required_params:
-            param_name = param['name']
-            script_lines.append(f"IF {param_name} IS NULL")
-            script_lines.append("BEGIN")
-            script_lines.append(f"    RAISERROR('Parameter {param_name} is required', 16, 1);")
-            script_lines.append("    RETURN;")
-            script_lines.append("END;")
-        script_lines.append("")
-    
-    # Add TRY-CATCH
-    script_lines.append("-- Execute with error handling")
-    script_lines.append("BEGIN TRY")
-    script_lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
-    
-    if params:
-        param_assignments = [f"{p['name']} = {p['name']}" for p in params[:3]]  # Limit for readability
-        script_lines.append("        " + ", ".join(param_assignments) + ";")
-    else:
-        script_lines[-1] += ";"
-    
-    script_lines.append("END TRY")
-    script_lines.append("BEGIN CATCH")
-    script_lines.append("    PRINT 'Error occurred: ' + ERROR_MESSAGE();")
-    script_lines.append("    THROW;")
-    script_lines.append("END CATCH;")
-    
-    return "\n".join(script_lines)
+    return SCRIPT_TEMPLATES["validation"].render(validation_script_context(proc, patterns))
 
 def generate_crud_script(proc, operation, patterns):
     """Generate a CRUD-specific script."""
-    script_lines = []
-    
-    script_lines.append(f"-- {operation.upper()} operation using {proc['object_name']}")
-    script_lines.append("")
-    
-    # Add context variables commonly used in the framework
-    script_lines.append("-- Common context variables")
-    script_lines.append("DECLARE @user_id int = @user_id; -- From context")
-    script_lines.append("DECLARE @card_id int = @card_id; -- From context")
-    script_lines.append("")
-    
-    # Operation-specific logic
-    if operation == "create":
-        script_lines.extend(generate_create_pattern(proc))
-    elif operation == "read":
-        script_lines.extend(generate_read_pattern(proc))
-    elif operation == "update":
-        script_lines.extend(generate_update_pattern(proc))
-    elif operation == "delete":
-        script_lines.extend(generate_delete_pattern(proc))
-    
-    return "\n".join(script_lines)
+    template = SCRIPT_TEMPLATES.get(f"crud_{operation}", SCRIPT_TEMPLATES["crud"])
+    return template.render(crud_script_context(proc, operation, patterns))
 
 def generate_create_pattern(proc):
     """Generate creation workflow pattern."""
-    lines = []
-    
-    lines.append("-- Validation before creation")
-    lines.append("IF @user_id IS NULL")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('User context required for creation', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    
-    lines.append("-- Create new record")
-    lines.append("BEGIN TRY")
-    lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
-    
-    # Add sample parameters
-    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
-    if params:
-        sample_params = []
-        for param in params[:4]:  # Limit for readability
-            param_name = param['name']
-            if 'user_id' in param_name.lower():
-                sample_params.append(f"{param_name} = @user_id")
-            elif 'id' in param_name.lower() and param_name != '@user_id':
-                sample_params.append(f"{param_name} = @card_id")
-            else:
-                sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
-                sample_params.append(f"{param_name} = {sample_value}")
-        
-        lines.append("        " + ", ".join(sample_params) + ";")
-    else:
-        lines[-1] += ";"
-    
-    lines.append("")
-    lines.append("    PRINT 'Record created successfully';")
-    lines.append("END TRY")
-    lines.append("BEGIN CATCH")
-    lines.append("    PRINT 'Creation failed: ' + ERROR_MESSAGE();")
-    lines.append("    THROW;")
-    lines.append("END CATCH;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["create_pattern"].render_lines(crud_script_context(proc, "create"))
 
 def generate_read_pattern(proc):
     """Generate read/retrieval workflow pattern."""
-    lines = []
-    
-    lines.append("-- Prepare search parameters")
-    lines.append("DECLARE @search_criteria nvarchar(255) = 'example search';")
-    lines.append("DECLARE @page_size int = 20;")
-    lines.append("DECLARE @page_number int = 1;")
-    lines.append("")
-    
-    lines.append("-- Execute search/retrieval")
-    lines.append(f"EXEC {proc['schema_name']}.{proc['object_name']}")
-    
-    # Add sample parameters for search
-    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
-    if params:
-        sample_params = []
-        for param in params[:3]:
-            param_name = param['name']
-            if 'search' in param_name.lower() or 'criteria' in param_name.lower():
-                sample_params.append(f"{param_name} = @search_criteria")
-            elif 'page' in param_name.lower() and 'size' in param_name.lower():
-                sample_params.append(f"{param_name} = @page_size")
-            elif 'page' in param_name.lower():
-                sample_params.append(f"{param_name} = @page_number")
-            elif 'user_id' in param_name.lower():
-                sample_params.append(f"{param_name} = @user_id")
-            else:
-                sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
-                sample_params.append(f"{param_name} = {sample_value}")
-        
-        lines.append("    " + ", ".join(sample_params) + ";")
-    else:
-        lines[-1] += ";"
-    
-    lines.append("")
-    lines.append("-- Check if results were found")
-    lines.append("IF @@ROWCOUNT > 0")
-    lines.append("    PRINT 'Data retrieved successfully';")
-    lines.append("ELSE")
-    lines.append("    PRINT 'No data found matching criteria';")
-    
-    return lines
+    return SCRIPT_TEMPLATES["read_pattern"].render_lines(crud_script_context(proc, "read"))
 
 def generate_update_pattern(proc):
     """Generate update workflow pattern."""
-    lines = []
-    
-    lines.append("-- Validate record exists and user has permission")
-    lines.append("IF @card_id IS NULL")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Record ID required for update', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    
-    lines.append("-- Check if record exists")
-    lines.append("DECLARE @record_exists bit = 0;")
-    lines.append("-- Add existence check logic here")
-    lines.append("")
-    
-    lines.append("-- Perform update with optimistic concurrency")
-    lines.append("BEGIN TRY")
-    lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
-    
-    # Add sample parameters for update
-    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
-    if params:
-        sample_params = []
-        for param in params[:4]:
-            param_name = param['name']
-            if 'id' in param_name.lower():
-                sample_params.append(f"{param_name} = @card_id")
-            elif 'user_id' in param_name.lower():
-                sample_params.append(f"{param_name} = @user_id")
-            elif 'modified' in param_name.lower() or 'updated' in param_name.lower():
-                sample_params.append(f"{param_name} = GETDATE()")
-            else:
-                sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
-                sample_params.append(f"{param_name} = {sample_value}")
-        
-        lines.append("        " + ", ".join(sample_params) + ";")
-    else:
-        lines[-1] += ";"
-    
-    lines.append("")
-    lines.append("    IF @@ROWCOUNT = 0")
-    lines.append("        RAISERROR('No records were updated. Record may not exist or may have been modified by another user.', 16, 1);")
-    lines.append("    ELSE")
-    lines.append("        PRINT 'Record updated successfully';")
-    lines.append("")
-    lines.append("END TRY")
-    lines.append("BEGIN CATCH")
-    lines.append("    PRINT 'Update failed: ' + ERROR_MESSAGE();")
-    lines.append("    THROW;")
-    lines.append("END CATCH;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["update_pattern"].render_lines(crud_script_context(proc, "update"))
 
 def generate_delete_pattern(proc):
     """Generate delete workflow pattern."""
-    lines = []
-    
-    lines.append("-- Safety checks before deletion")
-    lines.append("IF @card_id IS NULL")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Record ID required for deletion', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    
-    lines.append("-- Check for dependencies")
-    lines.append("DECLARE @has_dependencies bit = 0;")
-    lines.append("-- Add dependency check logic here")
-    lines.append("")
-    lines.append("IF @has_dependencies = 1")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Cannot delete record with existing dependencies', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    
-    lines.append("-- Perform soft delete (preferred) or hard delete")
-    lines.append("BEGIN TRY")
-    lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
-    lines.append("        @id = @card_id,")
-    lines.append("        @deleted_by = @user_id;")
-    lines.append("")
-    lines.append("    IF @@ROWCOUNT = 0")
-    lines.append("        PRINT 'No record found to delete';")
-    lines.append("    ELSE")
-    lines.append("        PRINT 'Record deleted successfully';")
-    lines.append("")
-    lines.append("END TRY")
-    lines.append("BEGIN CATCH")
-    lines.append("    PRINT 'Deletion failed: ' + ERROR_MESSAGE();")
-    lines.append("    THROW;")
-    lines.append("END CATCH;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["delete_pattern"].render_lines(crud_script_context(proc, "delete"))
 
 def generate_error_handling_script(proc, patterns):
     """Generate comprehensive error handling script."""
-    script_lines = []
-    
-    script_lines.append(f"-- Comprehensive error handling example for {proc['object_name']}")
-    script_lines.append("")
-    
-    script_lines.append("-- Error handling variables")
-    script_lines.append("DECLARE @error_number int;")
-    script_lines.append("DECLARE @error_message nvarchar(4000);")
-    script_lines.append("DECLARE @error_severity int;")
-    script_lines.append("DECLARE @error_state int;")
-    script_lines.append("")
-    
-    # Add procedure parameters
-    params = [p for p in proc.get('parameters', []) if p.get('name') != '[Return Value]']
-    if params:
-        script_lines.append("-- Procedure parameters")
-        for param in params[:3]:
-            param_name = param['name']
-            param_type = param.get('type_from_sys', 'nvarchar(255)')
-            sample_value = generate_sample_value(param_name, param_type)
-            script_lines.append(f"DECLARE {param_name} {param_type} = {sample_value};")
-        script_lines.append("")
-    
-    script_lines.append("-- Main execution with comprehensive error handling")
-    script_lines.append("BEGIN TRY")
-    script_lines.append("    -- Pre-execution validation")
-    script_lines.append("    IF @user_id IS NULL")
-    script_lines.append("        THROW 50001, 'User context is required', 1;")
-    script_lines.append("")
-    script_lines.append("    -- Execute the procedure")
-    script_lines.append(f"    EXEC {proc['schema_name']}.{proc['object_name']}")
-    
-    if params:
-        param_assignments = [f"{p['name']} = {p['name']}" for p in params[:3]]
-        script_lines.append("        " + ", ".join(param_assignments) + ";")
-    else:
-        script_lines[-1] += ";"
-    
-    script_lines.append("")
-    script_lines.append("    -- Success handling")
-    script_lines.append("    PRINT 'Operation completed successfully';")
-    script_lines.append("")
-    script_lines.append("END TRY")
-    script_lines.append("BEGIN CATCH")
-    script_lines.append("    -- Capture error details")
-    script_lines.append("    SELECT")
-    script_lines.append("        @error_number = ERROR_NUMBER(),")
-    script_lines.append("        @error_message = ERROR_MESSAGE(),")
-    script_lines.append("        @error_severity = ERROR_SEVERITY(),")
-    script_lines.append("        @error_state = ERROR_STATE();")
-    script_lines.append("")
-    script_lines.append("    -- Log the error (if logging procedure exists)")
-    script_lines.append("    -- EXEC sp_sys_log_error @error_message, @error_number;")
-    script_lines.append("")
-    script_lines.append("    -- Handle different types of errors")
-    script_lines.append("    IF @error_number = 2 -- File not found")
-    script_lines.append("        PRINT 'Resource not found: ' + @error_message;")
-    script_lines.append("    ELSE IF @error_number BETWEEN 50000 AND 59999 -- Custom errors")
-    script_lines.append("        PRINT 'Business logic error: ' + @error_message;")
-    script_lines.append("    ELSE")
-    script_lines.append("        PRINT 'System error occurred: ' + @error_message;")
-    script_lines.append("")
-    script_lines.append("    -- Re-throw the error for upstream handling")
-    script_lines.append("    THROW;")
-    script_lines.append("END CATCH;")
-    
-    return "\n".join(script_lines)
+    return SCRIPT_TEMPLATES["error_handling"].render(error_handling_script_context(proc, patterns))
 
 def generate_multi_procedure_script(proc_names, framework_api_details, patterns):
     """Generate script using multiple related procedures."""
-    script_lines = []
-    
-    script_lines.append(f"-- Multi-procedure workflow using {len(proc_names)} related procedures")
-    script_lines.append(f"-- Procedures: {', '.join([name.split('.')[-1] for name in proc_names])}")
-    script_lines.append("")
-    
-    script_lines.append("-- Common context and workflow variables")
-    script_lines.append("DECLARE @user_id int = @user_id; -- From context")
-    script_lines.append("DECLARE @card_id int = @card_id; -- From context")
-    script_lines.append("DECLARE @workflow_success bit = 1;")
-    script_lines.append("DECLARE @step_result int;")
-    script_lines.append("")
-    
-    script_lines.append("-- Begin transaction for data consistency")
-    script_lines.append("BEGIN TRANSACTION;")
-    script_lines.append("")
-    script_lines.append("BEGIN TRY")
-    
-    # Generate calls for each procedure
-    for i, proc_name in enumerate(proc_names[:4], 1):  # Limit to 4 for readability
-        proc_obj = next(
-            (obj for obj in framework_api_details 
-             if f"{obj['schema_name']}.{obj['object_name']}" == proc_name),
-            None
-        )
-        
-        if proc_obj:
-            script_lines.append("")
-            script_lines.append(f"    -- Step {i}: {proc_obj['object_name']}")
-            script_lines.append(f"    EXEC {proc_name}")
-            
-            # Add relevant parameters
-            params = [p for p in proc_obj.get('parameters', []) if p.get('name') != '[Return Value]']
-            if params:
-                sample_params = []
-                for param in params[:3]:
-                    param_name = param['name']
-                    if 'user_id' in param_name.lower():
-                        sample_params.append(f"{param_name} = @user_id")
-                    elif 'id' in param_name.lower() and 'user_id' not in param_name.lower():
-                        sample_params.append(f"{param_name} = @card_id")
-                    else:
-                        sample_value = generate_sample_value(param_name, param.get('type_from_sys', 'nvarchar(255)'))
-                        sample_params.append(f"{param_name} = {sample_value}")
-                
-                script_lines.append("        " + ", ".join(sample_params) + ";")
-            else:
-                script_lines[-1] += ";"
-            
-            script_lines.append(f"    ")
-            script_lines.append(f"    -- Verify step {i} success")
-            script_lines.append("    IF @@ROWCOUNT = 0")
-            script_lines.append("    BEGIN")
-            script_lines.append(f"        SET @workflow_success = 0;")
-            script_lines.append(f"        RAISERROR('Step {i} failed - no rows affected', 16, 1);")
-            script_lines.append("    END;")
-    
-    script_lines.append("")
-    script_lines.append("    -- All steps completed successfully")
-    script_lines.append("    COMMIT TRANSACTION;")
-    script_lines.append("    PRINT 'Multi-procedure workflow completed successfully';")
-    script_lines.append("")
-    script_lines.append("END TRY")
-    script_lines.append("BEGIN CATCH")
-    script_lines.append("    -- Rollback on any error")
-    script_lines.append("    IF @@TRANCOUNT > 0")
-    script_lines.append("        ROLLBACK TRANSACTION;")
-    script_lines.append("")
-    script_lines.append("    PRINT 'Workflow failed: ' + ERROR_MESSAGE();")
-    script_lines.append("    THROW;")
-    script_lines.append("END CATCH;")
-    
-    return "\n".join(script_lines)
+    return SCRIPT_TEMPLATES["multi_procedure"].render(
+        multi_procedure_script_context(proc_names, framework_api_details, patterns))
+
+# shape -> context builder for the single-procedure shapes
+SCRIPT_CONTEXT_BUILDERS = {
+    "simple": simple_script_context,
+    "validation": validation_script_context,
+    "error_handling": error_handling_script_context,
+    "crud_create": lambda proc, patterns=None: crud_script_context(proc, "create", patterns),
+    "crud_read": lambda proc, patterns=None: crud_script_context(proc, "read", patterns),
+    "crud_update": lambda proc, patterns=None: crud_script_context(proc, "update", patterns),
+    "crud_delete": lambda proc, patterns=None: crud_script_context(proc, "delete", patterns)
+}
+
+def render_procedure_scripts(shape, procedures, patterns=None):
+    """Render one script of the given shape for each procedure in a single pass."""
+    build_context = SCRIPT_CONTEXT_BUILDERS[shape]
+    return SCRIPT_TEMPLATES[shape].render_many(build_context(proc, patterns) for proc in procedures)
+
+ADVANCED_SCENARIOS = ("conditional_workflow", "batch_processing", "transaction_management", "dynamic_execution")
 
 def generate_advanced_scenario_script(scenario, framework_api_details, patterns):
     """Generate advanced scenario scripts."""
-    script_lines = []
-    
-    if scenario == "conditional_workflow":
-        script_lines.extend(generate_conditional_workflow(framework_api_details))
-    elif scenario == "batch_processing":
-        script_lines.extend(generate_batch_processing(framework_api_details))
-    elif scenario == "transaction_management":
-        script_lines.extend(generate_transaction_management(framework_api_details))
-    elif scenario == "dynamic_execution":
-        script_lines.extend(generate_dynamic_execution(framework_api_details))
-    
-    return "\n".join(script_lines)
+    return SCRIPT_TEMPLATES[scenario].render() if scenario in ADVANCED_SCENARIOS else ""
 
 def generate_conditional_workflow(framework_api_details):
     """Generate conditional workflow pattern."""
-    lines = []
-    
-    lines.append("-- Advanced conditional workflow with multiple decision points")
-    lines.append("")
-    lines.append("-- Workflow parameters")
-    lines.append("DECLARE @user_role nvarchar(50) = 'Admin'; -- From user context")
-    lines.append("DECLARE @operation_type nvarchar(50) = @operation_type;")
-    lines.append("DECLARE @data_size int = 100;")
-    lines.append("DECLARE @batch_mode bit = 0;")
-    lines.append("")
-    lines.append("-- Determine workflow path based on conditions")
-    lines.append("IF @user_role = 'Admin' AND @data_size > 1000")
-    lines.append("BEGIN")
-    lines.append("    PRINT 'Admin bulk operation detected - using optimized path';")
-    lines.append("    SET @batch_mode = 1;")
-    lines.append("END")
-    lines.append("ELSE IF @user_role IN ('Manager', 'Supervisor')")
-    lines.append("BEGIN")
-    lines.append("    PRINT 'Manager operation - standard validation path';")
-    lines.append("    -- Add manager-specific validation")
-    lines.append("END")
-    lines.append("ELSE")
-    lines.append("BEGIN")
-    lines.append("    PRINT 'Standard user operation - full validation required';")
-    lines.append("    -- Add comprehensive validation")
-    lines.append("END;")
-    lines.append("")
-    lines.append("-- Execute based on determined path")
-    lines.append("IF @batch_mode = 1")
-    lines.append("BEGIN")
-    lines.append("    -- Batch processing logic")
-    lines.append("    PRINT 'Executing batch workflow';")
-    lines.append("END")
-    lines.append("ELSE")
-    lines.append("BEGIN")
-    lines.append("    -- Individual processing logic")
-    lines.append("    PRINT 'Executing individual item workflow';")
-    lines.append("END;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["conditional_workflow"].render_lines()
 
 def generate_batch_processing(framework_api_details):
     """Generate batch processing pattern."""
-    lines = []
-    
-    lines.append("-- Batch processing pattern with cursor and error handling")
-    lines.append("")
-    lines.append("-- Batch configuration")
-    lines.append("DECLARE @batch_size int = 100;")
-    lines.append("DECLARE @total_processed int = 0;")
-    lines.append("DECLARE @error_count int = 0;")
-    lines.append("DECLARE @current_batch_start int = 1;")
-    lines.append("")
-    lines.append("-- Temporary table for batch items")
-    lines.append("CREATE TABLE #batch_items (")
-    lines.append("    id int IDENTITY(1,1),")
-    lines.append("    item_id int,")
-    lines.append("    item_data nvarchar(255),")
-    lines.append("    processed bit DEFAULT 0,")
-    lines.append("    error_message nvarchar(1000) NULL")
-    lines.append(");")
-    lines.append("")
-    lines.append("-- Populate batch items (example data)")
-    lines.append("INSERT INTO #batch_items (item_id, item_data)")
-    lines.append("SELECT id, 'Sample data ' + CAST(id AS nvarchar)")
-    lines.append("FROM (VALUES (1),(2),(3),(4),(5)) AS v(id);")
-    lines.append("")
-    lines.append("-- Process batches")
-    lines.append("WHILE EXISTS (SELECT 1 FROM #batch_items WHERE processed = 0)")
-    lines.append("BEGIN")
-    lines.append("    DECLARE @current_item_id int;")
-    lines.append("    DECLARE @current_item_data nvarchar(255);")
-    lines.append("    ")
-    lines.append("    -- Get next unprocessed item")
-    lines.append("    SELECT TOP 1 @current_item_id = item_id, @current_item_data = item_data")
-    lines.append("    FROM #batch_items")
-    lines.append("    WHERE processed = 0")
-    lines.append("    ORDER BY id;")
-    lines.append("    ")
-    lines.append("    BEGIN TRY")
-    lines.append("        -- Process individual item")
-    lines.append("        -- EXEC dbo.sp_process_item @current_item_id, @current_item_data;")
-    lines.append("        ")
-    lines.append("        -- Mark as processed")
-    lines.append("        UPDATE #batch_items SET processed = 1")
-    lines.append("        WHERE item_id = @current_item_id;")
-    lines.append("        ")
-    lines.append("        SET @total_processed = @total_processed + 1;")
-    lines.append("    END TRY")
-    lines.append("    BEGIN CATCH")
-    lines.append("        -- Log error and continue")
-    lines.append("        UPDATE #batch_items")
-    lines.append("        SET processed = 1, error_message = ERROR_MESSAGE()")
-    lines.append("        WHERE item_id = @current_item_id;")
-    lines.append("        ")
-    lines.append("        SET @error_count = @error_count + 1;")
-    lines.append("    END CATCH;")
-    lines.append("END;")
-    lines.append("")
-    lines.append("-- Report results")
-    lines.append("PRINT 'Batch processing completed';")
-    lines.append("PRINT 'Total processed: ' + CAST(@total_processed AS nvarchar);")
-    lines.append("PRINT 'Errors encountered: ' + CAST(@error_count AS nvarchar);")
-    lines.append("")
-    lines.append("-- Cleanup")
-    lines.append("DROP TABLE #batch_items;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["batch_processing"].render_lines()
 
 def generate_transaction_management(framework_api_details):
     """Generate transaction management pattern."""
-    lines = []
-    
-    lines.append("-- Advanced transaction management with savepoints")
-    lines.append("")
-    lines.append("-- Transaction variables")
-    lines.append("DECLARE @savepoint_name nvarchar(50) = 'step_savepoint';")
-    lines.append("DECLARE @transaction_started bit = 0;")
-    lines.append("")
-    lines.append("-- Start main transaction")
-    lines.append("BEGIN TRANSACTION main_transaction;")
-    lines.append("SET @transaction_started = 1;")
-    lines.append("")
-    lines.append("BEGIN TRY")
-    lines.append("    -- Step 1: Primary operation")
-    lines.append("    PRINT 'Executing step 1 - Primary operation';")
-    lines.append("    -- EXEC dbo.sp_primary_operation @param1, @param2;")
-    lines.append("    ")
-    lines.append("    -- Create savepoint before risky operation")
-    lines.append("    SAVE TRANSACTION step1_savepoint;")
-    lines.append("    ")
-    lines.append("    -- Step 2: Risky operation that might fail")
-    lines.append("    PRINT 'Executing step 2 - Risky operation';")
-    lines.append("    BEGIN TRY")
-    lines.append("        -- EXEC dbo.sp_risky_operation @param3, @param4;")
-    lines.append("        ")
-    lines.append("        -- If successful, continue to step 3")
-    lines.append("        PRINT 'Step 2 completed successfully';")
-    lines.append("    END TRY")
-    lines.append("    BEGIN CATCH")
-    lines.append("        PRINT 'Step 2 failed, rolling back to savepoint';")
-    lines.append("        ROLLBACK TRANSACTION step1_savepoint;")
-    lines.append("        ")
-    lines.append("        -- Continue with alternative step")
-    lines.append("        PRINT 'Executing alternative step 2';")
-    lines.append("        -- EXEC dbo.sp_alternative_operation @param3, @param4;")
-    lines.append("    END CATCH;")
-    lines.append("    ")
-    lines.append("    -- Step 3: Finalization")
-    lines.append("    PRINT 'Executing step 3 - Finalization';")
-    lines.append("    -- EXEC dbo.sp_finalize_operation @result_param;")
-    lines.append("    ")
-    lines.append("    -- All steps completed successfully")
-    lines.append("    COMMIT TRANSACTION main_transaction;")
-    lines.append("    SET @transaction_started = 0;")
-    lines.append("    PRINT 'All operations committed successfully';")
-    lines.append("")
-    lines.append("END TRY")
-    lines.append("BEGIN CATCH")
-    lines.append("    -- Handle major failure")
-    lines.append("    IF @transaction_started = 1 AND @@TRANCOUNT > 0")
-    lines.append("    BEGIN")
-    lines.append("        ROLLBACK TRANSACTION main_transaction;")
-    lines.append("        PRINT 'Transaction rolled back due to error: ' + ERROR_MESSAGE();")
-    lines.append("    END;")
-    lines.append("    ")
-    lines.append("    THROW;")
-    lines.append("END CATCH;")
-    
-    return lines
+    return SCRIPT_TEMPLATES["transaction_management"].render_lines()
 
 def generate_dynamic_execution(framework_api_details):
     """Generate dynamic execution pattern."""
-    lines = []
-    
-    lines.append("-- Dynamic execution pattern with SQL generation")
-    lines.append("")
-    lines.append("-- Dynamic execution parameters")
-    lines.append("DECLARE @table_name nvarchar(128) = 'users';")
-    lines.append("DECLARE @filter_column nvarchar(128) = 'status';")
-    lines.append("DECLARE @filter_value nvarchar(255) = 'active';")
-    lines.append("DECLARE @operation_type nvarchar(50) = 'select';")
-    lines.append("DECLARE @dynamic_sql nvarchar(max);")
-    lines.append("DECLARE @param_definition nvarchar(500);")
-    lines.append("")
-    lines.append("-- Validate inputs to prevent SQL injection")
-    lines.append("IF @table_name NOT IN ('users', 'products', 'orders')")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Invalid table name specified', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    lines.append("IF @filter_column NOT IN ('status', 'type', 'category')")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Invalid filter column specified', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    lines.append("-- Build dynamic SQL based on operation type")
-    lines.append("IF @operation_type = 'select'")
-    lines.append("BEGIN")
-    lines.append("    SET @dynamic_sql = N'SELECT * FROM ' + QUOTENAME(@table_name) +")
-    lines.append("                       N' WHERE ' + QUOTENAME(@filter_column) + N' = @filter_value_param';")
-    lines.append("    SET @param_definition = N'@filter_value_param nvarchar(255)';")
-    lines.append("END")
-    lines.append("ELSE IF @operation_type = 'count'")
-    lines.append("BEGIN")
-    lines.append("    SET @dynamic_sql = N'SELECT COUNT(*) as record_count FROM ' + QUOTENAME(@table_name) +")
-    lines.append("                       N' WHERE ' + QUOTENAME(@filter_column) + N' = @filter_value_param';")
-    lines.append("    SET @param_definition = N'@filter_value_param nvarchar(255)';")
-    lines.append("END")
-    lines.append("ELSE")
-    lines.append("BEGIN")
-    lines.append("    RAISERROR('Unsupported operation type', 16, 1);")
-    lines.append("    RETURN;")
-    lines.append("END;")
-    lines.append("")
-    lines.append("-- Execute dynamic SQL safely")
-    lines.append("BEGIN TRY")
-    lines.append("    PRINT 'Executing: ' + @dynamic_sql;")
-    lines.append("    PRINT 'Parameters: @filter_value_param = ' + @filter_value;")
-    lines.append("    ")
-    lines.append("    EXEC sp_executesql")
-    lines.append("        @dynamic_sql,")
-    lines.append("        @param_definition,")
-    lines.append("        @filter_value_param = @filter_value;")
-    lines.append("    ")
-    lines.append("    PRINT 'Dynamic execution completed successfully';")
-    lines.append("END TRY")
-    lines.append("BEGIN CATCH")
-    lines.append("    PRINT 'Dynamic execution failed: ' + ERROR_MESSAGE();")
-    lines.append("    THROW;")
-    lines.append("END CATCH;")
-    
-    return lines
-
-def generate_sample_value(param_name, param_type):
-    """Generate realistic sample values based on parameter name and type."""
-    param_name_lower = param_name.lower()
-    param_type_lower = param_type.lower() if param_type else 'nvarchar'
-    
-    # ID parameters
-    if 'id' in param_name_lower:
-        if 'user_id' in param_name_lower:
-            return "1001"
-        elif 'card_id' in param_name_lower:
-            return "2001"
-        else:
-            return "123"
-    
-    # Name parameters
-    if 'name' in param_name_lower:
-        if 'user' in param_name_lower:
-            return "N'John Doe'"
-        elif 'file' in param_name_lower:
-            return "N'document.pdf'"
-        else:
-            return "N'Sample Name'"
-    
-    # Email parameters
-    if 'email' in param_name_lower:
-        return "N'user@example.com'"
-    
-    # Status parameters
-    if 'status' in param_name_lower:
-        return "N'active'"
-    
-    # Boolean parameters
-    if 'is_' in param_name_lower or param_type_lower == 'bit':
-        return "1"
-    
-    # Date parameters
-    if 'date' in param_name_lower or 'time' in param_name_lower or 'datetime' in param_type_lower:
-        return "GETDATE()"
-    
-    # Numeric types
-    if any(t in param_type_lower for t in ['int', 'decimal', 'numeric', 'float', 'money']):
-        if 'amount' in param_name_lower or 'price' in param_name_lower:
-            return "99.99"
-        elif 'count' in param_name_lower or 'size' in param_name_lower:
-            return "10"
-        else:
-            return "1"
-    
-    # String parameters (default)
-    if 'description' in param_name_lower:
-        return "N'Sample description text'"
-    elif 'comment' in param_name_lower:
-        return "N'Sample comment'"
-    elif 'path' in param_name_lower:
-        return "N'/path/to/resource'"
-    else:
-        return "N'sample value'"
+    return SCRIPT_TEMPLATES["dynamic_execution"].render_lines()
 
 def extract_procedures_from_script(script):
     """Extract procedure names from a generated script."""
@@ -1351,8 +812,58 @@ def extract_procedures_from_script(script):
             procedures.append(proc_name)
     return procedures
 
-def save_synthetic_training_data(training_examples, output_filename="synthetic_training_data.json"):
-    """Save synthetic training data to JSON file."""
+def save_generated_json(output_filename, data):
+    """Write a generated artifact as JSON in the configured JSON_OUTPUT_FORMAT (compact by default)."""
+    write_json(output_filename, data)
+
+
+def get_learning_progression() -> Dict:
+    """Learning progression recommendations shared by the JSON and JSONL outputs."""
+    return {
+        "recommended_order": [
+            "Start with simple_single_procedure examples to learn basic syntax",
+            "Progress to validation_focused examples to understand error handling",
+            "Practice crud_* examples to learn common workflow patterns",
+            "Study error_handling_focused examples for robust code practices",
+            "Advance to multi_procedure_workflow examples for complex scenarios",
+            "Master advanced_* examples for enterprise-level implementations"
+        ],
+        "key_concepts_by_level": {
+            "beginner": [
+                "Basic EXEC syntax",
+                "Parameter declaration and passing",
+                "Simple variable usage",
+                "Basic error checking"
+            ],
+            "intermediate": [
+                "Parameter validation patterns",
+                "TRY-CATCH error handling",
+                "Conditional logic (IF-ELSE)",
+                "Context variable usage",
+                "CRUD operation patterns"
+            ],
+            "advanced": [
+                "Multi-procedure workflows",
+                "Transaction management",
+                "Complex error handling",
+                "Performance considerations",
+                "Security best practices"
+            ],
+            "expert": [
+                "Dynamic SQL generation",
+                "Batch processing patterns",
+                "Advanced transaction control",
+                "Optimization techniques",
+                "Enterprise patterns"
+            ]
+        }
+    }
+
+
+def save_synthetic_training_data(training_examples, output_filename="synthetic_training_data.json", output_format="json"):
+    """Save synthetic training data to JSON file (output_format="jsonl" streams to sharded JSON Lines)."""
+    if output_format == "jsonl":
+        return save_synthetic_training_data_jsonl(training_examples, output_filename)
     training_data = {
         "metadata": {
             "generation_timestamp": datetime.now().isoformat(),
@@ -1395,53 +906,56 @@ def save_synthetic_training_data(training_examples, output_filename="synthetic_t
     training_data["metadata"]["example_types"] = type_counts
     
     # Add learning progression recommendations
-    training_data["learning_progression"] = {
-        "recommended_order": [
-            "Start with simple_single_procedure examples to learn basic syntax",
-            "Progress to validation_focused examples to understand error handling",
-            "Practice crud_* examples to learn common workflow patterns",
-            "Study error_handling_focused examples for robust code practices",
-            "Advance to multi_procedure_workflow examples for complex scenarios",
-            "Master advanced_* examples for enterprise-level implementations"
-        ],
-        "key_concepts_by_level": {
-            "beginner": [
-                "Basic EXEC syntax",
-                "Parameter declaration and passing",
-                "Simple variable usage",
-                "Basic error checking"
-            ],
-            "intermediate": [
-                "Parameter validation patterns",
-                "TRY-CATCH error handling",
-                "Conditional logic (IF-ELSE)",
-                "Context variable usage",
-                "CRUD operation patterns"
-            ],
-            "advanced": [
-                "Multi-procedure workflows",
-                "Transaction management",
-                "Complex error handling",
-                "Performance considerations",
-                "Security best practices"
-            ],
-            "expert": [
-                "Dynamic SQL generation",
-                "Batch processing patterns",
-                "Advanced transaction control",
-                "Optimization techniques",
-                "Enterprise patterns"
-            ]
-        }
-    }
+    training_data["learning_progression"] = get_learning_progression()
     
-    save_memory_file(output_filename, training_data)
+    save_generated_json(output_filename, training_data)
     print(f"SYNTHETIC_DATA: Saved {len(training_examples)} training examples to {output_filename}")
     
     return training_data
 
-def create_training_prompt_templates(training_examples, output_filename="training_prompts.json"):
-    """Create prompt templates for LLM training based on synthetic examples."""
+def save_synthetic_training_data_jsonl(training_examples, output_filename="synthetic_training_data.json",
+                                       shard_dir=None, max_shard_bytes=64 * 1024 * 1024, max_shard_records=100000):
+    """
+    Stream training examples (any iterable) into sharded JSON Lines and write a small
+    summary to output_filename. The learning guide is not materialized; per-level and
+    per-type counts come from the shard manifest.
+    """
+    shard_dir = shard_dir or os.path.splitext(output_filename)[0] + "_shards"
+    with ShardedJsonlWriter(shard_dir, prefix="training_examples", max_shard_bytes=max_shard_bytes,
+                            max_shard_records=max_shard_records,
+                            count_fields=["complexity_level", "example_type"]) as writer:
+        writer.write_all(training_examples)
+        manifest = writer.close({
+            "generation_timestamp": datetime.now().isoformat(),
+            "description": "Synthetic training data for TSQL framework learning"
+        })
+
+    training_data = {
+        "metadata": {
+            "generation_timestamp": manifest["metadata"]["generation_timestamp"],
+            "total_examples": manifest["total_records"],
+            "description": "Synthetic training data for TSQL framework learning",
+            "complexity_distribution": manifest["field_counts"]["complexity_level"],
+            "example_types": manifest["field_counts"]["example_type"],
+            "output_format": "jsonl",
+            "shard_manifest": os.path.join(shard_dir, MANIFEST_FILE),
+            "shard_count": len(manifest["shards"])
+        },
+        "learning_progression": get_learning_progression()
+    }
+    save_generated_json(output_filename, training_data)
+    print(f"SYNTHETIC_DATA: Streamed {manifest['total_records']} training examples into {len(manifest['shards'])} shard(s) under {shard_dir}")
+
+    return training_data
+
+def create_training_prompt_templates(training_examples, output_filename="training_prompts.json", *,
+                                     framework_api_details, rng=random, debugging_variants=1, workers=1):
+    """
+    Create prompt templates for LLM training based on synthetic examples.
+    Debugging prompts get debugging_variants mutated versions of each intermediate and
+    harder script, with the applied mutations as the answer key; framework_api_details
+    supplies the real signatures for wrong-parameter mutations and misspelling checks.
+    """
     
     prompt_templates = {
         "metadata": {
@@ -1461,6 +975,16 @@ def create_training_prompt_templates(training_examples, output_filename="trainin
     
     print("PROMPT_TEMPLATES: Creating LLM training prompt templates...")
     
+    # Debugging exercises are mutated in one batch (wrong parameter names need the API signatures)
+    debugging_examples = [example for example in training_examples
+                          if example["complexity_level"] in ["intermediate", "advanced", "expert"]]
+    mutation_engine = MutationEngine(framework_api_details, seed=rng.getrandbits(64), workers=workers)
+    debugging_variants_by_id = {
+        id(example): variants for example, variants in zip(
+            debugging_examples,
+            mutation_engine.mutate_batch([example["sql_script"] for example in debugging_examples], debugging_variants))
+    }
+    
     for example in training_examples:
         # Create code completion prompts
         script_lines = example["sql_script"].split('\n')
@@ -1537,8 +1061,8 @@ Target learning objectives:
         })
         
         # Create debugging prompts (introduce intentional errors)
-        if example["complexity_level"] in ["intermediate", "advanced", "expert"]:
-            buggy_script = introduce_common_errors(example["sql_script"])
+        for variant in debugging_variants_by_id.get(id(example), []):
+            buggy_script = variant["buggy_script"]
             prompt_templates["prompt_categories"]["debugging_assistance"].append({
                 "prompt_type": "debugging_assistance",
                 "difficulty": example["complexity_level"],
@@ -1556,7 +1080,8 @@ Identify:
 3. Best practice violations
 4. Potential runtime issues""",
                 "expected_output": example["sql_script"],
-                "common_errors_introduced": ["Missing error handling", "Incorrect parameter usage", "Transaction issues"],
+                "common_errors_introduced": [mutation["description"] for mutation in variant["answer_key"]],
+                "answer_key": variant["answer_key"],
                 "learning_objectives": example["learning_objectives"],
                 "procedures_involved": example["procedures_used"]
             })
@@ -1565,7 +1090,7 @@ Identify:
     for complexity in ["beginner", "intermediate", "advanced", "expert"]:
         complexity_examples = [ex for ex in training_examples if ex["complexity_level"] == complexity]
         if complexity_examples:
-            sample_example = random.choice(complexity_examples)
+            sample_example = rng.choice(complexity_examples)
             
             prompt_templates["prompt_categories"]["best_practices"].append({
                 "prompt_type": "best_practices",
@@ -1604,40 +1129,15 @@ Overall assessment: Well-structured example following TSQL.APP conventions.""",
     total_templates = sum(len(templates) for templates in prompt_templates["prompt_categories"].values())
     prompt_templates["metadata"]["total_templates"] = total_templates
     
-    save_memory_file(output_filename, prompt_templates)
+    save_generated_json(output_filename, prompt_templates)
     print(f"PROMPT_TEMPLATES: Created {total_templates} training prompt templates")
     
     return prompt_templates
 
-def introduce_common_errors(script):
-    """Introduce common errors into a script for debugging exercises."""
-    lines = script.split('\n')
-    modified_lines = []
-    
-    for line in lines:
-        modified_line = line
-        
-        # Randomly introduce errors (30% chance per applicable line)
-        if random.random() < 0.3:
-            # Missing semicolon
-            if line.strip().endswith(';') and 'EXEC' in line:
-                modified_line = line.rstrip(';')
-            
-            # Incorrect parameter syntax
-            elif '@' in line and '=' in line:
-                modified_line = line.replace('@', '') # Remove @ from parameter
-            
-            # Missing TRY in BEGIN TRY
-            elif 'BEGIN TRY' in line:
-                modified_line = line.replace('BEGIN TRY', 'BEGIN')
-            
-            # Wrong procedure name (common typo)
-            elif 'EXEC dbo.sp_' in line:
-                modified_line = line.replace('sp_', 'sp') # Remove underscore
-        
-        modified_lines.append(modified_line)
-    
-    return '\n'.join(modified_lines)
+def introduce_common_errors(script, *, framework_api_details, rng=random):
+    """Introduce common errors into a script for debugging exercises (one MutationEngine variant)."""
+    variants = MutationEngine(framework_api_details, seed=rng.getrandbits(64)).variants(script, 1)
+    return variants[0]["buggy_script"] if variants else script
 
 def generate_comprehensive_training_curriculum(framework_api_details, script_patterns, relationships, output_filename="training_curriculum.json"):
     """Generate a comprehensive training curriculum based on framework analysis."""
@@ -1792,7 +1292,7 @@ def generate_comprehensive_training_curriculum(framework_api_details, script_pat
     })
     
     # Create skill assessments
-    curriculum["skill_assessments"] = create_skill_assessments(framework_api_details)
+    curriculum["skill_assessments"] = create_skill_assessments(framework_api_details, script_patterns, relationships)
     
     # Create progression path
     curriculum["progression_path"] = [
@@ -1830,7 +1330,7 @@ def generate_comprehensive_training_curriculum(framework_api_details, script_pat
     
     curriculum["metadata"]["total_modules"] = len(curriculum["learning_modules"])
     
-    save_memory_file(output_filename, curriculum)
+    save_generated_json(output_filename, curriculum)
     print(f"CURRICULUM: Generated {len(curriculum['learning_modules'])} learning modules")
     
     return curriculum
@@ -1877,7 +1377,12 @@ def get_workflow_procedures(framework_api_details, relationships):
     proc_relationships = relationships.get("procedure_relationships", {})
     
     # Get most connected procedures
-    most_connected = relationships.get("relationship_summary", {}).get("most_connected_procedures", [])
+    relationship_summary = relationships.get("relationship_summary", {})
+    if isinstance(relationship_summary, list):
+        # ProcedureRelationshipAnalyzer output: [{"procedure", "connection_count"}], most connected first
+        most_connected = [{"procedure_name": entry["procedure"]} for entry in relationship_summary]
+    else:
+        most_connected = relationship_summary.get("most_connected_procedures", [])
     for proc_info in most_connected[:5]:
         workflow.append(proc_info["procedure_name"])
     
@@ -1904,12 +1409,13 @@ def create_skill_assessments(
     relationships: Dict
 ) -> Dict:
     """Create skill assessments based on framework analysis."""
-    logging.info("ASSESSMENTS: Generating skill assessments...")
+    print("ASSESSMENTS: Generating skill assessments...")
     
     assessments = {
         "title": "T-SQL Framework Skill Assessments",
         "description": "Comprehensive skill assessment exercises",
-        "levels": []
+        "levels": [],
+        "assessments": []
     }
     
     # Generate assessment levels
@@ -1941,7 +1447,7 @@ def create_skill_assessments(
         assessments["levels"].append(level_assessment)
     
     # Beginner assessment
-    assessments.append({
+    assessments["assessments"].append({
         "assessment_id": "beginner_validation",
         "title": "Validation Pattern Assessment",
         "difficulty": "beginner",
@@ -1966,7 +1472,7 @@ def create_skill_assessments(
     })
     
     # Advanced assessment
-    assessments.append({
+    assessments["assessments"].append({
         "assessment_id": "advanced_workflows",
         "title": "Multi-Procedure Workflow Assessment",
         "difficulty": "advanced",
@@ -2000,45 +1506,64 @@ def generate_all_training_materials(framework_api_details: List[Dict],
     """Generate all training materials in one coordinated effort."""
     print("\nFRAMEWORK_TRAINING: Generating comprehensive training materials...")
     
-    # Initialize generators
-    simple_gen = SimpleExampleGenerator(framework_api_details, script_patterns)
-    validation_gen = ValidationExampleGenerator(framework_api_details, script_patterns)
-    crud_gen = CRUDExampleGenerator(framework_api_details, script_patterns)
-    error_gen = ErrorHandlingExampleGenerator(framework_api_details, script_patterns)
-    multi_gen = MultiProcedureExampleGenerator(framework_api_details, script_patterns)
-    advanced_gen = AdvancedExampleGenerator(framework_api_details, script_patterns)
-    
-    # Generate examples with proper structure
-    examples = []
-    example_id = 1
-    
-    # Helper function to create example structure
-    def create_example(category: str, example_data: Dict) -> Dict:
-        """Create example structure with proper fields."""
-        nonlocal example_id
-        return {
-            "example_id": f"pattern_example_{example_id}",
-            "complexity_level": example_data["complexity"],
-            "learning_objectives": example_data["learning_objectives"],
-            "example_script": example_data["example_script"],
-            "pattern_frequency": example_data.get("pattern_frequency", 0),
-            "category": category
-        }
+    # Seeded engine: same seed -> identical examples for any number of workers
+    engine = SeededGenerationEngine(
+        framework_api_details,
+        script_patterns,
+        seed=args.get('seed', 0),
+        workers=args.get('workers', 1),
+        unit_size=args.get('unit_size', DEFAULT_UNIT_SIZE),
+        usage_counts=args.get('usage_counts')
+    )
     
-    # Generate examples
-    for category, generator in {
-        "simple": simple_gen,
-        "validation": validation_gen,
-        "crud": crud_gen,
-        "error_handling": error_gen,
-        "multi_procedure": multi_gen,
-        "advanced": advanced_gen
-    }.items():
-        count = args.get(f'{category}_count', 10)
-        for i in range(count):
-            example_data = generator.generate_example()
-            examples.append(create_example(category, example_data))
-            example_id += 1
+    # Examples flow one at a time through the stages into the sink; in jsonl mode they are
+    # streamed to shards instead of kept
+    jsonl_writer = None
+    if args.get('output_format', 'json') == 'jsonl':
+        jsonl_writer = ShardedJsonlWriter(
+            os.path.join(args.get('output_dir', 'training_materials'), 'training_examples'),
+            prefix='training_examples',
+            max_shard_bytes=args.get('max_shard_bytes', 64 * 1024 * 1024),
+            max_shard_records=args.get('max_shard_records', 100000),
+            count_fields=['category', 'complexity_level']
+        )
+        sink = JsonlSink(jsonl_writer, {"generation_timestamp": datetime.now().isoformat()})
+    else:
+        sink = ListSink()
+    output_sink = sink
+    # Token-budgeted packing: the writers receive sequences of examples instead of single examples
+    if args.get('pack_max_tokens'):
+        output_sink = PackingSink(SequencePacker(args['pack_max_tokens'],
+                                                 args.get('pack_buffer_size', DEFAULT_BUFFER_SIZE)), sink)
+    
+    # Generate examples; with a coverage target the counts become a budget and generation
+    # stops once the target is met, otherwise every count is generated
+    counts = {category: args.get(f'{category}_count', 10) for category in GENERATOR_CLASSES}
+    coverage_target = args.get('coverage_target')
+    stages = []
+    if coverage_target is not None:
+        generated = engine.generate_to_coverage(
+            counts,
+            target=coverage_target,
+            min_examples=args.get('min_examples', 0),
+            max_examples=args.get('max_examples'),
+            parameter_target=args.get('parameter_coverage_target'),
+            bias=args.get('coverage_bias', 0.9)
+        )
+    else:
+        generated = engine.generate(counts)
+        engine.coverage = CoverageTracker(engine.framework_api)
+        stages.append(CoverageStage(engine.coverage))
+    stages.append(ValidationStage())
+    # Near-duplicate scripts (same shape, different literals) are dropped before output
+    if args.get('dedup', True):
+        stages.append(DedupStage(ExampleDeduplicator(
+            error_rate=args.get('dedup_error_rate', DEFAULT_ERROR_RATE),
+            exact_limit=args.get('dedup_exact_limit', DEFAULT_EXACT_LIMIT)
+        )))
+    stages.extend([EnrichmentStage(), StatisticsStage()])
+    stats = ExamplePipeline(stages, output_sink).run(generated)
+    examples = sink.records if isinstance(sink, ListSink) else []
     
     # Generate curriculum and assessments
     curriculum = generate_comprehensive_training_curriculum(
@@ -2061,21 +1586,29 @@ def generate_all_training_materials(framework_api_details: List[Dict],
     }
     
     # Calculate statistics
-    stats = {
-        "total_examples": len(examples),
-        "procedure_coverage": calculate_procedure_coverage(framework_api_details, examples),
-        "difficulty_progression": validate_difficulty_progression(examples),
-        "category_distribution": {
-            category: len([e for e in examples if e['category'] == category])
-            for category in set(e['category'] for e in examples)
-        }
-    }
+    coverage = engine.coverage
+    if coverage_target is not None and coverage.procedure_coverage < coverage_target:
+        print(f"  ⚠ Procedure coverage {coverage.procedure_coverage:.1%} below target "
+              f"{coverage_target:.1%} after {coverage.examples_seen} examples")
+    stats["procedure_coverage"] = coverage.procedure_coverage
+    stats["parameter_coverage"] = coverage.parameter_coverage
+    if "packing" in stats:
+        packing = stats["packing"]
+        print(f"  ✓ Packed {packing['examples']} examples into {packing['sequences']} sequences of "
+              f"{packing['max_tokens']} tokens ({packing['padding_efficiency']:.1%} filled)")
+        if packing["oversized_examples"]:
+            print(f"  ⚠ {packing['oversized_examples']} examples exceed {packing['max_tokens']} tokens "
+                  f"({packing['truncated_tokens']} tokens would be truncated); not counted in the fill rate")
+    if "deduplication" in stats:
+        dedup = stats["deduplication"]
+        print(f"  ✓ Dedup ({dedup['mode']}): {dedup['duplicates_rejected']} of {dedup['examples_seen']} "
+              f"examples rejected as duplicates")
     
     # Create output structure
     training_materials = {
         "framework_usage_patterns": script_patterns,
         "procedure_relationships": relationships,
-        "training_examples": examples,
+        "training_examples": os.path.join(jsonl_writer.output_dir, MANIFEST_FILE) if jsonl_writer else examples,
         "training_summary": stats
     }
     
@@ -2087,25 +1620,20 @@ def generate_all_training_materials(framework_api_details: List[Dict],
     
     return training_materials
 
+def _iter_training_examples(training_examples):
+    """Examples from either a flat list or a {example_type: [examples]} dict."""
+    if isinstance(training_examples, dict):
+        for examples in training_examples.values():
+            yield from examples
+    else:
+        yield from training_examples
+
 def calculate_procedure_coverage(framework_api_details: List[Dict], 
-                                    training_examples: Dict) -> float:
+                                    training_examples) -> float:
     """Calculate what percentage of framework procedures are covered in training examples."""
-    all_procedures = set(
-        f"{p['schema_name']}.{p['object_name']}"
-        for p in framework_api_details if p.get('object_type_short') == 'P'
-    )
-    
-    covered_procedures = set()
-    for example_type, examples in training_examples.items():
-        for example in examples:
-            if example_type == 'multi_procedure':
-                covered_procedures.update(example['procedures'])
-            else:
-                covered_procedures.add(example['procedure'])
-    
-    return len(covered_procedures) / len(all_procedures) if all_procedures else 0.0
+    return measure_coverage(framework_api_details, _iter_training_examples(training_examples)).procedure_coverage
 
-def validate_difficulty_progression(training_examples: Dict) -> Dict:
+def validate_difficulty_progression(training_examples) -> str:
     """Validate that examples provide good difficulty progression."""
     difficulty_counts = {
         "simple": 0,
@@ -2113,21 +1641,11 @@ def validate_difficulty_progression(training_examples: Dict) -> Dict:
         "complex": 0
     }
     
-    for example_type, examples in training_examples.items():
-        for example in examples:
-            difficulty = example.get('complexity', 'simple')
-            difficulty_counts[difficulty] += 1
-    
-    beginner_pct = (complexity_counts.get("beginner", 0) / total) * 100
-    intermediate_pct = (complexity_counts.get("intermediate", 0) / total) * 100
-    advanced_pct = (complexity_counts.get("advanced", 0) / total) * 100
-    expert_pct = (complexity_counts.get("expert", 0) / total) * 100
+    for example in _iter_training_examples(training_examples):
+        difficulty = example.get('complexity_level', example.get('complexity', 'simple'))
+        difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
     
-    # Good progression should have decreasing percentages as difficulty increases
-    if beginner_pct >= intermediate_pct >= advanced_pct >= expert_pct and beginner_pct > 20:
-        return "Good progression"
-    else:
-        return f"Needs adjustment: B:{beginner_pct:.0f}% I:{intermediate_pct:.0f}% A:{advanced_pct:.0f}% E:{expert_pct:.0f}%"
+    return rate_difficulty_progression(difficulty_counts)
 
 # Add this to the main execution section after co-occurrence stats are updated:
 """
@@ -0,0 +1,217 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from collections.abc import Mapping, Sequence
+import json
+import sys
+
+# Fields kept as compact JSON bytes until first access (large and rarely read)
+LAZY_OBJECT_FIELDS = ("embedded_example", "embedded_description", "co_occurrence_stats", "real_usage_examples")
+_NOT_LOADED = object()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _SlotMapping(Mapping):
+    """
+    Read/write dict interface over __slots__ so model instances can replace the raw
+    JSON dicts everywhere (obj['object_name'], obj.get(...), iteration, to_json()).
+    Keys outside FIELDS are kept in the 'extra' slot.
+    """
+
+    __slots__ = ()
+    FIELDS: tuple = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS or bool(self.extra and key in self.extra)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def to_json(self) -> Dict:
+        return dict(self.items())
+
+
+class Parameter(_SlotMapping):
+    """One procedure/function parameter with an interned, precomputed lowercase name."""
+
+    FIELDS = ("name", "type_from_sys", "type_from_def", "max_length_bytes", "precision", "scale",
+              "is_output", "default_value", "has_default", "is_readonly", "order", "full_declaration_from_def")
+    __slots__ = FIELDS + ("lower_name", "extra")
+
+    def __init__(self, data: Dict):
+        self.extra = None
+        for key, value in data.items():
+            self[key] = _intern(value) if key in ("name", "type_from_sys", "type_from_def") else value
+        for field in self.FIELDS:
+            if not hasattr(self, field):
+                setattr(self, field, None)
+        self.lower_name = sys.intern((self.name or "").lower())
+
+    @property
+    def is_return_value(self) -> bool:
+        return self.name == '[Return Value]'
+
+    def __repr__(self) -> str:
+        return f"Parameter({self.name!r}, {self.type_from_sys!r})"
+
+
+class ApiObject(_SlotMapping):
+    """
+    One framework API object. Names are interned and the qualified forms are computed
+    once: full_name ('dbo.sp_api_toast'), lower_name ('sp_api_toast') and
+    lower_full_name. Heavy fields (LAZY_OBJECT_FIELDS) stay encoded until read.
+    """
+
+    FIELDS = ("schema_name", "object_name", "object_type", "object_type_short", "parameters") + LAZY_OBJECT_FIELDS
+    __slots__ = ("schema_name", "object_name", "object_type", "object_type_short", "parameters",
+                 "full_name", "lower_name", "lower_full_name", "extra", "_lazy")
+
+    def __init__(self, data: Dict):
+        self.extra = None
+        self._lazy = {}
+        self.schema_name = _intern(data.get('schema_name') or 'dbo')
+        self.object_name = _intern(data.get('object_name'))
+        self.object_type = _intern(data.get('object_type'))
+        self.object_type_short = _intern((data.get('object_type_short') or '').strip() or None)
+        self.parameters = [param if isinstance(param, Parameter) else Parameter(param)
+                           for param in data.get('parameters') or []]
+        for key, value in data.items():
+            if key in LAZY_OBJECT_FIELDS:
+                self._store_lazy(key, value)
+            elif key not in self.__slots__:
+                self[key] = value
+        self.full_name = sys.intern(f"{self.schema_name}.{self.object_name}")
+        self.lower_name = sys.intern((self.object_name or "").lower())
+        self.lower_full_name = sys.intern(self.full_name.lower())
+
+    def _store_lazy(self, key: str, value: Any) -> None:
+        if value is None or not isinstance(value, (list, dict, str)):
+            self._lazy[key] = value
+            return
+        try:
+            self._lazy[key] = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        except TypeError:
+            # e.g. UsageExampleRefs: keep the object as is
+            self._lazy[key] = value
+
+    def _load_lazy(self, key: str) -> Any:
+        value = self._lazy.get(key)
+        if isinstance(value, bytes):
+            value = self._lazy[key] = json.loads(value)
+        return value
+
+    def __getattr__(self, key: str) -> Any:
+        # Only reached for lazy fields (real slots resolve first)
+        if key in LAZY_OBJECT_FIELDS:
+            return self._load_lazy(key)
+        raise AttributeError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in LAZY_OBJECT_FIELDS:
+            return self._load_lazy(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in LAZY_OBJECT_FIELDS:
+            self._lazy[key] = value
+        elif key == 'parameters':
+            self.parameters = [param if isinstance(param, Parameter) else Parameter(param) for param in value or []]
+        else:
+            super().__setitem__(key, value)
+
+    @property
+    def is_procedure(self) -> bool:
+        return self.object_type_short == 'P'
+
+    @property
+    def input_parameters(self) -> List[Parameter]:
+        return [param for param in self.parameters if not param.is_return_value]
+
+    def to_json(self) -> Dict:
+        data = dict(self.items())
+        data['parameters'] = [param.to_json() for param in self.parameters]
+        return data
+
+    def __repr__(self) -> str:
+        return f"ApiObject({self.full_name!r}, {self.object_type_short!r})"
+
+
+class ApiModel(Sequence):
+    """
+    All framework API objects, built once from framework_api_details.json and shared
+    by analyzers and generators. Iterates like the original list of dicts and keeps
+    name lookups (qualified or short, any case) as dicts built at load time.
+    """
+
+    def __init__(self, api_objects: Iterable):
+        self.objects: List[ApiObject] = [obj if isinstance(obj, ApiObject) else ApiObject(obj) for obj in api_objects]
+        self.procedures: List[ApiObject] = [obj for obj in self.objects if obj.is_procedure]
+        self.by_full_name: Dict[str, ApiObject] = {obj.full_name: obj for obj in self.objects}
+        self.by_lower_full_name: Dict[str, ApiObject] = {obj.lower_full_name: obj for obj in self.objects}
+        self.by_lower_name: Dict[str, ApiObject] = {}
+        for obj in self.objects:
+            # Prefer dbo when a short name exists in several schemas
+            if obj.lower_name not in self.by_lower_name or obj.schema_name == 'dbo':
+                self.by_lower_name[obj.lower_name] = obj
+        self.procedures_by_full_name: Dict[str, ApiObject] = {obj.full_name: obj for obj in self.procedures}
+        self.procedures_by_lower_name: Dict[str, ApiObject] = {obj.lower_name: obj for obj in self.procedures}
+
+    @classmethod
+    def from_json_file(cls, filepath: str) -> "ApiModel":
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('api_objects', []) if isinstance(data, dict) else data)
+
+    def __getitem__(self, index):
+        return self.objects[index]
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def lookup(self, name: str) -> Optional[ApiObject]:
+        """Resolve 'dbo.sp_x', '[dbo].[sp_x]' or 'sp_x' in any case."""
+        if not name:
+            return None
+        obj = self.by_full_name.get(name)
+        if obj is not None:
+            return obj
+        lowered = name.replace('[', '').replace(']', '').lower()
+        return self.by_lower_full_name.get(lowered) if '.' in lowered else self.by_lower_name.get(lowered)
+
+    def to_json(self) -> List[Dict]:
+        return [obj.to_json() for obj in self.objects]
+
+
+def ensure_api_model(framework_api_details) -> ApiModel:
+    """The shared model when one is passed in, otherwise a model built from the raw dicts."""
+    if isinstance(framework_api_details, ApiModel):
+        return framework_api_details
+    return ApiModel(framework_api_details or [])
@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, List, Optional
+
+from .api_model import ensure_api_model
+from .procedure_pools import ProcedurePools
+from .script_utils import extract_procedures_from_script
+
+
+class CoverageTracker:
+    """
+    Live coverage of framework procedures and their input parameters. Each is
+    assigned a bit index once; marking an example sets bits in a bytearray and
+    keeps running counts, so coverage is O(1) to read at any point of generation.
+    Attached ProcedurePools are told about newly covered procedures.
+    """
+
+    def __init__(self, framework_api_details, pools: Optional[ProcedurePools] = None):
+        self.framework_api = ensure_api_model(framework_api_details)
+        self.pools = pools
+        self.procedure_index: Dict[str, int] = {}
+        self.parameter_index: Dict[str, int] = {}
+        for proc in self.framework_api.procedures:
+            self.procedure_index[proc.full_name] = len(self.procedure_index)
+            for param in proc.input_parameters:
+                self.parameter_index[f"{proc.full_name}.{param.name}"] = len(self.parameter_index)
+        self.procedure_bits = bytearray(len(self.procedure_index))
+        self.parameter_bits = bytearray(len(self.parameter_index))
+        self.procedures_covered = 0
+        self.parameters_covered = 0
+        self.examples_seen = 0
+
+    @property
+    def procedure_coverage(self) -> float:
+        return self.procedures_covered / len(self.procedure_bits) if self.procedure_bits else 0.0
+
+    @property
+    def parameter_coverage(self) -> float:
+        return self.parameters_covered / len(self.parameter_bits) if self.parameter_bits else 0.0
+
+    def mark_procedure(self, name: str) -> bool:
+        """Mark a procedure ('dbo.sp_x', 'sp_x', any case) covered; True when it was new."""
+        index = self.procedure_index.get(name)
+        if index is None:
+            proc = self.framework_api.lookup(name)
+            if proc is None or not proc.is_procedure:
+                return False
+            name, index = proc.full_name, self.procedure_index[proc.full_name]
+        if self.procedure_bits[index]:
+            return False
+        self.procedure_bits[index] = 1
+        self.procedures_covered += 1
+        if self.pools is not None:
+            self.pools.mark_covered(name)
+        return True
+
+    def mark_parameter(self, qualified_name: str) -> bool:
+        """Mark '<schema>.<procedure>.<@parameter>' covered; True when it was new."""
+        index = self.parameter_index.get(qualified_name)
+        if index is None or self.parameter_bits[index]:
+            return False
+        self.parameter_bits[index] = 1
+        self.parameters_covered += 1
+        return True
+
+    def mark_example(self, example: Dict) -> int:
+        """
+        Mark what one example uses: 'procedures_used'/'parameters_used' when present,
+        otherwise procedures found in its script. Returns the number of new procedures.
+        """
+        self.examples_seen += 1
+        names = example.get('procedures_used') or example.get('procedures')
+        if names is None:
+            names = [example['procedure']] if example.get('procedure') else extract_procedures_from_script(
+                example.get('example_script') or example.get('sql_script') or '')
+        new = sum(self.mark_procedure(name) for name in names)
+        for qualified_name in example.get('parameters_used') or ():
+            self.mark_parameter(qualified_name)
+        return new
+
+    def reached(self, target: float, parameter_target: Optional[float] = None) -> bool:
+        if self.procedure_coverage < target:
+            return False
+        return parameter_target is None or self.parameter_coverage >= parameter_target
+
+    def uncovered_procedures(self) -> List[str]:
+        return [name for name, index in self.procedure_index.items() if not self.procedure_bits[index]]
+
+    def summary(self) -> Dict:
+        return {
+            "examples": self.examples_seen,
+            "procedures_covered": self.procedures_covered,
+            "procedures_total": len(self.procedure_bits),
+            "procedure_coverage": round(self.procedure_coverage, 4),
+            "parameters_covered": self.parameters_covered,
+            "parameters_total": len(self.parameter_bits),
+            "parameter_coverage": round(self.parameter_coverage, 4)
+        }
+
+
+def measure_coverage(framework_api_details, examples: Iterable[Dict]) -> CoverageTracker:
+    """Coverage of an existing set of examples."""
+    tracker = CoverageTracker(framework_api_details)
+    for example in examples:
+        tracker.mark_example(example)
+    return tracker
@@ -0,0 +1,169 @@
+from typing import Dict, List, Optional, Set
+import hashlib
+import math
+import re
+
+# Literals are replaced before comments are stripped so '--' inside a string is not a comment
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_NUMBER_LITERAL = re.compile(r"(?<![\w@#.])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_HEX_LITERAL = re.compile(r"\b0x[0-9A-Fa-f]*\b")
+_WHITESPACE = re.compile(r"\s+")
+
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_EXACT_LIMIT = 100000
+
+
+def normalize_script(script: str) -> str:
+    """Script reduced to its shape: literals as '?', comments and whitespace runs removed, lowercased."""
+    text = _STRING_LITERAL.sub("'?'", script or "")
+    text = _BLOCK_COMMENT.sub(" ", _LINE_COMMENT.sub(" ", text))
+    text = _HEX_LITERAL.sub("?", text)
+    text = _NUMBER_LITERAL.sub("?", text)
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def script_hash(script: str) -> int:
+    """128-bit hash of the normalized script."""
+    return int.from_bytes(hashlib.blake2b(normalize_script(script).encode('utf-8'), digest_size=16).digest(), 'big')
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over 128-bit hashes. Sized for capacity items at
+    error_rate; the k bit positions come from double hashing the two 64-bit halves.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.bit_count = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / self.capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, hashed: int) -> List[int]:
+        low, high = hashed & 0xFFFFFFFFFFFFFFFF, hashed >> 64
+        bit_count = self.bit_count
+        return [(low + i * high) % bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, hashed: int) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(hashed))
+
+    def add(self, hashed: int) -> bool:
+        """Set the item's bits; True when at least one was unset (the item was new)."""
+        bits = self.bits
+        new = False
+        for position in self._positions(hashed):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Chain of Bloom filters that grows without a known item count. Each new filter
+    has growth times the capacity and tightening times the error rate of the last,
+    so the compound false-positive rate stays below error_rate.
+    """
+
+    def __init__(self, initial_capacity: int = 10000, error_rate: float = DEFAULT_ERROR_RATE,
+                 growth: int = 2, tightening: float = 0.5):
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = [BloomFilter(initial_capacity, error_rate * (1 - tightening))]
+
+    def __contains__(self, hashed: int) -> bool:
+        return any(hashed in bloom for bloom in self.filters)
+
+    def add(self, hashed: int) -> bool:
+        if hashed in self:
+            return False
+        current = self.filters[-1]
+        if current.full:
+            current = BloomFilter(current.capacity * self.growth, current.error_rate * self.tightening)
+            self.filters.append(current)
+        current.add(hashed)
+        return True
+
+    @property
+    def count(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+
+class ExampleDeduplicator:
+    """
+    Drops examples whose normalized script was already seen. Hashes are kept in an
+    exact set up to exact_limit distinct scripts, then moved into a ScalableBloomFilter
+    (false positives, i.e. wrongly dropped new scripts, at most error_rate).
+    """
+
+    def __init__(self, error_rate: float = DEFAULT_ERROR_RATE, exact_limit: int = DEFAULT_EXACT_LIMIT):
+        self.error_rate = error_rate
+        self.exact_limit = exact_limit
+        self.exact: Optional[Set[int]] = set()
+        self.bloom: Optional[ScalableBloomFilter] = None
+        self.seen = 0
+        self.rejected = 0
+        self.rejected_by_category: Dict[str, int] = {}
+
+    @property
+    def mode(self) -> str:
+        return "exact" if self.bloom is None else "bloom"
+
+    def add(self, script: str, category: Optional[str] = None) -> bool:
+        """True when the script is new and should be kept."""
+        self.seen += 1
+        hashed = script_hash(script)
+        if self.bloom is None:
+            new = hashed not in self.exact
+            if new:
+                self.exact.add(hashed)
+                if len(self.exact) > self.exact_limit:
+                    self._switch_to_bloom()
+        else:
+            new = self.bloom.add(hashed)
+        if not new:
+            self.rejected += 1
+            if category is not None:
+                self.rejected_by_category[category] = self.rejected_by_category.get(category, 0) + 1
+        return new
+
+    def _switch_to_bloom(self) -> None:
+        self.bloom = ScalableBloomFilter(self.exact_limit * 2, self.error_rate)
+        for hashed in self.exact:
+            self.bloom.add(hashed)
+        self.exact = None
+
+    def summary(self) -> Dict:
+        summary = {
+            "mode": self.mode,
+            "examples_seen": self.seen,
+            "duplicates_rejected": self.rejected,
+            "rejection_rate": round(self.rejected / self.seen, 4) if self.seen else 0.0,
+            "rejected_by_category": dict(self.rejected_by_category)
+        }
+        if self.bloom is not None:
+            summary.update({
+                "error_rate": self.error_rate,
+                "bloom_filters": len(self.bloom.filters),
+                "bloom_bytes": self.bloom.size_bytes
+            })
+        return summary
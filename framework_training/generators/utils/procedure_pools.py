@@ -0,0 +1,157 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+import random
+
+from .api_model import ApiObject, ensure_api_model
+
+# Procedure-name keywords for each CRUD verb class
+CRUD_KEYWORDS = {
+    "create": ["create", "add", "insert", "new"],
+    "read": ["get", "fetch", "list", "search", "find"],
+    "update": ["update", "modify", "edit", "change"],
+    "delete": ["delete", "remove", "drop"]
+}
+COMPLEX_PARAMETER_COUNT = 3
+
+
+class AliasTable:
+    """Vose alias method: O(n) setup, O(1) weighted sampling (two uniform draws)."""
+
+    __slots__ = ("probability", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        count = len(weights)
+        total = float(sum(weights))
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        if not count or total <= 0:
+            return
+        scaled = [weight * count / total for weight in weights]
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1.0 up to rounding
+        for index in small + large:
+            self.probability[index] = 1.0
+
+    def sample(self, rng=random) -> int:
+        index = int(rng.random() * len(self.probability))
+        return index if rng.random() < self.probability[index] else self.alias[index]
+
+
+class UncoveredSet:
+    """Positions not yet covered, with O(1) removal (swap with last) and O(1) uniform pick."""
+
+    __slots__ = ("items", "where")
+
+    def __init__(self, size: int):
+        self.items = list(range(size))
+        self.where = list(range(size))  # position -> index in items, -1 once covered
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def discard(self, position: int) -> None:
+        index = self.where[position]
+        if index < 0:
+            return
+        last = self.items.pop()
+        if last != position:
+            self.items[index] = last
+            self.where[last] = index
+        self.where[position] = -1
+
+    def pick(self, rng=random) -> int:
+        return self.items[int(rng.random() * len(self.items))]
+
+
+class ProcedurePool:
+    """A fixed list of procedures with an alias table over their weights."""
+
+    __slots__ = ("name", "procedures", "weights", "uncovered", "_table")
+
+    def __init__(self, name: str, procedures: List[ApiObject], weights: List[float]):
+        self.name = name
+        self.procedures = procedures
+        self.weights = weights
+        self.uncovered: Optional[UncoveredSet] = None
+        self._table = AliasTable(weights)
+
+    def __len__(self) -> int:
+        return len(self.procedures)
+
+    def choice(self, rng=random) -> ApiObject:
+        """Weighted pick; raises IndexError on an empty pool like random.choice."""
+        if not self.procedures:
+            raise IndexError(f"procedure pool '{self.name}' is empty")
+        return self.procedures[self._table.sample(rng)]
+
+    def choice_uncovered(self, rng=random, bias: float = 1.0) -> ApiObject:
+        """With probability bias a uniform pick among uncovered procedures, else choice()."""
+        if self.uncovered and rng.random() < bias:
+            return self.procedures[self.uncovered.pick(rng)]
+        return self.choice(rng)
+
+
+class ProcedurePools:
+    """
+    Procedure pools indexed once per run: all, with_parameters, complex (more than
+    COMPLEX_PARAMETER_COUNT parameters), crud_<verb> from CRUD_KEYWORDS and
+    with_real_usage. Picks are weighted by corpus usage count + smoothing, so
+    frequently used procedures appear proportionally more often while unused ones
+    stay reachable. Without usage counts every procedure weighs the same.
+
+    After track_coverage(), picks prefer procedures not yet passed to mark_covered().
+    """
+
+    def __init__(self, framework_api_details, usage_counts: Optional[Dict[str, int]] = None, smoothing: float = 1.0):
+        self.framework_api = ensure_api_model(framework_api_details)
+        self.usage_counts = usage_counts or {}
+        self.smoothing = smoothing
+        self.coverage_bias: Optional[float] = None
+        procedures = self.framework_api.procedures
+        self.pools: Dict[str, ProcedurePool] = {}
+        self._add("all", procedures)
+        self._add("with_parameters", [proc for proc in procedures if proc.parameters])
+        self._add("complex", [proc for proc in procedures if len(proc.parameters) > COMPLEX_PARAMETER_COUNT])
+        for verb, keywords in CRUD_KEYWORDS.items():
+            self._add(f"crud_{verb}", [proc for proc in procedures
+                                       if any(keyword in proc.lower_name for keyword in keywords)])
+        self._add("with_real_usage", [proc for proc in procedures
+                                      if self.usage_counts.get(proc.full_name) or proc.get('real_usage_examples')])
+
+    def _add(self, name: str, procedures: Iterable[ApiObject]) -> None:
+        procedures = list(procedures)
+        weights = [self.usage_counts.get(proc.full_name, 0) + self.smoothing for proc in procedures]
+        self.pools[name] = ProcedurePool(name, procedures, weights)
+
+    def __getitem__(self, name: str) -> ProcedurePool:
+        return self.pools[name]
+
+    def choice(self, name: str, rng=random, fallback: Optional[str] = "all") -> ApiObject:
+        """Weighted pick from one pool, using the fallback pool when it is empty."""
+        pool = self.pools[name]
+        if not pool and fallback:
+            pool = self.pools[fallback]
+        if self.coverage_bias is not None:
+            return pool.choice_uncovered(rng, self.coverage_bias)
+        return pool.choice(rng)
+
+    def track_coverage(self, bias: float = 0.9) -> None:
+        """Start biasing picks: with probability bias, an uncovered procedure of the pool."""
+        self.coverage_bias = bias
+        self._positions: Dict[str, List] = {}
+        for pool in self.pools.values():
+            pool.uncovered = UncoveredSet(len(pool))
+            for position, proc in enumerate(pool.procedures):
+                self._positions.setdefault(proc.full_name, []).append((pool, position))
+
+    def mark_covered(self, full_name: str) -> None:
+        if self.coverage_bias is None:
+            return
+        for pool, position in self._positions.get(full_name, ()):
+            pool.uncovered.discard(position)
@@ -0,0 +1,496 @@
+from typing import Dict
+
+from .script_templates import ScriptTemplate, compile_template
+
+# Script shapes used by the synthetic generators. Slot syntax is documented on
+# ScriptTemplate; context builders live next to the generate_*_script functions.
+
+SIMPLE = """\
+-- Simple usage example for {object_name}
+
+{% if declarations %}
+-- Declare required parameters
+{declarations:block}
+
+{% endif %}
+-- Execute the procedure
+EXEC {schema_name}.{object_name}{arguments:args}
+"""
+
+VALIDATION = """\
+-- Validation example for {object_name}
+
+{% if declarations %}
+-- Declare and initialize parameters
+{declarations:block}
+
+{% endif %}
+{% if required %}
+-- Validate required parameters
+{% for name in required %}
+IF {name} IS NULL
+BEGIN
+    RAISERROR('Parameter {name} is required', 16, 1);
+    RETURN;
+END;
+{% endfor %}
+
+{% endif %}
+-- Execute with error handling
+BEGIN TRY
+    EXEC {schema_name}.{object_name}{arguments:params}
+END TRY
+BEGIN CATCH
+    PRINT 'Error occurred: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+CRUD_HEADER = """\
+-- {operation_upper} operation using {object_name}
+
+-- Common context variables
+DECLARE @user_id int = @user_id; -- From context
+DECLARE @card_id int = @card_id; -- From context
+
+"""
+
+CREATE_PATTERN = """\
+-- Validation before creation
+IF @user_id IS NULL
+BEGIN
+    RAISERROR('User context required for creation', 16, 1);
+    RETURN;
+END;
+
+-- Create new record
+BEGIN TRY
+    EXEC {schema_name}.{object_name}{arguments:params}
+
+    PRINT 'Record created successfully';
+END TRY
+BEGIN CATCH
+    PRINT 'Creation failed: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+READ_PATTERN = """\
+-- Prepare search parameters
+DECLARE @search_criteria nvarchar(255) = 'example search';
+DECLARE @page_size int = 20;
+DECLARE @page_number int = 1;
+
+-- Execute search/retrieval
+EXEC {schema_name}.{object_name}{arguments:params}
+
+-- Check if results were found
+IF @@ROWCOUNT > 0
+    PRINT 'Data retrieved successfully';
+ELSE
+    PRINT 'No data found matching criteria';
+"""
+
+UPDATE_PATTERN = """\
+-- Validate record exists and user has permission
+IF @card_id IS NULL
+BEGIN
+    RAISERROR('Record ID required for update', 16, 1);
+    RETURN;
+END;
+
+-- Check if record exists
+DECLARE @record_exists bit = 0;
+-- Add existence check logic here
+
+-- Perform update with optimistic concurrency
+BEGIN TRY
+    EXEC {schema_name}.{object_name}{arguments:params}
+
+    IF @@ROWCOUNT = 0
+        RAISERROR('No records were updated. Record may not exist or may have been modified by another user.', 16, 1);
+    ELSE
+        PRINT 'Record updated successfully';
+
+END TRY
+BEGIN CATCH
+    PRINT 'Update failed: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+DELETE_PATTERN = """\
+-- Safety checks before deletion
+IF @card_id IS NULL
+BEGIN
+    RAISERROR('Record ID required for deletion', 16, 1);
+    RETURN;
+END;
+
+-- Check for dependencies
+DECLARE @has_dependencies bit = 0;
+-- Add dependency check logic here
+
+IF @has_dependencies = 1
+BEGIN
+    RAISERROR('Cannot delete record with existing dependencies', 16, 1);
+    RETURN;
+END;
+
+-- Perform soft delete (preferred) or hard delete
+BEGIN TRY
+    EXEC {schema_name}.{object_name}
+        @id = @card_id,
+        @deleted_by = @user_id;
+
+    IF @@ROWCOUNT = 0
+        PRINT 'No record found to delete';
+    ELSE
+        PRINT 'Record deleted successfully';
+
+END TRY
+BEGIN CATCH
+    PRINT 'Deletion failed: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+ERROR_HANDLING = """\
+-- Comprehensive error handling example for {object_name}
+
+-- Error handling variables
+DECLARE @error_number int;
+DECLARE @error_message nvarchar(4000);
+DECLARE @error_severity int;
+DECLARE @error_state int;
+
+{% if declarations %}
+-- Procedure parameters
+{declarations:block}
+
+{% endif %}
+-- Main execution with comprehensive error handling
+BEGIN TRY
+    -- Pre-execution validation
+    IF @user_id IS NULL
+        THROW 50001, 'User context is required', 1;
+
+    -- Execute the procedure
+    EXEC {schema_name}.{object_name}{arguments:params}
+
+    -- Success handling
+    PRINT 'Operation completed successfully';
+
+END TRY
+BEGIN CATCH
+    -- Capture error details
+    SELECT
+        @error_number = ERROR_NUMBER(),
+        @error_message = ERROR_MESSAGE(),
+        @error_severity = ERROR_SEVERITY(),
+        @error_state = ERROR_STATE();
+
+    -- Log the error (if logging procedure exists)
+    -- EXEC sp_sys_log_error @error_message, @error_number;
+
+    -- Handle different types of errors
+    IF @error_number = 2 -- File not found
+        PRINT 'Resource not found: ' + @error_message;
+    ELSE IF @error_number BETWEEN 50000 AND 59999 -- Custom errors
+        PRINT 'Business logic error: ' + @error_message;
+    ELSE
+        PRINT 'System error occurred: ' + @error_message;
+
+    -- Re-throw the error for upstream handling
+    THROW;
+END CATCH;
+"""
+
+MULTI_PROCEDURE = """\
+-- Multi-procedure workflow using {procedure_count} related procedures
+-- Procedures: {procedure_list}
+
+-- Common context and workflow variables
+DECLARE @user_id int = @user_id; -- From context
+DECLARE @card_id int = @card_id; -- From context
+DECLARE @workflow_success bit = 1;
+DECLARE @step_result int;
+
+-- Begin transaction for data consistency
+BEGIN TRANSACTION;
+
+BEGIN TRY
+{% for step in steps %}
+
+    -- Step {step.number}: {step.object_name}
+    EXEC {step.procedure}{step.arguments:params}
+
+    -- Verify step {step.number} success
+    IF @@ROWCOUNT = 0
+    BEGIN
+        SET @workflow_success = 0;
+        RAISERROR('Step {step.number} failed - no rows affected', 16, 1);
+    END;
+{% endfor %}
+
+    -- All steps completed successfully
+    COMMIT TRANSACTION;
+    PRINT 'Multi-procedure workflow completed successfully';
+
+END TRY
+BEGIN CATCH
+    -- Rollback on any error
+    IF @@TRANCOUNT > 0
+        ROLLBACK TRANSACTION;
+
+    PRINT 'Workflow failed: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+CONDITIONAL_WORKFLOW = """\
+-- Advanced conditional workflow with multiple decision points
+
+-- Workflow parameters
+DECLARE @user_role nvarchar(50) = 'Admin'; -- From user context
+DECLARE @operation_type nvarchar(50) = @operation_type;
+DECLARE @data_size int = 100;
+DECLARE @batch_mode bit = 0;
+
+-- Determine workflow path based on conditions
+IF @user_role = 'Admin' AND @data_size > 1000
+BEGIN
+    PRINT 'Admin bulk operation detected - using optimized path';
+    SET @batch_mode = 1;
+END
+ELSE IF @user_role IN ('Manager', 'Supervisor')
+BEGIN
+    PRINT 'Manager operation - standard validation path';
+    -- Add manager-specific validation
+END
+ELSE
+BEGIN
+    PRINT 'Standard user operation - full validation required';
+    -- Add comprehensive validation
+END;
+
+-- Execute based on determined path
+IF @batch_mode = 1
+BEGIN
+    -- Batch processing logic
+    PRINT 'Executing batch workflow';
+END
+ELSE
+BEGIN
+    -- Individual processing logic
+    PRINT 'Executing individual item workflow';
+END;
+"""
+
+BATCH_PROCESSING = """\
+-- Batch processing pattern with cursor and error handling
+
+-- Batch configuration
+DECLARE @batch_size int = 100;
+DECLARE @total_processed int = 0;
+DECLARE @error_count int = 0;
+DECLARE @current_batch_start int = 1;
+
+-- Temporary table for batch items
+CREATE TABLE #batch_items (
+    id int IDENTITY(1,1),
+    item_id int,
+    item_data nvarchar(255),
+    processed bit DEFAULT 0,
+    error_message nvarchar(1000) NULL
+);
+
+-- Populate batch items (example data)
+INSERT INTO #batch_items (item_id, item_data)
+SELECT id, 'Sample data ' + CAST(id AS nvarchar)
+FROM (VALUES (1),(2),(3),(4),(5)) AS v(id);
+
+-- Process batches
+WHILE EXISTS (SELECT 1 FROM #batch_items WHERE processed = 0)
+BEGIN
+    DECLARE @current_item_id int;
+    DECLARE @current_item_data nvarchar(255);
+
+    -- Get next unprocessed item
+    SELECT TOP 1 @current_item_id = item_id, @current_item_data = item_data
+    FROM #batch_items
+    WHERE processed = 0
+    ORDER BY id;
+
+    BEGIN TRY
+        -- Process individual item
+        -- EXEC dbo.sp_process_item @current_item_id, @current_item_data;
+
+        -- Mark as processed
+        UPDATE #batch_items SET processed = 1
+        WHERE item_id = @current_item_id;
+
+        SET @total_processed = @total_processed + 1;
+    END TRY
+    BEGIN CATCH
+        -- Log error and continue
+        UPDATE #batch_items
+        SET processed = 1, error_message = ERROR_MESSAGE()
+        WHERE item_id = @current_item_id;
+
+        SET @error_count = @error_count + 1;
+    END CATCH;
+END;
+
+-- Report results
+PRINT 'Batch processing completed';
+PRINT 'Total processed: ' + CAST(@total_processed AS nvarchar);
+PRINT 'Errors encountered: ' + CAST(@error_count AS nvarchar);
+
+-- Cleanup
+DROP TABLE #batch_items;
+"""
+
+TRANSACTION_MANAGEMENT = """\
+-- Advanced transaction management with savepoints
+
+-- Transaction variables
+DECLARE @savepoint_name nvarchar(50) = 'step_savepoint';
+DECLARE @transaction_started bit = 0;
+
+-- Start main transaction
+BEGIN TRANSACTION main_transaction;
+SET @transaction_started = 1;
+
+BEGIN TRY
+    -- Step 1: Primary operation
+    PRINT 'Executing step 1 - Primary operation';
+    -- EXEC dbo.sp_primary_operation @param1, @param2;
+
+    -- Create savepoint before risky operation
+    SAVE TRANSACTION step1_savepoint;
+
+    -- Step 2: Risky operation that might fail
+    PRINT 'Executing step 2 - Risky operation';
+    BEGIN TRY
+        -- EXEC dbo.sp_risky_operation @param3, @param4;
+
+        -- If successful, continue to step 3
+        PRINT 'Step 2 completed successfully';
+    END TRY
+    BEGIN CATCH
+        PRINT 'Step 2 failed, rolling back to savepoint';
+        ROLLBACK TRANSACTION step1_savepoint;
+
+        -- Continue with alternative step
+        PRINT 'Executing alternative step 2';
+        -- EXEC dbo.sp_alternative_operation @param3, @param4;
+    END CATCH;
+
+    -- Step 3: Finalization
+    PRINT 'Executing step 3 - Finalization';
+    -- EXEC dbo.sp_finalize_operation @result_param;
+
+    -- All steps completed successfully
+    COMMIT TRANSACTION main_transaction;
+    SET @transaction_started = 0;
+    PRINT 'All operations committed successfully';
+
+END TRY
+BEGIN CATCH
+    -- Handle major failure
+    IF @transaction_started = 1 AND @@TRANCOUNT > 0
+    BEGIN
+        ROLLBACK TRANSACTION main_transaction;
+        PRINT 'Transaction rolled back due to error: ' + ERROR_MESSAGE();
+    END;
+
+    THROW;
+END CATCH;
+"""
+
+DYNAMIC_EXECUTION = """\
+-- Dynamic execution pattern with SQL generation
+
+-- Dynamic execution parameters
+DECLARE @table_name nvarchar(128) = 'users';
+DECLARE @filter_column nvarchar(128) = 'status';
+DECLARE @filter_value nvarchar(255) = 'active';
+DECLARE @operation_type nvarchar(50) = 'select';
+DECLARE @dynamic_sql nvarchar(max);
+DECLARE @param_definition nvarchar(500);
+
+-- Validate inputs to prevent SQL injection
+IF @table_name NOT IN ('users', 'products', 'orders')
+BEGIN
+    RAISERROR('Invalid table name specified', 16, 1);
+    RETURN;
+END;
+
+IF @filter_column NOT IN ('status', 'type', 'category')
+BEGIN
+    RAISERROR('Invalid filter column specified', 16, 1);
+    RETURN;
+END;
+
+-- Build dynamic SQL based on operation type
+IF @operation_type = 'select'
+BEGIN
+    SET @dynamic_sql = N'SELECT * FROM ' + QUOTENAME(@table_name) +
+                       N' WHERE ' + QUOTENAME(@filter_column) + N' = @filter_value_param';
+    SET @param_definition = N'@filter_value_param nvarchar(255)';
+END
+ELSE IF @operation_type = 'count'
+BEGIN
+    SET @dynamic_sql = N'SELECT COUNT(*) as record_count FROM ' + QUOTENAME(@table_name) +
+                       N' WHERE ' + QUOTENAME(@filter_column) + N' = @filter_value_param';
+    SET @param_definition = N'@filter_value_param nvarchar(255)';
+END
+ELSE
+BEGIN
+    RAISERROR('Unsupported operation type', 16, 1);
+    RETURN;
+END;
+
+-- Execute dynamic SQL safely
+BEGIN TRY
+    PRINT 'Executing: ' + @dynamic_sql;
+    PRINT 'Parameters: @filter_value_param = ' + @filter_value;
+
+    EXEC sp_executesql
+        @dynamic_sql,
+        @param_definition,
+        @filter_value_param = @filter_value;
+
+    PRINT 'Dynamic execution completed successfully';
+END TRY
+BEGIN CATCH
+    PRINT 'Dynamic execution failed: ' + ERROR_MESSAGE();
+    THROW;
+END CATCH;
+"""
+
+SCRIPT_SHAPES = {
+    "simple": SIMPLE,
+    "validation": VALIDATION,
+    "crud": CRUD_HEADER,
+    "create_pattern": CREATE_PATTERN,
+    "read_pattern": READ_PATTERN,
+    "update_pattern": UPDATE_PATTERN,
+    "delete_pattern": DELETE_PATTERN,
+    "crud_create": CRUD_HEADER + CREATE_PATTERN,
+    "crud_read": CRUD_HEADER + READ_PATTERN,
+    "crud_update": CRUD_HEADER + UPDATE_PATTERN,
+    "crud_delete": CRUD_HEADER + DELETE_PATTERN,
+    "error_handling": ERROR_HANDLING,
+    "multi_procedure": MULTI_PROCEDURE,
+    "conditional_workflow": CONDITIONAL_WORKFLOW,
+    "batch_processing": BATCH_PROCESSING,
+    "transaction_management": TRANSACTION_MANAGEMENT,
+    "dynamic_execution": DYNAMIC_EXECUTION
+}
+
+# Compiled once at import
+SCRIPT_TEMPLATES: Dict[str, ScriptTemplate] = {
+    name: compile_template(text, name) for name, text in SCRIPT_SHAPES.items()
+}
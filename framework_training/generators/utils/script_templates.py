@@ -0,0 +1,205 @@
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+import re
+
+INDENT = "    "
+
+# {name}, {name.key}, {name:block}, {name:params}, {name:args}; {{ and }} are literal braces
+_TOKEN = re.compile(r"\{\{|\}\}|\{(\w+(?:\.\w+)*)(?::(\w+))?\}")
+_DIRECTIVE = re.compile(r"^\s*\{%\s*(.*?)\s*%\}\s*$")
+_FOR = re.compile(r"^for\s+(\w+)\s+in\s+(\w+(?:\.\w+)*)$")
+_IF = re.compile(r"^if\s+(not\s+)?(\w+(?:\.\w+)*)$")
+SLOT_KINDS = ("block", "params", "args")
+
+
+class TemplateSyntaxError(ValueError):
+    """Raised when a script template cannot be compiled."""
+
+
+class ScriptTemplate:
+    """
+    A script shape compiled once into a Python render function.
+
+    Template lines are emitted as written (indentation included) and joined with
+    newlines; one trailing newline of the source is ignored. Slots:
+
+    - {name} / {name.key}: inline value
+    - {name:block}: alone on its line; a list of lines, each indented like the slot,
+      and the line disappears when the list is empty
+    - {name:params}: ends a line; a list of 'name = value' assignments written on
+      the next line one INDENT deeper and closed with ';' (';' ends the line when empty)
+    - {name:args}: like params but on the same line after a space
+
+    Whole-line directives: {% if name %}, {% if not name %}, {% else %}, {% endif %},
+    {% for item in name %}, {% endfor %}.
+    """
+
+    def __init__(self, text: str, name: str = "template"):
+        self.name = name
+        self.text = text
+        self.source = _TemplateCompiler(text, name).compile()
+        namespace: Dict = {}
+        exec(compile(self.source, f"<script template {name}>", "exec"), namespace)
+        self._render: Callable[[Mapping], List[str]] = namespace["render"]
+
+    def render(self, context: Optional[Mapping] = None) -> str:
+        return "\n".join(self._render(context or {}))
+
+    def render_lines(self, context: Optional[Mapping] = None) -> List[str]:
+        return "\n".join(self._render(context or {})).split("\n")
+
+    def render_many(self, contexts: Iterable[Mapping]) -> List[str]:
+        """Render one script per context (e.g. one per procedure) in a single pass."""
+        render = self._render
+        return ["\n".join(render(context)) for context in contexts]
+
+    def __repr__(self) -> str:
+        return f"ScriptTemplate({self.name!r})"
+
+
+def compile_template(text: str, name: str = "template") -> ScriptTemplate:
+    return ScriptTemplate(text, name)
+
+
+class _TemplateCompiler:
+    """Translates template text into the source of a render(ctx) -> list of lines function."""
+
+    def __init__(self, text: str, name: str):
+        self.name = name
+        self.lines = (text[:-1] if text.endswith("\n") else text).split("\n")
+        self.code: List[str] = []
+        self.depth = 1
+        self.loop_vars: List[str] = []
+        self.blocks: List[str] = []
+        self.pending: List[str] = []  # consecutive literal lines, emitted as one string
+        self.counter = 0
+
+    def compile(self) -> str:
+        self.code = ["def render(ctx):", f"{INDENT}out = []", f"{INDENT}append = out.append",
+                     f"{INDENT}extend = out.extend"]
+        for line_number, line in enumerate(self.lines, 1):
+            directive = _DIRECTIVE.match(line)
+            if directive:
+                self._flush()
+                self._directive(directive.group(1), line_number)
+            else:
+                self._line(line, line_number)
+        self._flush()
+        if self.blocks:
+            raise TemplateSyntaxError(f"{self.name}: unclosed {{% {self.blocks[-1]} %}}")
+        self.code.append(f"{INDENT}return out")
+        return "\n".join(self.code) + "\n"
+
+    def _emit(self, statement: str) -> None:
+        self.code.append(INDENT * self.depth + statement)
+
+    def _flush(self) -> None:
+        if self.pending:
+            self._emit(f"append({chr(10).join(self.pending)!r})")
+            self.pending = []
+
+    def _name(self) -> str:
+        self.counter += 1
+        return f"v{self.counter}"
+
+    def _expression(self, dotted: str) -> str:
+        head, *keys = dotted.split(".")
+        expression = f"l_{head}" if head in self.loop_vars else f"ctx[{head!r}]"
+        return expression + "".join(f"[{key!r}]" for key in keys)
+
+    def _directive(self, body: str, line_number: int) -> None:
+        where = f"{self.name}:{line_number}"
+        match_for, match_if = _FOR.match(body), _IF.match(body)
+        if match_for:
+            variable, source = match_for.groups()
+            self._emit(f"for l_{variable} in {self._expression(source)}:")
+            self.loop_vars.append(variable)
+            self.blocks.append("for")
+            self.depth += 1
+        elif match_if:
+            negate, source = match_if.groups()
+            self._emit(f"if {'not ' if negate else ''}{self._expression(source)}:")
+            self.blocks.append("if")
+            self.depth += 1
+        elif body == "else":
+            if not self.blocks or self.blocks[-1] != "if":
+                raise TemplateSyntaxError(f"{where}: else outside if")
+            # An empty if-branch still needs a statement
+            if self.code[-1].rstrip().endswith(":"):
+                self._emit("pass")
+            self.depth -= 1
+            self._emit("else:")
+            self.depth += 1
+        elif body in ("endif", "endfor"):
+            expected = body[3:]
+            if not self.blocks or self.blocks[-1] != expected:
+                raise TemplateSyntaxError(f"{where}: unexpected {body}")
+            if self.code[-1].rstrip().endswith(":"):
+                self._emit("pass")
+            self.blocks.pop()
+            if expected == "for":
+                self.loop_vars.pop()
+            self.depth -= 1
+        else:
+            raise TemplateSyntaxError(f"{where}: unknown directive {{% {body} %}}")
+
+    def _line(self, line: str, line_number: int) -> None:
+        where = f"{self.name}:{line_number}"
+        parts = []  # literal strings and (dotted, kind) slots
+        position = 0
+        for token in _TOKEN.finditer(line):
+            parts.append(line[position:token.start()])
+            if token.group(0) in ("{{", "}}"):
+                parts.append(token.group(0)[0])
+            else:
+                dotted, kind = token.groups()
+                if kind is not None and kind not in SLOT_KINDS:
+                    raise TemplateSyntaxError(f"{where}: unknown slot kind '{kind}'")
+                parts.append((dotted, kind))
+            position = token.end()
+        parts.append(line[position:])
+        parts = [part for part in parts if part != ""]
+        slots = [part for part in parts if isinstance(part, tuple)]
+        if not slots:
+            self.pending.append("".join(parts))
+            return
+        self._flush()
+
+        kinds = [kind for _, kind in slots if kind]
+        if kinds and (len(kinds) > 1 or not isinstance(parts[-1], tuple) or parts[-1][1] is None):
+            raise TemplateSyntaxError(f"{where}: block/params/args slots must end the line and appear once")
+        if kinds and kinds[0] == "block":
+            if len(parts) > 2 or (len(parts) == 2 and parts[0].strip()):
+                raise TemplateSyntaxError(f"{where}: a block slot must be alone on its line")
+            indent = parts[0] if len(parts) == 2 else ""
+            source = self._expression(parts[-1][0])
+            self._emit(f"extend([{indent!r} + line for line in {source}])" if indent else f"extend({source})")
+            return
+
+        list_slot = parts.pop() if kinds else None
+        prefix = self._fstring(parts)
+        if list_slot is None:
+            self._emit(f"append({prefix})")
+            return
+        items = self._name()
+        self._emit(f"{items} = {self._expression(list_slot[0])}")
+        if list_slot[1] == "args":
+            self._emit(f"append({prefix} + (' ' + ', '.join({items}) if {items} else '') + ';')")
+            return
+        continuation = line[:len(line) - len(line.lstrip())] + INDENT
+        self._emit(f"if {items}:")
+        self._emit(f"{INDENT}append({prefix})")
+        self._emit(f"{INDENT}append({continuation!r} + ', '.join({items}) + ';')")
+        self._emit("else:")
+        self._emit(f"{INDENT}append({prefix} + ';')")
+
+    def _fstring(self, parts: List) -> str:
+        """f-string for literal text plus inline slots (slot values bound to locals first)."""
+        text = []
+        for part in parts:
+            if isinstance(part, tuple):
+                local = self._name()
+                self._emit(f"{local} = {self._expression(part[0])}")
+                text.append("{" + local + "}")
+            else:
+                text.append(part.replace("{", "{{").replace("}", "}}"))
+        return "f" + repr("".join(text))
@@ -0,0 +1,193 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import re
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+DEFAULT_MAX_TOKENS = 2048
+DEFAULT_BUFFER_SIZE = 1000
+CALIBRATION_SAMPLES = 200
+
+# Letter runs, digit runs, single symbols and whitespace runs
+_PIECES = re.compile(r"[A-Za-z]+|\d+|\s+|[^\sA-Za-z\d]")
+
+
+def raw_token_estimate(text: str) -> int:
+    """
+    Byte-pair-like token count without a vocabulary: a letter run is one token per
+    started 4 characters after the first, digits group by 3, every symbol is one
+    token, a single space joins the following word and other whitespace runs are one.
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        first = piece[0]
+        if first.isalpha():
+            tokens += 1 + (len(piece) - 1) // 4
+        elif first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif first.isspace():
+            tokens += 0 if piece == " " else 1
+        else:
+            tokens += 1
+    return tokens
+
+
+def default_token_counter() -> Optional[Callable[[str], int]]:
+    """Exact counter used for calibration: tiktoken's cl100k_base when installed."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # The encoding is downloaded on first use; offline, stay uncalibrated
+        return None
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenEstimator:
+    """
+    raw_token_estimate() times a scale. calibrate() sets the scale once from a sample,
+    as the ratio of exact to estimated tokens, when an exact counter is available.
+    """
+
+    def __init__(self, scale: float = 1.0, counter: Optional[Callable[[str], int]] = None):
+        self.scale = scale
+        self.counter = counter
+        self.calibrated = False
+
+    def estimate(self, text: str) -> int:
+        return max(1, round(raw_token_estimate(text) * self.scale))
+
+    def calibrate(self, texts: Iterable[str]) -> bool:
+        """Fit the scale on texts; only the first call with a counter has an effect."""
+        if self.calibrated or self.counter is None:
+            return False
+        texts = list(texts)
+        estimated = sum(raw_token_estimate(text) for text in texts)
+        if not estimated:
+            return False
+        self.scale = sum(self.counter(text) for text in texts) / estimated
+        self.calibrated = True
+        return True
+
+
+def example_text(record: Dict) -> str:
+    """The text a fine-tuning job sees for one example: learning objectives, then the script."""
+    return "\n".join(record.get("learning_objectives") or []) + "\n" + record.get("example_script", "")
+
+
+class SequencePacker:
+    """
+    Packs examples into sequences of at most max_tokens (estimated) with first-fit
+    decreasing over a buffer of buffer_size examples. When the buffer is full it is
+    packed and every sequence except the emptiest is emitted; the emptiest one's
+    examples stay buffered to be combined with the next ones. Examples longer than
+    max_tokens get a sequence of their own and are counted as oversized, apart from
+    the fill statistics.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 estimator: Optional[TokenEstimator] = None, separator_tokens: int = 1,
+                 text_of: Callable[[Dict], str] = example_text):
+        if max_tokens <= 0 or buffer_size <= 0:
+            raise ValueError("max_tokens and buffer_size must be positive")
+        self.max_tokens = max_tokens
+        self.buffer_size = buffer_size
+        self.estimator = estimator or TokenEstimator(counter=default_token_counter())
+        self.separator_tokens = separator_tokens
+        self.text_of = text_of
+        self.buffer: List = []  # (tokens, arrival, record)
+        self.arrivals = 0
+        self.sequences = 0
+        self.examples = 0
+        self.tokens = 0
+        self.oversized = 0
+        # Oversized sequences are kept out of tokens/padding; their tokens beyond max_tokens are truncated
+        self.oversized_tokens = 0
+        self.truncated_tokens = 0
+
+    def add(self, record: Dict) -> List[Dict]:
+        """Buffer one example; returns the sequences completed by it (usually none)."""
+        self.buffer.append((self._tokens(record), self.arrivals, record))
+        self.arrivals += 1
+        if len(self.buffer) < self.buffer_size:
+            return []
+        return self._pack(final=False)
+
+    def flush(self) -> List[Dict]:
+        """Pack and emit everything still buffered."""
+        return self._pack(final=True) if self.buffer else []
+
+    def pack(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            yield from self.add(record)
+        yield from self.flush()
+
+    def _calibrate(self) -> None:
+        """Calibrate on the first buffer, then redo its estimates with the fitted scale."""
+        sample = [self.text_of(record) for _, _, record in self.buffer[:CALIBRATION_SAMPLES]]
+        if self.estimator.calibrate(sample):
+            self.buffer = [(self._tokens(record), arrival, record) for _, arrival, record in self.buffer]
+
+    def _tokens(self, record: Dict) -> int:
+        return self.estimator.estimate(self.text_of(record)) + self.separator_tokens
+
+    def _pack(self, final: bool) -> List[Dict]:
+        if not self.estimator.calibrated:
+            self._calibrate()
+        bins: List[List] = []  # [free tokens, entries]
+        for entry in sorted(self.buffer, key=lambda entry: (-entry[0], entry[1])):
+            for packed in bins:
+                if entry[0] <= packed[0]:
+                    packed[0] -= entry[0]
+                    packed[1].append(entry)
+                    break
+            else:
+                bins.append([self.max_tokens - entry[0], [entry]])
+        self.buffer = []
+        if not final and len(bins) > 1:
+            emptiest = max(range(len(bins)), key=lambda index: bins[index][0])
+            self.buffer = bins.pop(emptiest)[1]
+        # Emit in order of each sequence's earliest example so output order stays stable
+        bins.sort(key=lambda packed: min(entry[1] for entry in packed[1]))
+        return [self._sequence(entries) for _, entries in bins]
+
+    def _sequence(self, entries: List) -> Dict:
+        entries = sorted(entries, key=lambda entry: entry[1])
+        tokens = sum(entry[0] for entry in entries)
+        self.sequences += 1
+        self.examples += len(entries)
+        if tokens > self.max_tokens:
+            self.oversized += 1
+            self.oversized_tokens += tokens
+            self.truncated_tokens += tokens - self.max_tokens
+        else:
+            self.tokens += tokens
+        return {
+            "sequence_id": f"sequence_{self.sequences}",
+            "token_estimate": tokens,
+            "padding_tokens": max(0, self.max_tokens - tokens),
+            "examples": [entry[2] for entry in entries]
+        }
+
+    def summary(self) -> Dict:
+        """Token and padding figures cover only sequences that fit; oversized ones are listed apart."""
+        capacity = (self.sequences - self.oversized) * self.max_tokens
+        return {
+            "max_tokens": self.max_tokens,
+            "buffer_size": self.buffer_size,
+            "token_scale": round(self.estimator.scale, 4),
+            "calibrated": self.estimator.calibrated,
+            "sequences": self.sequences,
+            "examples": self.examples,
+            "examples_per_sequence": round(self.examples / self.sequences, 2) if self.sequences else 0.0,
+            "estimated_tokens": self.tokens,
+            "padding_tokens": capacity - self.tokens,
+            "padding_efficiency": round(self.tokens / capacity, 4) if capacity else 0.0,
+            "oversized_examples": self.oversized,
+            "oversized_tokens": self.oversized_tokens,
+            "truncated_tokens": self.truncated_tokens
+        }
@@ -1,136 +1,409 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from functools import lru_cache
+import math
 import random
+import re
 import string
 
+# SQL type -> family used to pick a value provider
+TYPE_FAMILIES = {
+    "tinyint": "integer", "smallint": "integer", "int": "integer", "bigint": "integer",
+    "decimal": "decimal", "numeric": "decimal", "money": "decimal", "smallmoney": "decimal",
+    "float": "decimal", "real": "decimal",
+    "bit": "bit",
+    "date": "date", "time": "time",
+    "datetime": "datetime", "datetime2": "datetime", "smalldatetime": "datetime", "datetimeoffset": "datetime",
+    "char": "string", "varchar": "string", "text": "string",
+    "nchar": "string", "nvarchar": "string", "ntext": "string", "sysname": "string", "xml": "string",
+    "binary": "binary", "varbinary": "binary", "image": "binary",
+    "uniqueidentifier": "guid"
+}
+NUMERIC_FAMILIES = ("integer", "decimal")
+INTEGER_RANGES = {"tinyint": (1, 255), "smallint": (1, 100), "int": (1, 1000), "bigint": (1, 1000000)}
+# What the integer types can hold; every literal is clamped to these
+INTEGER_LIMITS = {"tinyint": (0, 255), "smallint": (-2 ** 15, 2 ** 15 - 1), "int": (-2 ** 31, 2 ** 31 - 1),
+                  "bigint": (-2 ** 63, 2 ** 63 - 1)}
+DEFAULT_DECIMAL_PRECISION = 18
+DEFAULT_SQL_TYPE = "nvarchar"
+_TYPE_PATTERN = re.compile(r"^\s*(\w+)\s*(?:\(\s*(max|\d+)\s*(?:,\s*(\d+)\s*)?\))?", re.IGNORECASE)
+_ALPHANUMERIC = string.ascii_letters + string.digits
 
-def generate_sample_value(param_name: str, param_type: str) -> str:
-    """Generate realistic sample values based on parameter name and type."""
-    # Base types
-    base_types = {
-        'int': random.randint(1, 1000),
-        'bigint': random.randint(1, 1000000),
-        'smallint': random.randint(1, 100),
-        'tinyint': random.randint(1, 255),
-        'bit': random.choice([0, 1]),
-        'decimal': round(random.uniform(1, 1000), 2),
-        'numeric': round(random.uniform(1, 1000), 2),
-        'float': round(random.uniform(1, 1000), 2),
-        'real': round(random.uniform(1, 1000), 2),
-        'money': round(random.uniform(1, 1000), 2),
-        'smallmoney': round(random.uniform(1, 1000), 2),
-        'date': random_date(),
-        'datetime': random_datetime(),
-        'datetime2': random_datetime(),
-        'datetimeoffset': random_datetime(),
-        'smalldatetime': random_datetime(),
-        'time': random_time()
-    }
-    
-    # Generate value based on type
-    if param_type.lower() in base_types:
-        return str(base_types[param_type.lower()])
-    
-    # Handle string types
-    if 'char' in param_type.lower() or 'varchar' in param_type.lower():
-        return generate_string_value(param_name)
-    
-    if 'nchar' in param_type.lower() or 'nvarchar' in param_type.lower():
-        return generate_unicode_string(param_name)
-    
-    if 'binary' in param_type.lower() or 'varbinary' in param_type.lower():
-        return generate_binary_value()
-    
-    # Handle special cases based on parameter name
-    if 'id' in param_name.lower():
-        return str(random.randint(1, 1000))
-    
-    if 'name' in param_name.lower():
-        return generate_name()
-    
-    if 'email' in param_name.lower():
-        return generate_email()
-    
-    if 'address' in param_name.lower():
-        return generate_address()
-    
-    if 'phone' in param_name.lower():
-        return generate_phone_number()
-    
-    # Default to string if all else fails
-    return generate_string_value(param_name)
-
-
-def random_date() -> str:
-    """Generate a random date."""
-    year = random.randint(2000, 2025)
-    month = random.randint(1, 12)
-    day = random.randint(1, 28)  # Safe to avoid month-specific days
-    return f"{year}-{month:02d}-{day:02d}"
-
-
-def random_datetime() -> str:
-    """Generate a random datetime."""
-    year = random.randint(2000, 2025)
-    month = random.randint(1, 12)
-    day = random.randint(1, 28)
-    hour = random.randint(0, 23)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
-    return f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
-
-
-def random_time() -> str:
-    """Generate a random time."""
-    hour = random.randint(0, 23)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
-    return f"{hour:02d}:{minute:02d}:{second:02d}"
-
-
-def generate_string_value(param_name: str) -> str:
-    """Generate a generic string value."""
-    length = random.randint(5, 20)
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-
-
-def generate_unicode_string(param_name: str) -> str:
-    """Generate a unicode string value."""
-    length = random.randint(5, 20)
-    return ''.join(random.choices(string.ascii_letters + string.digits + 'äöüß', k=length))
-
-
-def generate_binary_value() -> str:
-    """Generate a binary value."""
-    length = random.randint(1, 16)
-    return '0x' + ''.join(random.choices('0123456789ABCDEF', k=length*2))
-
-
-def generate_name() -> str:
-    """Generate a realistic name."""
-    first_names = ['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'Sarah', 'Mike', 'Emily']
-    last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Taylor', 'Anderson']
-    return f"{random.choice(first_names)} {random.choice(last_names)}"
-
-
-def generate_email() -> str:
-    """Generate a realistic email address."""
-    domains = ['example.com', 'company.com', 'mail.com', 'gmail.com']
-    return f"{generate_string_value('email')}@{random.choice(domains)}"
-
-
-def generate_address() -> str:
-    """Generate a realistic address."""
-    street_names = ['Main St', 'Park Ave', 'Oak St', 'Maple Ave', 'Elm St']
-    cities = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix']
-    states = ['NY', 'CA', 'IL', 'TX', 'AZ']
-    
-    street_number = random.randint(1, 9999)
-    return f"{street_number} {random.choice(street_names)}, {random.choice(cities)}, {random.choice(states)}"
-
-
-def generate_phone_number() -> str:
-    """Generate a realistic phone number."""
-    area_code = random.randint(200, 999)
-    first_part = random.randint(200, 999)
-    second_part = random.randint(1000, 9999)
-    return f"({area_code}) {first_part}-{second_part}"
+
+class SqlType(NamedTuple):
+    """Parsed SQL type: 'decimal(10,2)' -> base 'decimal', length/precision 10, scale 2."""
+    base: str
+    family: str
+    length: Optional[int] = None  # characters/bytes or precision; None for max or unspecified
+    scale: Optional[int] = None
+    is_unicode: bool = False
+
+
+@lru_cache(maxsize=1024)
+def parse_sql_type(type_text: Optional[str]) -> SqlType:
+    """Parse a declared SQL type ('nvarchar(255)', 'decimal(10,2)', 'int'); None means nvarchar."""
+    match = _TYPE_PATTERN.match(type_text or DEFAULT_SQL_TYPE)
+    if not match:
+        return SqlType(DEFAULT_SQL_TYPE, "string", is_unicode=True)
+    base, size, scale = match.group(1).lower(), match.group(2), match.group(3)
+    return SqlType(
+        base=base,
+        family=TYPE_FAMILIES.get(base, "other"),
+        length=int(size) if size and size.isdigit() else None,
+        scale=int(scale) if scale else None,
+        is_unicode=base in ("nchar", "nvarchar", "ntext", "sysname")
+    )
+
+
+def numeric_bounds(sql_type: SqlType) -> Optional[Tuple[float, float]]:
+    """
+    Inclusive (low, high) a numeric type can hold: the integer limits, or
+    +-(10**(precision-scale) - 10**-scale) for decimal(p,s); None for types not
+    bounded here (float, real, money).
+    """
+    if sql_type.base in INTEGER_LIMITS:
+        return INTEGER_LIMITS[sql_type.base]
+    if sql_type.base in ("decimal", "numeric"):
+        precision = sql_type.length or DEFAULT_DECIMAL_PRECISION
+        scale = sql_type.scale or 0
+        largest = round(10 ** (precision - scale) - 10 ** -scale, scale)
+        return -largest, largest
+    return None
+
+
+def clamp_range(low: float, high: float, sql_type: SqlType, integral: bool = False) -> Tuple[float, float]:
+    """Limit a draw range to the values sql_type holds (whole numbers only when integral)."""
+    bounds = numeric_bounds(sql_type)
+    if bounds is None:
+        return low, high
+    floor, ceiling = (math.ceil(bounds[0]), math.floor(bounds[1])) if integral else bounds
+    high = min(high, ceiling)
+    return min(max(low, floor), high), high
+
+
+def fit_literal(literal: str, sql_type: SqlType) -> str:
+    """A numeric literal clamped to its type ('1001' -> '255' for tinyint); anything else unchanged."""
+    bounds = numeric_bounds(sql_type) if sql_type.family in NUMERIC_FAMILIES else None
+    if bounds is None:
+        return literal
+    try:
+        value = float(literal)
+    except ValueError:
+        return literal  # expressions such as GETDATE()
+    if bounds[0] <= value <= bounds[1]:
+        return literal
+    return f"{min(max(value, bounds[0]), bounds[1]):.{sql_type.scale or 0}f}"
+
+
+class RandomStream:
+    """
+    Batched draws from either a random.Random (or the random module) or a NumPy
+    Generator; NumPy generators are detected by their integers() method and draw
+    whole batches in one vectorized call.
+    """
+
+    __slots__ = ("rng", "vectorized")
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.vectorized = hasattr(rng, "integers")
+
+    def integers(self, low: int, high: int, count: int) -> List[int]:
+        """count integers in [low, high]."""
+        if self.vectorized:
+            return self.rng.integers(low, high + 1, size=count).tolist()
+        return [self.rng.randint(low, high) for _ in range(count)]
+
+    def uniform(self, low: float, high: float, count: int) -> List[float]:
+        if self.vectorized:
+            return self.rng.uniform(low, high, size=count).tolist()
+        return [self.rng.uniform(low, high) for _ in range(count)]
+
+    def choices(self, options: Sequence, count: int) -> List:
+        if self.vectorized:
+            return [options[index] for index in self.rng.integers(0, len(options), size=count).tolist()]
+        return self.rng.choices(options, k=count)
+
+    def strings(self, alphabet: str, min_length: int, max_length: int, count: int) -> List[str]:
+        lengths = self.integers(min_length, max_length, count)
+        characters = self.choices(alphabet, sum(lengths))
+        values, position = [], 0
+        for length in lengths:
+            values.append("".join(characters[position:position + length]))
+            position += length
+        return values
+
+
+def _quote(value: str, sql_type: SqlType) -> str:
+    return f"{'N' if sql_type.is_unicode else ''}'{value}'"
+
+
+class ValueProvider:
+    """
+    Produces SQL literals for one kind of parameter. sample() is the fixed,
+    representative value used in documentation-style scripts; draw() returns
+    count random values from a RandomStream. Numeric literals always fit the
+    declared type (see fit_literal and clamp_range).
+    """
+
+    def __init__(self, canonical: str):
+        self.canonical = canonical
+
+    def sample(self, name: str, sql_type: SqlType) -> str:
+        return fit_literal(self.canonical, sql_type)
+
+    def draw(self, stream: RandomStream, count: int, name: str, sql_type: SqlType) -> List[str]:
+        return [self.sample(name, sql_type)] * count
+
+
+class ConstantProvider(ValueProvider):
+    """Always the same literal (context ids, GETDATE(), ...)."""
+
+
+class IntegerProvider(ValueProvider):
+    def __init__(self, canonical: str = "1", low: Optional[int] = None, high: Optional[int] = None):
+        super().__init__(canonical)
+        self.low, self.high = low, high
+
+    def draw(self, stream, count, name, sql_type):
+        low, high = INTEGER_RANGES.get(sql_type.base, (1, 1000))
+        low, high = clamp_range(self.low or low, self.high or high, sql_type, integral=True)
+        return [str(value) for value in stream.integers(low, high, count)]
+
+
+class DecimalProvider(ValueProvider):
+    def __init__(self, canonical: str = "1", low: float = 1, high: float = 1000):
+        super().__init__(canonical)
+        self.low, self.high = low, high
+
+    def draw(self, stream, count, name, sql_type):
+        places = sql_type.scale if sql_type.scale is not None else 2
+        low, high = clamp_range(self.low, self.high, sql_type)
+        return [f"{value:.{places}f}" for value in stream.uniform(low, high, count)]
+
+
+class NumericProvider(ValueProvider):
+    """Integer or decimal draws depending on the parameter's type family."""
+
+    def __init__(self, canonical: str = "1", integers: Optional[IntegerProvider] = None,
+                 decimals: Optional[DecimalProvider] = None):
+        super().__init__(canonical)
+        self.integers = integers or IntegerProvider(canonical)
+        self.decimals = decimals or DecimalProvider(canonical)
+
+    def draw(self, stream, count, name, sql_type):
+        provider = self.integers if sql_type.family == "integer" else self.decimals
+        return provider.draw(stream, count, name, sql_type)
+
+
+class ChoiceProvider(ValueProvider):
+    """One of a fixed list of strings; the first is the sample value."""
+
+    def __init__(self, options: Sequence[str], canonical: Optional[str] = None):
+        super().__init__(canonical or f"N'{options[0]}'")
+        self.options = list(options)
+
+    def draw(self, stream, count, name, sql_type):
+        return [f"N'{value}'" for value in stream.choices(self.options, count)]
+
+
+class BitProvider(ValueProvider):
+    def draw(self, stream, count, name, sql_type):
+        return [str(value) for value in stream.integers(0, 1, count)]
+
+
+class StringProvider(ValueProvider):
+    """Random alphanumeric text that fits the declared length."""
+
+    def __init__(self, canonical: str = "N'sample value'", min_length: int = 5, max_length: int = 20):
+        super().__init__(canonical)
+        self.min_length, self.max_length = min_length, max_length
+
+    def draw(self, stream, count, name, sql_type):
+        max_length = min(self.max_length, sql_type.length or self.max_length)
+        min_length = min(self.min_length, max_length)
+        return [_quote(value, sql_type) for value in stream.strings(_ALPHANUMERIC, min_length, max_length, count)]
+
+
+class PersonNameProvider(ValueProvider):
+    FIRST_NAMES = ['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'Sarah', 'Mike', 'Emily']
+    LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Taylor', 'Anderson']
+
+    def draw(self, stream, count, name, sql_type):
+        first, last = stream.choices(self.FIRST_NAMES, count), stream.choices(self.LAST_NAMES, count)
+        return [f"N'{given} {family}'" for given, family in zip(first, last)]
+
+
+class EmailProvider(ValueProvider):
+    DOMAINS = ['example.com', 'company.com', 'mail.com']
+
+    def draw(self, stream, count, name, sql_type):
+        users = stream.strings(string.ascii_lowercase + string.digits, 5, 12, count)
+        return [f"N'{user}@{domain}'" for user, domain in zip(users, stream.choices(self.DOMAINS, count))]
+
+
+class DateTimeProvider(ValueProvider):
+    """Random date/time literals between 2000 and 2025, shaped by the SQL type."""
+
+    def draw(self, stream, count, name, sql_type):
+        years, months, days = stream.integers(2000, 2025, count), stream.integers(1, 12, count), stream.integers(1, 28, count)
+        hours, minutes, seconds = stream.integers(0, 23, count), stream.integers(0, 59, count), stream.integers(0, 59, count)
+        values = []
+        for year, month, day, hour, minute, second in zip(years, months, days, hours, minutes, seconds):
+            if sql_type.family == "date":
+                values.append(f"'{year}-{month:02d}-{day:02d}'")
+            elif sql_type.family == "time":
+                values.append(f"'{hour:02d}:{minute:02d}:{second:02d}'")
+            else:
+                values.append(f"'{year}-{month:02d}-{day:02d}T{hour:02d}:{minute:02d}:{second:02d}'")
+        return values
+
+
+class BinaryProvider(ValueProvider):
+    def draw(self, stream, count, name, sql_type):
+        max_bytes = min(16, sql_type.length or 16)
+        values = []
+        for byte_count, digits in zip(stream.integers(1, max_bytes, count),
+                                      stream.strings("0123456789ABCDEF", 2 * max_bytes, 2 * max_bytes, count)):
+            values.append("0x" + digits[:2 * byte_count])
+        return values
+
+
+class GuidProvider(ValueProvider):
+    def draw(self, stream, count, name, sql_type):
+        values = []
+        for digits in stream.strings("0123456789ABCDEF", 32, 32, count):
+            values.append(f"'{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}'")
+        return values
+
+
+class ValueRule(NamedTuple):
+    """names: keywords, each a string or a tuple of strings that must all occur in the name."""
+    provider: ValueProvider
+    names: Tuple = ()
+    families: Tuple[str, ...] = ()
+
+    def matches(self, lower_name: str, sql_type: SqlType) -> bool:
+        name_match = any(
+            all(part in lower_name for part in keyword) if isinstance(keyword, tuple) else keyword in lower_name
+            for keyword in self.names
+        )
+        if self.names and self.families:
+            return name_match and sql_type.family in self.families
+        return name_match or sql_type.family in self.families
+
+
+class ValueProviderRegistry:
+    """
+    Typed value providers. Rules are tried in registration order (parameter-name
+    keywords and/or type families, both required when both are given); otherwise
+    the provider for the type's family, otherwise the default provider. Resolution
+    and sample values are cached per (name, type).
+    """
+
+    def __init__(self, default: Optional[ValueProvider] = None):
+        self.rules: List[ValueRule] = []
+        self.family_providers: Dict[str, ValueProvider] = {}
+        self.default = default or StringProvider()
+        self._resolved: Dict[Tuple[str, str], Tuple[ValueProvider, SqlType]] = {}
+        self._samples: Dict[Tuple[str, str], str] = {}
+
+    def register(self, provider: ValueProvider, names: Sequence = (), families: Sequence[str] = ()) -> None:
+        self.rules.append(ValueRule(provider, tuple(names), tuple(families)))
+        self._clear_caches()
+
+    def register_family(self, family: str, provider: ValueProvider) -> None:
+        self.family_providers[family] = provider
+        self._clear_caches()
+
+    def _clear_caches(self) -> None:
+        self._resolved.clear()
+        self._samples.clear()
+
+    def resolve(self, param_name: Optional[str], param_type: Optional[str]) -> Tuple[ValueProvider, SqlType]:
+        key = (param_name or "", param_type or "")
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            sql_type = parse_sql_type(param_type)
+            lower_name = key[0].lower()
+            provider = next((rule.provider for rule in self.rules if rule.matches(lower_name, sql_type)), None)
+            if provider is None:
+                provider = self.family_providers.get(sql_type.family, self.default)
+            resolved = self._resolved[key] = (provider, sql_type)
+        return resolved
+
+    def sample(self, param_name: Optional[str], param_type: Optional[str]) -> str:
+        """The fixed representative literal for a parameter."""
+        key = (param_name or "", param_type or "")
+        value = self._samples.get(key)
+        if value is None:
+            provider, sql_type = self.resolve(param_name, param_type)
+            value = self._samples[key] = provider.sample(key[0].lower(), sql_type)
+        return value
+
+    def generate(self, param_name: Optional[str], param_type: Optional[str], count: int, rng=random) -> List[str]:
+        """count random literals drawn from rng (random.Random, the random module or a NumPy Generator)."""
+        provider, sql_type = self.resolve(param_name, param_type)
+        stream = rng if isinstance(rng, RandomStream) else RandomStream(rng)
+        return provider.draw(stream, count, (param_name or "").lower(), sql_type)
+
+
+def build_default_registry(samples: Optional[Dict[str, str]] = None) -> ValueProviderRegistry:
+    """
+    The standard rules. Every name rule is restricted to the type families its
+    literal is valid for, so a keyword never overrides the declared type
+    (@timeout_ms int stays an integer, @status int is not N'active'). samples
+    overrides the representative literals keyed "number", "description", "default".
+    """
+    samples = samples or {}
+    registry = ValueProviderRegistry(default=StringProvider(samples.get("default", "N'sample value'")))
+    # Identifiers: the framework's context ids, then any other numeric id
+    registry.register(ConstantProvider("1001"), names=["user_id"], families=NUMERIC_FAMILIES)
+    registry.register(ConstantProvider("2001"), names=["card_id"], families=NUMERIC_FAMILIES)
+    registry.register(IntegerProvider("123", 1, 1000), names=["id"], families=NUMERIC_FAMILIES)
+    # Names, contact details and states
+    registry.register(PersonNameProvider("N'John Doe'"), names=[("name", "user")], families=["string"])
+    registry.register(ChoiceProvider(["document.pdf", "report.xlsx", "image.png"]), names=[("name", "file")],
+                      families=["string"])
+    registry.register(PersonNameProvider("N'Sample Name'"), names=["name"], families=["string"])
+    registry.register(EmailProvider("N'user@example.com'"), names=["email"], families=["string"])
+    registry.register(ChoiceProvider(["active", "inactive", "pending"]), names=["status"], families=["string"])
+    # Flags and dates
+    flag = BitProvider("1")
+    registry.register(flag, names=["is_"], families=["bit", "integer"])
+    registry.register(flag, families=["bit"])
+    registry.register(DateTimeProvider("GETDATE()"), families=["datetime"])
+    # Numbers
+    registry.register(DecimalProvider("99.99", 1, 1000), names=["amount", "price"], families=["decimal"])
+    registry.register(IntegerProvider("100", 1, 1000), names=["amount", "price"], families=["integer"])
+    registry.register(IntegerProvider("10", 1, 100), names=["count", "size"], families=NUMERIC_FAMILIES)
+    registry.register(NumericProvider(samples.get("number", "1")), families=NUMERIC_FAMILIES)
+    # Free text
+    registry.register(StringProvider(samples.get("description", "N'Sample description text'"), 10, 40),
+                      names=["description"], families=["string"])
+    registry.register(StringProvider("N'Sample comment'", 10, 40), names=["comment"], families=["string"])
+    registry.register(ChoiceProvider(["/path/to/resource", "/data/import", "/exports/latest"]), names=["path"],
+                      families=["string"])
+    # Types no rule claimed
+    registry.register_family("date", DateTimeProvider("CAST(GETDATE() AS date)"))
+    registry.register_family("time", DateTimeProvider("CAST(GETDATE() AS time)"))
+    registry.register_family("binary", BinaryProvider("0x00"))
+    registry.register_family("guid", GuidProvider("NEWID()"))
+    return registry
+
+
+DEFAULT_VALUE_REGISTRY = build_default_registry()
+
+
+def generate_sample_value(param_name: str, param_type: Optional[str], rng=None) -> str:
+    """
+    SQL literal for a parameter. Without rng the fixed representative value
+    (cached); with rng one random draw, so seeded generators stay reproducible.
+    """
+    if rng is None:
+        return DEFAULT_VALUE_REGISTRY.sample(param_name, param_type)
+    return DEFAULT_VALUE_REGISTRY.generate(param_name, param_type, 1, rng)[0]
+
+
+def generate_sample_values(param_name: str, param_type: Optional[str], count: int, rng=random) -> List[str]:
+    """count random SQL literals for one parameter in a single batched draw."""
+    return DEFAULT_VALUE_REGISTRY.generate(param_name, param_type, count, rng)
@@ -0,0 +1,472 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from .usage_refs import json_default
+from .serialization import write_json
+from .persistence import read_verified_json
+
+METADATA_STORE_FILE = "tsql_app_metadata.db"
+
+# Memory file name -> document key in the store
+STORE_KEYS = {
+    "discovered_schema.json": "schema",
+    "framework_api_details.json": "api",
+    "action_scripts_corpus.json": "corpus"
+}
+
+OBJECT_COLUMNS = ["schema_name", "object_name", "object_type", "object_type_short", "embedded_example", "embedded_description"]
+SCRIPT_COLUMNS = ["source_table", "action_id", "action_name", "sql_source"]
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS documents (
+    store_key TEXT PRIMARY KEY,
+    metadata_json TEXT NOT NULL,
+    extra_json TEXT
+);
+CREATE TABLE IF NOT EXISTS schema_tables (
+    table_key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    table_exists INTEGER NOT NULL,
+    columns_json TEXT NOT NULL,
+    extra_json TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    object_id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    schema_name TEXT NOT NULL,
+    object_name TEXT NOT NULL,
+    object_type TEXT,
+    object_type_short TEXT,
+    embedded_example TEXT,
+    embedded_description TEXT,
+    structured_keys TEXT NOT NULL,
+    extra_json TEXT,
+    row_hash TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_objects_name ON objects (schema_name COLLATE NOCASE, object_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS ix_objects_bare_name ON objects (object_name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS parameters (
+    object_id INTEGER NOT NULL REFERENCES objects (object_id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    name TEXT,
+    parameter_json TEXT NOT NULL,
+    PRIMARY KEY (object_id, ordinal)
+);
+CREATE INDEX IF NOT EXISTS ix_parameters_name ON parameters (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS scripts (
+    script_id INTEGER PRIMARY KEY,
+    corpus_position INTEGER,
+    source_table TEXT,
+    action_id,
+    action_name TEXT,
+    sql_source TEXT,
+    extra_json TEXT,
+    row_hash TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_scripts_ref ON scripts (source_table, action_id);
+CREATE INDEX IF NOT EXISTS ix_scripts_position ON scripts (corpus_position);
+CREATE TABLE IF NOT EXISTS usage_links (
+    object_id INTEGER NOT NULL REFERENCES objects (object_id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    script_id INTEGER NOT NULL REFERENCES scripts (script_id),
+    PRIMARY KEY (object_id, rank)
+);
+CREATE INDEX IF NOT EXISTS ix_usage_links_script ON usage_links (script_id);
+CREATE TABLE IF NOT EXISTS co_occurrence (
+    object_id INTEGER NOT NULL REFERENCES objects (object_id) ON DELETE CASCADE,
+    related_name TEXT NOT NULL,
+    occurrence_count INTEGER NOT NULL,
+    PRIMARY KEY (object_id, related_name)
+);
+CREATE INDEX IF NOT EXISTS ix_co_occurrence_related ON co_occurrence (related_name COLLATE NOCASE);
+"""
+
+
+def _row_hash(data):
+    """Content hash used to skip rewriting unchanged rows."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=json_default).encode('utf-8')).hexdigest()
+
+
+def _dumps(data):
+    return json.dumps(data, default=str, ensure_ascii=False) if data else None
+
+
+def split_object_name(name):
+    """'[dbo].[proc]', 'dbo.proc' or 'proc' -> (schema or None, name)."""
+    clean_name = name.replace('[', '').replace(']', '').strip()
+    if '.' in clean_name:
+        return tuple(clean_name.rsplit('.', 1))
+    return None, clean_name
+
+
+class MetadataStore:
+    """
+    SQLite store for the explorer's memory files (discovered schema, framework API
+    details, action script corpus). Objects, parameters, scripts, usage links and
+    co-occurrence counts live in indexed tables, so point lookups and upserts touch
+    single rows. load_into()/save_document() keep the old cache-dict API working.
+    """
+
+    def __init__(self, db_path=METADATA_STORE_FILE):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if db_path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.connection.close()
+
+    # --- Documents (compatibility view) ---
+
+    def has_document(self, store_key):
+        row = self.connection.execute("SELECT 1 FROM documents WHERE store_key = ?", (store_key,)).fetchone()
+        return row is not None
+
+    def load_document(self, store_key):
+        """Rebuild the full dict that used to live in the JSON memory file."""
+        row = self.connection.execute("SELECT metadata_json, extra_json FROM documents WHERE store_key = ?", (store_key,)).fetchone()
+        if row is None:
+            return None
+        document = {"metadata": json.loads(row["metadata_json"])}
+        if store_key == "schema":
+            document["tables"] = self.load_schema_tables()
+        elif store_key == "api":
+            document["api_objects"] = list(self.iter_objects())
+        elif store_key == "corpus":
+            document["scripts"] = list(self.iter_corpus_scripts())
+        if row["extra_json"]:
+            document.update(json.loads(row["extra_json"]))
+        return document
+
+    def load_into(self, store_key, cache_dict_ref_to_update):
+        """Fill an existing cache dict in place, like load_memory_file did."""
+        document = self.load_document(store_key)
+        if document is None:
+            return False
+        cache_dict_ref_to_update.clear()
+        cache_dict_ref_to_update.update(document)
+        return True
+
+    def save_document(self, store_key, document):
+        """Sync a full cache dict into the store; unchanged rows are left alone."""
+        body_key = {"schema": "tables", "api": "api_objects", "corpus": "scripts"}[store_key]
+        extra = {key: value for key, value in document.items() if key not in ("metadata", body_key)}
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO documents (store_key, metadata_json, extra_json) VALUES (?, ?, ?) "
+                "ON CONFLICT (store_key) DO UPDATE SET metadata_json = excluded.metadata_json, extra_json = excluded.extra_json",
+                (store_key, json.dumps(document.get("metadata", {}), default=str), _dumps(extra))
+            )
+            if store_key == "schema":
+                self._sync_schema_tables(document.get("tables", {}))
+            elif store_key == "api":
+                self._sync_objects(document.get("api_objects", []))
+            else:
+                self._sync_corpus(document.get("scripts", []))
+
+    # --- Discovered schema ---
+
+    def _sync_schema_tables(self, tables):
+        self.connection.execute("DELETE FROM schema_tables")
+        self.connection.executemany(
+            "INSERT INTO schema_tables (table_key, position, table_exists, columns_json, extra_json) VALUES (?, ?, ?, ?, ?)",
+            [(table_key, position, int(bool(info.get("exists"))), json.dumps(info.get("columns", []), default=str),
+              _dumps({k: v for k, v in info.items() if k not in ("exists", "columns")}))
+             for position, (table_key, info) in enumerate(tables.items())]
+        )
+
+    def _table_info(self, row):
+        info = {"exists": bool(row["table_exists"]), "columns": json.loads(row["columns_json"])}
+        if row["extra_json"]:
+            info.update(json.loads(row["extra_json"]))
+        return info
+
+    def load_schema_tables(self):
+        rows = self.connection.execute("SELECT * FROM schema_tables ORDER BY position")
+        return {row["table_key"]: self._table_info(row) for row in rows}
+
+    def get_table_schema(self, table_key):
+        """Cached schema for one 'schema.table' key, or None."""
+        row = self.connection.execute("SELECT * FROM schema_tables WHERE table_key = ?", (table_key,)).fetchone()
+        return self._table_info(row) if row else None
+
+    # --- Scripts ---
+
+    def upsert_script(self, script_info, corpus_position=None):
+        """Insert or update one script keyed by (source_table, action_id); returns its script_id."""
+        extra = {k: v for k, v in script_info.items() if k not in SCRIPT_COLUMNS}
+        values = [script_info.get(column) for column in SCRIPT_COLUMNS]
+        row_hash = _row_hash(script_info)
+        existing = self.connection.execute(
+            "SELECT script_id, row_hash, corpus_position FROM scripts WHERE source_table IS ? AND action_id IS ?",
+            (script_info.get("source_table"), script_info.get("action_id"))
+        ).fetchone()
+        if existing is None:
+            cursor = self.connection.execute(
+                "INSERT INTO scripts (corpus_position, source_table, action_id, action_name, sql_source, extra_json, row_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [corpus_position] + values + [_dumps(extra), row_hash]
+            )
+            return cursor.lastrowid
+        if existing["row_hash"] != row_hash:
+            self.connection.execute(
+                "UPDATE scripts SET action_name = ?, sql_source = ?, extra_json = ?, row_hash = ? WHERE script_id = ?",
+                (script_info.get("action_name"), script_info.get("sql_source"), _dumps(extra), row_hash, existing["script_id"])
+            )
+        if corpus_position is not None and existing["corpus_position"] != corpus_position:
+            self.connection.execute("UPDATE scripts SET corpus_position = ? WHERE script_id = ?", (corpus_position, existing["script_id"]))
+        return existing["script_id"]
+
+    def _sync_corpus(self, scripts):
+        self.connection.execute("UPDATE scripts SET corpus_position = NULL")
+        for position, script_info in enumerate(scripts):
+            self.upsert_script(script_info, corpus_position=position)
+        # Drop scripts that are neither in the corpus nor referenced as usage examples
+        self.connection.execute(
+            "DELETE FROM scripts WHERE corpus_position IS NULL AND script_id NOT IN (SELECT script_id FROM usage_links)"
+        )
+
+    def _script_info(self, row):
+        script_info = {column: row[column] for column in SCRIPT_COLUMNS}
+        if row["extra_json"]:
+            script_info.update(json.loads(row["extra_json"]))
+        return script_info
+
+    def iter_corpus_scripts(self):
+        rows = self.connection.execute("SELECT * FROM scripts WHERE corpus_position IS NOT NULL ORDER BY corpus_position")
+        for row in rows:
+            yield self._script_info(row)
+
+    def get_script(self, source_table, action_id):
+        """One action script by its (source_table, action_id) reference, or None."""
+        row = self.connection.execute(
+            "SELECT * FROM scripts WHERE source_table = ? AND action_id = ?", (source_table, action_id)
+        ).fetchone()
+        return self._script_info(row) if row else None
+
+    def script_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM scripts WHERE corpus_position IS NOT NULL").fetchone()[0]
+
+    # --- Framework objects ---
+
+    def upsert_object(self, obj, position=None):
+        """Insert or update one framework object with its child rows; returns its object_id."""
+        row_hash = _row_hash(obj)
+        existing = self.connection.execute(
+            "SELECT object_id, row_hash, position FROM objects WHERE schema_name = ? COLLATE NOCASE AND object_name = ? COLLATE NOCASE",
+            (obj.get("schema_name", "dbo"), obj["object_name"])
+        ).fetchone()
+        if existing is not None and existing["row_hash"] == row_hash:
+            if position is not None and existing["position"] != position:
+                self.connection.execute("UPDATE objects SET position = ? WHERE object_id = ?", (position, existing["object_id"]))
+            return existing["object_id"]
+
+        if position is None:
+            position = existing["position"] if existing else self.connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM objects").fetchone()[0]
+        structured_keys = [key for key in ("parameters", "co_occurrence_stats", "real_usage_examples") if key in obj]
+        extra = {k: v for k, v in obj.items() if k not in OBJECT_COLUMNS and k not in structured_keys}
+        values = [obj.get("schema_name", "dbo")] + [obj.get(column) for column in OBJECT_COLUMNS[1:]]
+
+        if existing is None:
+            object_id = self.connection.execute(
+                "INSERT INTO objects (position, schema_name, object_name, object_type, object_type_short, embedded_example, "
+                "embedded_description, structured_keys, extra_json, row_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [position] + values + [",".join(structured_keys), _dumps(extra), row_hash]
+            ).lastrowid
+        else:
+            object_id = existing["object_id"]
+            self.connection.execute(
+                "UPDATE objects SET position = ?, schema_name = ?, object_name = ?, object_type = ?, object_type_short = ?, "
+                "embedded_example = ?, embedded_description = ?, structured_keys = ?, extra_json = ?, row_hash = ? WHERE object_id = ?",
+                [position] + values + [",".join(structured_keys), _dumps(extra), row_hash, object_id]
+            )
+            for table in ("parameters", "usage_links", "co_occurrence"):
+                self.connection.execute(f"DELETE FROM {table} WHERE object_id = ?", (object_id,))
+
+        self.connection.executemany(
+            "INSERT INTO parameters (object_id, ordinal, name, parameter_json) VALUES (?, ?, ?, ?)",
+            [(object_id, ordinal, param.get("name"), json.dumps(param, default=str))
+             for ordinal, param in enumerate(obj.get("parameters") or [])]
+        )
+        self.connection.executemany(
+            "INSERT INTO co_occurrence (object_id, related_name, occurrence_count) VALUES (?, ?, ?)",
+            [(object_id, related_name, count) for related_name, count in (obj.get("co_occurrence_stats") or {}).items()]
+        )
+        self.connection.executemany(
+            "INSERT INTO usage_links (object_id, rank, script_id) VALUES (?, ?, ?)",
+            [(object_id, rank, self._usage_script_id(example)) for rank, example in enumerate(obj.get("real_usage_examples") or [])]
+        )
+        return object_id
+
+    def _usage_script_id(self, example):
+        """Script id for a usage example; bare references never overwrite stored script text."""
+        if "sql_source" not in example:
+            existing = self.connection.execute(
+                "SELECT script_id FROM scripts WHERE source_table IS ? AND action_id IS ?",
+                (example.get("source_table"), example.get("action_id"))
+            ).fetchone()
+            if existing is not None:
+                return existing["script_id"]
+        return self.upsert_script(example)
+
+    def _sync_objects(self, api_objects):
+        seen_ids = [self.upsert_object(obj, position) for position, obj in enumerate(api_objects)]
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS seen_objects (object_id INTEGER PRIMARY KEY)")
+        self.connection.execute("DELETE FROM seen_objects")
+        self.connection.executemany("INSERT OR IGNORE INTO seen_objects (object_id) VALUES (?)", [(i,) for i in seen_ids])
+        self.connection.execute("DELETE FROM objects WHERE object_id NOT IN (SELECT object_id FROM seen_objects)")
+        self.connection.execute(
+            "DELETE FROM scripts WHERE corpus_position IS NULL AND script_id NOT IN (SELECT script_id FROM usage_links)"
+        )
+
+    def _object_from_row(self, row):
+        object_id = row["object_id"]
+        structured_keys = row["structured_keys"].split(",") if row["structured_keys"] else []
+        obj = {column: row[column] for column in OBJECT_COLUMNS[:4]}
+        if "parameters" in structured_keys:
+            obj["parameters"] = self.get_parameters_by_id(object_id)
+        obj["embedded_example"] = row["embedded_example"]
+        obj["embedded_description"] = row["embedded_description"]
+        if "co_occurrence_stats" in structured_keys:
+            obj["co_occurrence_stats"] = {
+                r["related_name"]: r["occurrence_count"]
+                for r in self.connection.execute("SELECT related_name, occurrence_count FROM co_occurrence WHERE object_id = ? ORDER BY rowid", (object_id,))
+            }
+        if "real_usage_examples" in structured_keys:
+            obj["real_usage_examples"] = self.usage_examples_by_id(object_id)
+        if row["extra_json"]:
+            obj.update(json.loads(row["extra_json"]))
+        return obj
+
+    def _object_row(self, object_name):
+        schema_name, bare_name = split_object_name(object_name)
+        if schema_name:
+            return self.connection.execute(
+                "SELECT * FROM objects WHERE schema_name = ? COLLATE NOCASE AND object_name = ? COLLATE NOCASE", (schema_name, bare_name)
+            ).fetchone()
+        return self.connection.execute(
+            "SELECT * FROM objects WHERE object_name = ? COLLATE NOCASE ORDER BY position LIMIT 1", (bare_name,)
+        ).fetchone()
+
+    def iter_objects(self):
+        for row in self.connection.execute("SELECT * FROM objects ORDER BY position").fetchall():
+            yield self._object_from_row(row)
+
+    def get_object(self, object_name):
+        """Full API entry for 'schema.name' or a bare name, or None."""
+        row = self._object_row(object_name)
+        return self._object_from_row(row) if row else None
+
+    def find_objects(self, name_prefix):
+        """(schema_name, object_name) pairs whose name starts with the prefix (uses the name index)."""
+        escaped = name_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rows = self.connection.execute(
+            "SELECT schema_name, object_name FROM objects WHERE object_name LIKE ? ESCAPE '\\' ORDER BY position", (escaped + '%',)
+        )
+        return [(row["schema_name"], row["object_name"]) for row in rows]
+
+    def get_parameters_by_id(self, object_id):
+        rows = self.connection.execute("SELECT parameter_json FROM parameters WHERE object_id = ? ORDER BY ordinal", (object_id,))
+        return [json.loads(row["parameter_json"]) for row in rows]
+
+    def get_parameters(self, object_name):
+        row = self._object_row(object_name)
+        return self.get_parameters_by_id(row["object_id"]) if row else []
+
+    def usage_examples_by_id(self, object_id):
+        rows = self.connection.execute(
+            "SELECT s.* FROM usage_links u JOIN scripts s ON s.script_id = u.script_id WHERE u.object_id = ? ORDER BY u.rank", (object_id,)
+        )
+        return [self._script_info(row) for row in rows]
+
+    def get_usage_examples(self, object_name):
+        row = self._object_row(object_name)
+        return self.usage_examples_by_id(row["object_id"]) if row else []
+
+    def objects_using_script(self, source_table, action_id):
+        """Objects that list the script as a real usage example."""
+        rows = self.connection.execute(
+            "SELECT o.schema_name, o.object_name FROM scripts s JOIN usage_links u ON u.script_id = s.script_id "
+            "JOIN objects o ON o.object_id = u.object_id WHERE s.source_table = ? AND s.action_id = ? ORDER BY o.position",
+            (source_table, action_id)
+        )
+        return [f"{row['schema_name']}.{row['object_name']}" for row in rows]
+
+    def co_occurring(self, object_name, top_n=10):
+        """[(related_name, count)] for an object, most frequent first."""
+        row = self._object_row(object_name)
+        if row is None:
+            return []
+        rows = self.connection.execute(
+            "SELECT related_name, occurrence_count FROM co_occurrence WHERE object_id = ? ORDER BY occurrence_count DESC, related_name LIMIT ?",
+            (row["object_id"], top_n)
+        )
+        return [(r["related_name"], r["occurrence_count"]) for r in rows]
+
+    def object_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    # --- JSON import / export ---
+
+    def import_json_file(self, store_key, filepath):
+        document, rejection_reason = read_verified_json(filepath)
+        if rejection_reason:
+            raise ValueError(f"Rejected '{filepath}': {rejection_reason}")
+        self.save_document(store_key, document)
+        return document
+
+    def export_json_file(self, store_key, filepath):
+        document = self.load_document(store_key)
+        if document is None:
+            return False
+        write_json(filepath, document)
+        return True
+
+    def import_json_files(self, directory="."):
+        """Import every known memory file found in directory. Returns the imported keys."""
+        imported = []
+        for filename, store_key in STORE_KEYS.items():
+            filepath = os.path.join(directory, filename)
+            if os.path.exists(filepath):
+                self.import_json_file(store_key, filepath)
+                imported.append(store_key)
+        return imported
+
+    def export_json_files(self, directory="."):
+        """Write every stored document back to its JSON memory file. Returns the written paths."""
+        written = []
+        for filename, store_key in STORE_KEYS.items():
+            filepath = os.path.join(directory, filename)
+            if self.export_json_file(store_key, filepath):
+                written.append(filepath)
+        return written
+
+
+def main(argv=None):
+    """python -m framework_training.metadata_store import|export [db_path] [directory]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("import", "export"):
+        print("Usage: python -m framework_training.metadata_store import|export [db_path] [directory]")
+        return 1
+    db_path = argv[1] if len(argv) > 1 else METADATA_STORE_FILE
+    directory = argv[2] if len(argv) > 2 else "."
+    store = MetadataStore(db_path)
+    try:
+        if argv[0] == "import":
+            for store_key in store.import_json_files(directory):
+                print(f"  ✓ Imported: {store_key}")
+        else:
+            for filepath in store.export_json_files(directory):
+                print(f"  ✓ Saved: {filepath}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,15 @@
+import random
 import re
+from collections import Counter
 from datetime import datetime
 from .utils import clean_sql_text
+from .pattern_clustering import UsagePatternClusterer
+from .generators.pattern_analyzer.parameter_sketches import ParameterUsageSketches
+from .generators.synthetic_training_generator import collect_parameter_usage
+from .generators.utils.api_model import ensure_api_model
+
+# Script patterns kept per signature group (uniform reservoir sample)
+GROUP_EXAMPLES = 5
 
 class FrameworkPatternAnalyzer:
     """
@@ -9,22 +18,9 @@ class FrameworkPatternAnalyzer:
     """
     
     def __init__(self, framework_api_details):
-        self.framework_api = framework_api_details
-        self.framework_procedures = self._build_procedure_lookup()
-        
-    def _build_procedure_lookup(self):
-        """Build lookup dictionary of framework procedures."""
-        procedures = {}
-        for obj in self.framework_api:
-            if obj.get('object_type_short') == 'P':
-                proc_name = obj['object_name'].lower()
-                full_name = f"{obj['schema_name']}.{obj['object_name']}"
-                procedures[proc_name] = {
-                    'full_name': full_name,
-                    'parameters': obj.get('parameters', []),
-                    'object_info': obj
-                }
-        return procedures
+        self.framework_api = ensure_api_model(framework_api_details)
+        # lowercase procedure name -> ApiObject
+        self.framework_procedures = self.framework_api.procedures_by_lower_name
     
     def analyze_scripts(self, action_scripts_corpus):
         """Analyze all scripts for framework usage patterns."""
@@ -37,30 +33,51 @@ class FrameworkPatternAnalyzer:
                 "framework_procedures_available": len(self.framework_procedures)
             },
             "patterns": [],
+            "pattern_families": [],
+            "parameter_usage": {},
+            "procedure_usage": {},
             "pattern_summary": {},
             "common_practices": []
         }
         
-        # Analyze each script
-        script_patterns = []
+        # Analyze each script; patterns are folded into groups and clusters, not kept
+        grouped = {}
+        group_rng = random.Random(42)
+        clusterer = UsagePatternClusterer()
+        parameter_sketches = ParameterUsageSketches()
+        procedure_usage = Counter()
+        proc_map = self.framework_api.procedures_by_full_name
         for i, script_info in enumerate(action_scripts_corpus):
             if i % 50 == 0:  # Progress indicator
                 print(f"    Processing script {i+1}/{len(action_scripts_corpus)}...")
                 
-            pattern = self._analyze_single_script(script_info)
+            collect_parameter_usage(script_info.get('sql_source') or '', parameter_sketches, proc_map)
+            pattern = self.analyze_script(script_info)
             if pattern:
-                script_patterns.append(pattern)
+                self._add_to_group(grouped, pattern, group_rng)
+                clusterer.add(pattern)
+                procedure_usage.update(call["procedure"] for call in pattern["framework_calls"])
         
         # Group similar patterns
-        grouped_patterns = self._group_patterns(script_patterns)
+        grouped_patterns = self._finish_groups(grouped)
         patterns["patterns"] = grouped_patterns
         
+        # Cluster scripts into usage pattern families
+        patterns["pattern_families"] = clusterer.summarize()
+        
+        # Per-parameter value statistics (fixed-size sketches)
+        patterns["parameter_usage"] = parameter_sketches.to_dict()
+        
+        # Calls per framework procedure (full name); weights example generation
+        patterns["procedure_usage"] = dict(procedure_usage.most_common())
+        
         print(f"  ✓ Found {len(grouped_patterns)} distinct framework usage patterns")
+        print(f"  ✓ Clustered scripts into {len(patterns['pattern_families'])} pattern families")
         
         return patterns
     
-    def _analyze_single_script(self, script_info):
-        """Analyze framework usage in a single script."""
+    def analyze_script(self, script_info):
+        """Analyze framework usage in a single script; None when it calls no framework procedure."""
         sql_text = script_info.get('sql_source', '')
         if not sql_text:
             return None
@@ -107,62 +124,70 @@ class FrameworkPatternAnalyzer:
                     # Check if it's a framework procedure
                     if proc_name in self.framework_procedures:
                         call_info = {
-                            "procedure": self.framework_procedures[proc_name]['full_name'],
+                            "procedure": self.framework_procedures[proc_name].full_name,
                             "short_name": proc_name
                         }
                         calls.append(call_info)
         
         return calls
     
-    def _group_patterns(self, script_patterns):
-        """Group similar patterns together."""
-        grouped = {}
+    def _add_to_group(self, grouped, pattern, rng):
+        """Fold one pattern into its signature group; only GROUP_EXAMPLES patterns are kept per group."""
+        # Create a simple signature
+        signature_parts = []
+        
+        if pattern["call_count"] == 1:
+            signature_parts.append("single_call")
+        elif pattern["call_count"] <= 3:
+            signature_parts.append("multi_call")
+        else:
+            signature_parts.append("complex_call")
         
-        for pattern in script_patterns:
-            # Create a simple signature
-            signature_parts = []
-            
-            if pattern["call_count"] == 1:
-                signature_parts.append("single_call")
-            elif pattern["call_count"] <= 3:
-                signature_parts.append("multi_call")
-            else:
-                signature_parts.append("complex_call")
-            
-            if pattern["has_error_handling"]:
-                signature_parts.append("with_error_handling")
-            
-            if pattern["has_transactions"]:
-                signature_parts.append("transactional")
-            
-            if pattern["has_validation"]:
-                signature_parts.append("with_validation")
-            
-            signature = "_".join(signature_parts)
-            
-            if signature not in grouped:
-                grouped[signature] = {
-                    "signature": signature,
-                    "description": self._describe_pattern(pattern),
-                    "occurrence_count": 0,
-                    "examples": [],
-                    "common_procedures": {}
-                }
-            
-            group = grouped[signature]
-            group["occurrence_count"] += 1
-            group["examples"].append(pattern)
-            
-            # Track procedure usage
-            for call in pattern["framework_calls"]:
-                proc_name = call["procedure"]
-                group["common_procedures"][proc_name] = group["common_procedures"].get(proc_name, 0) + 1
+        if pattern["has_error_handling"]:
+            signature_parts.append("with_error_handling")
         
-        # Convert to list and filter
+        if pattern["has_transactions"]:
+            signature_parts.append("transactional")
+        
+        if pattern["has_validation"]:
+            signature_parts.append("with_validation")
+        
+        signature = "_".join(signature_parts)
+        
+        if signature not in grouped:
+            grouped[signature] = {
+                "signature": signature,
+                "description": self._describe_pattern(pattern),
+                "occurrence_count": 0,
+                "examples": [],
+                "common_procedures": {},
+                "complexity_total": 0
+            }
+        
+        group = grouped[signature]
+        group["occurrence_count"] += 1
+        group["complexity_total"] += pattern["complexity_score"]
+        
+        # Reservoir sampling keeps a uniform sample of fixed size
+        if len(group["examples"]) < GROUP_EXAMPLES:
+            group["examples"].append(pattern)
+        else:
+            slot = rng.randrange(group["occurrence_count"])
+            if slot < GROUP_EXAMPLES:
+                group["examples"][slot] = pattern
+        
+        # Track procedure usage
+        for call in pattern["framework_calls"]:
+            proc_name = call["procedure"]
+            group["common_procedures"][proc_name] = group["common_procedures"].get(proc_name, 0) + 1
+    
+    def _finish_groups(self, grouped):
+        """Groups seen at least twice, with average complexity, most frequent first."""
         result = []
         for signature, group in grouped.items():
+            complexity_total = group.pop("complexity_total")
             if group["occurrence_count"] >= 2:  # Only include patterns that occur multiple times
-                group["average_complexity"] = sum(ex["complexity_score"] for ex in group["examples"]) / len(group["examples"])
+                group["average_complexity"] = complexity_total / group["occurrence_count"]
                 result.append(group)
         
         # Sort by occurrence count
@@ -0,0 +1,147 @@
+import math
+import random
+import zlib
+from collections import Counter
+
+STRUCTURAL_FEATURES = ["has_error_handling", "has_transactions", "has_validation"]
+
+
+def _stable_hash(text):
+    """Process-independent 32-bit hash (Python's hash() is salted per run)."""
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class PatternCluster:
+    """Bounded-memory summary of one pattern family: centroid, counts and an example reservoir."""
+
+    def __init__(self, cluster_key, dimensions, reservoir_size):
+        self.cluster_key = cluster_key
+        self.centroid = [0.0] * dimensions
+        self.count = 0
+        self.complexity_total = 0
+        self.call_count_total = 0
+        self.flag_counts = Counter()
+        self.procedure_counts = Counter()
+        self.reservoir_size = reservoir_size
+        self.reservoir = []
+
+    def add(self, pattern, features, rng):
+        """Fold one script pattern into the running statistics."""
+        self.count += 1
+        for i, value in enumerate(features):
+            self.centroid[i] += (value - self.centroid[i]) / self.count
+        self.complexity_total += pattern.get("complexity_score", 0)
+        self.call_count_total += pattern.get("call_count", 0)
+        for flag in STRUCTURAL_FEATURES:
+            if pattern.get(flag):
+                self.flag_counts[flag] += 1
+        for call in pattern.get("framework_calls", []):
+            self.procedure_counts[call["procedure"]] += 1
+
+        # Reservoir sampling keeps a uniform sample of fixed size
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(pattern)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = pattern
+
+    def distance_squared(self, features):
+        return sum((a - b) ** 2 for a, b in zip(self.centroid, features))
+
+
+class UsagePatternClusterer:
+    """
+    Streams script patterns into families using MinHash/LSH bucketing over the
+    framework-call set plus structural flags. Memory is bounded by max_clusters;
+    once the limit is reached, new buckets are merged into the nearest centroid.
+    """
+
+    def __init__(self, num_hashes=2, max_clusters=64, reservoir_size=5, hashed_dimensions=32, seed=42):
+        self.num_hashes = num_hashes
+        self.max_clusters = max_clusters
+        self.reservoir_size = reservoir_size
+        self.hashed_dimensions = hashed_dimensions
+        self.rng = random.Random(seed)
+        self.clusters = {}
+        self.scripts_clustered = 0
+
+    def feature_vector(self, pattern):
+        """Compact vector: hashed call set followed by structural features."""
+        vector = [0.0] * self.hashed_dimensions
+        call_names = {call["short_name"] for call in pattern.get("framework_calls", [])}
+        if call_names:
+            weight = 1.0 / math.sqrt(len(call_names))
+            for name in call_names:
+                vector[_stable_hash(name) % self.hashed_dimensions] += weight
+        vector.append(math.log1p(pattern.get("call_count", 0)) / math.log(10))
+        vector.extend(1.0 if pattern.get(flag) else 0.0 for flag in STRUCTURAL_FEATURES)
+        vector.append(min(pattern.get("complexity_score", 0), 50) / 50.0)
+        return vector
+
+    def bucket_key(self, pattern):
+        """MinHash signature of the call set combined with the structural flags."""
+        call_names = {call["short_name"] for call in pattern.get("framework_calls", [])}
+        signature = tuple(
+            min(_stable_hash(f"{seed}:{name}") for name in call_names) if call_names else 0
+            for seed in range(self.num_hashes)
+        )
+        call_count = pattern.get("call_count", 0)
+        size_class = "single" if call_count == 1 else "multi" if call_count <= 3 else "complex"
+        flags = tuple(bool(pattern.get(flag)) for flag in STRUCTURAL_FEATURES)
+        return (size_class, flags, signature)
+
+    def add(self, pattern):
+        """Assign one script pattern to a cluster."""
+        features = self.feature_vector(pattern)
+        key = self.bucket_key(pattern)
+        cluster = self.clusters.get(key)
+        if cluster is None:
+            if len(self.clusters) < self.max_clusters:
+                cluster = self.clusters[key] = PatternCluster(key, len(features), self.reservoir_size)
+            else:
+                cluster = min(self.clusters.values(), key=lambda c: c.distance_squared(features))
+        cluster.add(pattern, features, self.rng)
+        self.scripts_clustered += 1
+
+    def add_all(self, script_patterns):
+        for pattern in script_patterns:
+            self.add(pattern)
+        return self
+
+    def summarize(self, min_size=2, top_procedures=10):
+        """Serializable list of pattern families, largest first."""
+        families = []
+        for cluster in self.clusters.values():
+            if cluster.count < min_size:
+                continue
+            flag_rates = {flag: round(cluster.flag_counts[flag] / cluster.count, 3) for flag in STRUCTURAL_FEATURES}
+            families.append({
+                "size_class": cluster.cluster_key[0],
+                "description": self._describe(cluster, flag_rates),
+                "occurrence_count": cluster.count,
+                "average_call_count": round(cluster.call_count_total / cluster.count, 2),
+                "average_complexity": round(cluster.complexity_total / cluster.count, 2),
+                "structural_rates": flag_rates,
+                "common_procedures": dict(cluster.procedure_counts.most_common(top_procedures)),
+                "centroid": [round(value, 4) for value in cluster.centroid],
+                "example_script_ids": [example.get("script_id") for example in cluster.reservoir]
+            })
+        families.sort(key=lambda family: family["occurrence_count"], reverse=True)
+        for family_id, family in enumerate(families, 1):
+            family["family_id"] = family_id
+        return families
+
+    @staticmethod
+    def _describe(cluster, flag_rates):
+        """Human-readable description from the dominant procedures and flags."""
+        top_names = [name.split('.')[-1] for name, _ in cluster.procedure_counts.most_common(3)]
+        base = f"Scripts calling {', '.join(top_names)}" if top_names else "Scripts without framework calls"
+        additions = []
+        if flag_rates["has_error_handling"] >= 0.5:
+            additions.append("with error handling")
+        if flag_rates["has_transactions"] >= 0.5:
+            additions.append("using transactions")
+        if flag_rates["has_validation"] >= 0.5:
+            additions.append("with validation")
+        return base + (" " + ", ".join(additions) if additions else "")
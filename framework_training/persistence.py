@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+from .serialization import decode_json, encode_json, default_json_format
+
+CHECKSUM_SUFFIX = ".sha256"
+
+
+def checksum_path(filepath):
+    return filepath + CHECKSUM_SUFFIX
+
+
+def _fsync_directory(directory):
+    """Persist a rename; not supported on every platform."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _replace_atomically(filepath, raw):
+    temp_path = f"{filepath}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _file_checksum(filepath):
+    """Size + sha256 of the file as it is on disk now; None when there is no file."""
+    sidecar_path = checksum_path(filepath)
+    try:
+        size = os.path.getsize(filepath)
+    except OSError:
+        return None
+    if os.path.exists(sidecar_path):
+        try:
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+            if sidecar.get("bytes") == size:
+                return {"bytes": sidecar["bytes"], "sha256": sidecar["sha256"]}
+        except Exception:
+            pass
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {"bytes": size, "sha256": digest.hexdigest()}
+
+
+def atomic_write_bytes(filepath, raw):
+    """
+    Write raw bytes crash-safely. The checksum sidecar (size + sha256) is written
+    first and also accepts the file currently on disk; then the data goes to a temp
+    file, fsync, rename; then the sidecar is rewritten with only the new checksum.
+    A crash at any point leaves either the old file or the new one, never a
+    truncated mix, and the sidecar on disk matches whichever it is.
+    """
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    sidecar = {"bytes": len(raw), "sha256": hashlib.sha256(raw).hexdigest()}
+    previous = _file_checksum(filepath)
+    if previous is not None and previous != sidecar:
+        _replace_atomically(checksum_path(filepath), json.dumps({**sidecar, "previous": previous}).encode('utf-8'))
+        _fsync_directory(directory)
+    _replace_atomically(filepath, raw)
+    _fsync_directory(directory)
+    _replace_atomically(checksum_path(filepath), json.dumps(sidecar).encode('utf-8'))
+    _fsync_directory(directory)
+    return len(raw)
+
+
+def verify_file(filepath):
+    """
+    Cheap integrity check before parsing. Returns (ok, reason).
+    With a sidecar: size first, then sha256. Without one (older files): the file
+    must end like a complete JSON document or be a complete gzip stream.
+    """
+    try:
+        size = os.path.getsize(filepath)
+    except OSError as e:
+        return False, f"unreadable ({e})"
+    if size == 0:
+        return False, "empty file"
+
+    sidecar_path = checksum_path(filepath)
+    if os.path.exists(sidecar_path):
+        try:
+            with open(sidecar_path, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+        except Exception as e:
+            return False, f"unreadable checksum sidecar ({e})"
+        # "previous" is present only while a write is in progress (or was interrupted)
+        accepted = [sidecar] + ([sidecar["previous"]] if isinstance(sidecar.get("previous"), dict) else [])
+        accepted = [checksum for checksum in accepted if checksum.get("bytes") == size]
+        if not accepted:
+            return False, f"size {size} does not match checksum sidecar ({sidecar.get('bytes')})"
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        if digest.hexdigest() not in [checksum.get("sha256") for checksum in accepted]:
+            return False, "sha256 does not match checksum sidecar"
+        return True, "checksum ok"
+
+    with open(filepath, 'rb') as f:
+        head = f.read(2)
+        f.seek(max(0, size - 64))
+        tail = f.read().rstrip()
+    if head == b'\x1f\x8b':
+        # gzip streams are length-checked by the decoder itself
+        return True, "gzip without checksum"
+    if not tail or tail[-1:] not in (b'}', b']'):
+        return False, "truncated JSON (no closing bracket)"
+    return True, "no checksum"
+
+
+def read_verified_json(filepath):
+    """Verify then decode; returns (data, None) or (None, reason)."""
+    ok, reason = verify_file(filepath)
+    if not ok:
+        return None, reason
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    try:
+        return decode_json(raw), None
+    except Exception as e:
+        return None, f"invalid JSON ({e})"
+
+
+class BackgroundWriter:
+    """
+    Write-behind queue for JSON files. Encoding and the atomic write run on one
+    daemon thread in submission order; join() is the flush point before exit.
+    Data passed to submit() must not be mutated afterwards.
+    """
+
+    def __init__(self, on_complete=None):
+        self.on_complete = on_complete
+        self.errors = []
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="memory-file-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, filepath, data, json_format=None):
+        self._ensure_thread()
+        self._queue.put((filepath, data, json_format or default_json_format()))
+
+    def _run(self):
+        while True:
+            filepath, data, json_format = self._queue.get()
+            bytes_written, error = 0, None
+            try:
+                bytes_written = atomic_write_bytes(filepath, encode_json(data, json_format))
+            except Exception as e:
+                error = e
+                self.errors.append((filepath, e))
+            try:
+                if self.on_complete:
+                    self.on_complete(filepath, bytes_written, error)
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Block until every submitted file is on disk. Returns the list of (filepath, error)."""
+        if self._thread is not None:
+            self._queue.join()
+        return self.errors
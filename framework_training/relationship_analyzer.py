@@ -1,5 +1,7 @@
 from datetime import datetime
 from .utils import clean_sql_text
+from .relationship_rules import RelationshipRuleIndex
+from .generators.utils.api_model import ensure_api_model
 import json
 import os
 from collections import Counter
@@ -8,47 +10,27 @@ class RelationshipAnalyzer:
     """Analyzes relationships between stored procedures."""
     
     def __init__(self, framework_api_details, framework_knowledge=None):
+        """framework_knowledge may be a dict or a path to framework_knowledge.json (hot-reloaded)."""
         self.framework_api = framework_api_details
-        self.framework_knowledge = framework_knowledge or {}
+        self.relationship_rules = RelationshipRuleIndex.from_knowledge(framework_knowledge)
+        self.framework_knowledge = self.relationship_rules.framework_knowledge
         self.relationships = {}
         self.relationship_counts = Counter()
         
     def _should_ignore_relationship(self, proc1, proc2):
         """Check if relationship should be ignored based on framework knowledge."""
-        ignore_rules = self.framework_knowledge.get('relationship_rules', {})
-        
-        # Check if proc1 has ignore rules
-        if proc1 in ignore_rules:
-            if proc2 in ignore_rules[proc1].get('ignore_relationships_with', []):
-                return True
-                
-        # Check if proc2 has ignore rules
-        if proc2 in ignore_rules:
-            if proc1 in ignore_rules[proc2].get('ignore_relationships_with', []):
-                return True
-                
-        return False
+        return self.relationship_rules.should_ignore(proc1, proc2)
 
 class ProcedureRelationshipAnalyzer:
     """Analyzes relationships between framework procedures."""
     
     def __init__(self, framework_api_details, framework_knowledge=None):
-        self.framework_api = framework_api_details
-        self.framework_knowledge = framework_knowledge or {}
-        self.framework_procedures = self._build_procedure_lookup()
-    
-    def _build_procedure_lookup(self):
-        """Build lookup of framework procedures."""
-        procedures = {}
-        for obj in self.framework_api:
-            if obj.get('object_type_short') == 'P':
-                proc_name = obj['object_name']
-                full_name = f"{obj['schema_name']}.{proc_name}"
-                procedures[proc_name.lower()] = {
-                    'full_name': full_name,
-                    'short_name': proc_name
-                }
-        return procedures
+        """framework_knowledge may be a dict or a path to framework_knowledge.json (hot-reloaded)."""
+        self.framework_api = ensure_api_model(framework_api_details)
+        self.relationship_rules = RelationshipRuleIndex.from_knowledge(framework_knowledge)
+        self.framework_knowledge = self.relationship_rules.framework_knowledge
+        # lowercase procedure name -> ApiObject
+        self.framework_procedures = self.framework_api.procedures_by_lower_name
     
     def analyze_relationships(self, action_scripts_corpus):
         """Analyze procedure relationships from scripts."""
@@ -66,7 +48,7 @@ class ProcedureRelationshipAnalyzer:
         
         # Initialize procedure data
         for proc_info in self.framework_procedures.values():
-            full_name = proc_info['full_name']
+            full_name = proc_info.full_name
             relationships["procedures"][full_name] = {
                 "procedure_name": full_name,
                 "related_procedures": {},
@@ -131,19 +113,7 @@ class ProcedureRelationshipAnalyzer:
     
     def _should_ignore_relationship(self, proc1, proc2):
         """Check if relationship should be ignored based on framework knowledge."""
-        ignore_rules = self.framework_knowledge.get('relationship_rules', {})
-        
-        # Check if proc1 has ignore rules
-        if proc1 in ignore_rules:
-            if proc2 in ignore_rules[proc1].get('ignore_relationships_with', []):
-                return True
-                
-        # Check if proc2 has ignore rules
-        if proc2 in ignore_rules:
-            if proc1 in ignore_rules[proc2].get('ignore_relationships_with', []):
-                return True
-                
-        return False
+        return self.relationship_rules.should_ignore(proc1, proc2)
     
     def _find_procedures_in_script(self, sql_text):
         """Find framework procedures used in a script."""
@@ -166,7 +136,7 @@ class ProcedureRelationshipAnalyzer:
                     
                     # Check if it's a framework procedure
                     if proc_name in self.framework_procedures:
-                        full_name = self.framework_procedures[proc_name]['full_name']
+                        full_name = self.framework_procedures[proc_name].full_name
                         if full_name not in found:
                             found.append(full_name)
         
@@ -0,0 +1,142 @@
+import json
+import os
+import time
+
+
+def split_procedure_name(name):
+    """Split 'proc', 'schema.proc' or '[schema].[proc]' into (schema or None, lowercase name)."""
+    clean_name = name.replace('[', '').replace(']', '').strip().lower()
+    if '.' in clean_name:
+        schema_name, object_name = clean_name.rsplit('.', 1)
+        return schema_name, object_name
+    return None, clean_name
+
+
+class RelationshipRuleIndex:
+    """
+    Compiled form of the relationship_rules section of framework_knowledge.json.
+    Rule names are exact ('sp_api_modal_clear'), schema-qualified ('dbo.sp_api_modal_clear')
+    or prefix wildcards ('sp_api_modal_*'). Every rule name gets an integer id; each
+    procedure name resolves once to a bitmask of matching ids plus a bitmask of ids it
+    ignores, so checking a pair is two dict lookups and two ANDs.
+    """
+
+    def __init__(self, framework_knowledge=None, knowledge_file=None, reload_interval=2.0):
+        self.knowledge_file = knowledge_file
+        self.reload_interval = reload_interval
+        self._file_mtime = None
+        self._last_reload_check = 0.0
+        if knowledge_file and framework_knowledge is None:
+            framework_knowledge = self._load_file()
+        self.framework_knowledge = framework_knowledge or {}
+        self._compile(self.framework_knowledge)
+
+    @classmethod
+    def from_knowledge(cls, framework_knowledge):
+        """Accept either a loaded knowledge dict or a path to framework_knowledge.json."""
+        if isinstance(framework_knowledge, cls):
+            return framework_knowledge
+        if isinstance(framework_knowledge, str):
+            return cls(knowledge_file=framework_knowledge)
+        return cls(framework_knowledge)
+
+    def _load_file(self):
+        try:
+            self._file_mtime = os.stat(self.knowledge_file).st_mtime
+            with open(self.knowledge_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"  ✗ Error loading {self.knowledge_file}: {e}")
+            return None
+
+    def _compile(self, framework_knowledge):
+        """Assign ids to rule names and build the per-id ignore bitmasks."""
+        self.rule_names = []
+        self.exact_ids = {}
+        self.prefix_ids = []
+        self.ignore_masks = []
+        self._name_cache = {}
+
+        rules = framework_knowledge.get('relationship_rules', {})
+        for source_name, rule in rules.items():
+            source_id = self._rule_id(source_name)
+            for target_name in rule.get('ignore_relationships_with', []):
+                self.ignore_masks[source_id] |= 1 << self._rule_id(target_name)
+
+    def _rule_id(self, rule_name):
+        schema_name, object_name = split_procedure_name(rule_name)
+        is_prefix = object_name.endswith('*')
+        key = (schema_name, object_name.rstrip('*'), is_prefix)
+        if is_prefix:
+            for existing_key, rule_id in self.prefix_ids:
+                if existing_key == key:
+                    return rule_id
+        elif key[:2] in self.exact_ids:
+            return self.exact_ids[key[:2]]
+
+        rule_id = len(self.rule_names)
+        self.rule_names.append(rule_name)
+        self.ignore_masks.append(0)
+        if is_prefix:
+            self.prefix_ids.append((key, rule_id))
+        else:
+            self.exact_ids[key[:2]] = rule_id
+        return rule_id
+
+    def _resolve(self, procedure_name):
+        """(match mask, ignore mask) for a procedure name, cached per name."""
+        cached = self._name_cache.get(procedure_name)
+        if cached is not None:
+            return cached
+
+        schema_name, object_name = split_procedure_name(procedure_name)
+        schema_name = schema_name or 'dbo'
+        match_mask = 0
+        for rule_schema in {schema_name, None}:
+            rule_id = self.exact_ids.get((rule_schema, object_name))
+            if rule_id is not None:
+                match_mask |= 1 << rule_id
+        for (rule_schema, prefix, _), rule_id in self.prefix_ids:
+            if (rule_schema is None or rule_schema == schema_name) and object_name.startswith(prefix):
+                match_mask |= 1 << rule_id
+
+        ignore_mask = 0
+        remaining = match_mask
+        while remaining:
+            lowest_bit = remaining & -remaining
+            ignore_mask |= self.ignore_masks[lowest_bit.bit_length() - 1]
+            remaining ^= lowest_bit
+
+        self._name_cache[procedure_name] = (match_mask, ignore_mask)
+        return match_mask, ignore_mask
+
+    def maybe_reload(self):
+        """Recompile if the knowledge file changed on disk (checked at most every reload_interval seconds)."""
+        if not self.knowledge_file:
+            return False
+        now = time.monotonic()
+        if now - self._last_reload_check < self.reload_interval:
+            return False
+        self._last_reload_check = now
+        try:
+            mtime = os.stat(self.knowledge_file).st_mtime
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        framework_knowledge = self._load_file()
+        if framework_knowledge is None:
+            return False
+        self.framework_knowledge = framework_knowledge
+        self._compile(framework_knowledge)
+        print(f"  ✓ Reloaded relationship rules from {self.knowledge_file}")
+        return True
+
+    def should_ignore(self, proc1, proc2):
+        """Check if the relationship between two procedures should be ignored."""
+        self.maybe_reload()
+        match1, ignore1 = self._resolve(proc1)
+        match2, ignore2 = self._resolve(proc2)
+        return bool((ignore1 & match2) or (ignore2 & match1))
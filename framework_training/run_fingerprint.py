@@ -0,0 +1,143 @@
+import hashlib
+from datetime import datetime
+
+FINGERPRINT_VERSION = 1
+HASH_LENGTH = 16  # hex chars kept per hash; plenty to tell versions of one object apart
+
+
+def _digest(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, (bytes, memoryview)):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode('utf-8', 'replace'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def definition_hash(definition_text):
+    """Hash of an object's SQL definition, stored on the API object at discovery."""
+    return _digest(definition_text or '')
+
+
+def object_full_name(api_obj):
+    return getattr(api_obj, 'full_name', None) or f"{api_obj.get('schema_name', 'dbo')}.{api_obj['object_name']}"
+
+
+def parameter_hash(param):
+    """Hash of everything a caller depends on: name, types, direction, default and position."""
+    return _digest(param.get('name'), param.get('type_from_sys'), param.get('type_from_def'),
+                   param.get('max_length_bytes'), param.get('precision'), param.get('scale'),
+                   param.get('is_output'), param.get('has_default'), param.get('default_value'),
+                   param.get('is_readonly'), param.get('order'))
+
+
+def object_fingerprint(api_obj, usage_count=0):
+    """
+    {signature, definition, usage, parameters} for one API object. The definition hash
+    comes from 'definition_hash' (recorded at discovery) or, for older API files,
+    from the fields extracted from the definition.
+    """
+    parameters = {param.get('name'): parameter_hash(param) for param in api_obj.get('parameters') or []}
+    definition = api_obj.get('definition_hash') or _digest(api_obj.get('embedded_example'),
+                                                           api_obj.get('embedded_description'))
+    return {
+        "signature": _digest(api_obj.get('object_type_short'), *parameters.values()),
+        "definition": definition,
+        "usage": usage_count,
+        "parameters": parameters
+    }
+
+
+def script_key(source_table, action_id):
+    return f"{source_table}:{action_id}"
+
+
+def script_fingerprints(action_scripts_corpus):
+    """script key -> content hash. A CorpusBlobStore is hashed straight from its memory map."""
+    if hasattr(action_scripts_corpus, 'iter_sql_views'):
+        return {
+            script_key(*action_scripts_corpus.script_ref(index)): _digest(view)
+            for index, view in action_scripts_corpus.iter_sql_views()
+        }
+    return {
+        script_key(script_info.get('source_table'), script_info.get('action_id')):
+            _digest((script_info.get('sql_source') or '').encode('utf-8', 'replace'))
+        for script_info in action_scripts_corpus
+    }
+
+
+def build_fingerprint(framework_api_details, action_scripts_corpus, usage_counts=None):
+    """Compact per-object and per-script fingerprint of one run."""
+    usage_counts = usage_counts or {}
+    return {
+        "version": FINGERPRINT_VERSION,
+        "generated": datetime.now().isoformat(),
+        "objects": {
+            object_full_name(api_obj): object_fingerprint(api_obj, usage_counts.get(object_full_name(api_obj), 0))
+            for api_obj in framework_api_details or []
+        },
+        "scripts": script_fingerprints(action_scripts_corpus or [])
+    }
+
+
+def _diff_keys(previous, current):
+    added = sorted(key for key in current if key not in previous)
+    removed = sorted(key for key in previous if key not in current)
+    changed = sorted(key for key in current if key in previous and previous[key] != current[key])
+    return added, removed, changed
+
+
+def diff_fingerprints(previous, current):
+    """
+    Added/removed/changed objects, parameters and scripts between two fingerprints,
+    by hash comparison only. Without a usable previous fingerprint everything is
+    reported as added and 'baseline' is True.
+    """
+    baseline = not previous or previous.get("version") != FINGERPRINT_VERSION
+    previous_objects = {} if baseline else previous.get("objects", {})
+    previous_scripts = {} if baseline else previous.get("scripts", {})
+    current_objects, current_scripts = current.get("objects", {}), current.get("scripts", {})
+
+    changed_objects, parameter_changes = [], []
+    for name, fingerprint in current_objects.items():
+        old = previous_objects.get(name)
+        if old is None:
+            continue
+        reasons = [field for field in ("signature", "definition", "usage") if old.get(field) != fingerprint[field]]
+        if not reasons:
+            continue
+        changed_objects.append({"object": name, "changed": reasons})
+        if "signature" in reasons:
+            added, removed, changed = _diff_keys(old.get("parameters", {}), fingerprint["parameters"])
+            if added or removed or changed:
+                parameter_changes.append({"object": name, "added": added, "removed": removed, "changed": changed})
+
+    scripts_added, scripts_removed, scripts_changed = _diff_keys(previous_scripts, current_scripts)
+    diff = {
+        "baseline": baseline,
+        "previous_generated": None if baseline else previous.get("generated"),
+        "objects_added": sorted(name for name in current_objects if name not in previous_objects),
+        "objects_removed": sorted(name for name in previous_objects if name not in current_objects),
+        "objects_changed": sorted(changed_objects, key=lambda change: change["object"]),
+        "parameters_changed": sorted(parameter_changes, key=lambda change: change["object"]),
+        "scripts_added": scripts_added,
+        "scripts_removed": scripts_removed,
+        "scripts_changed": scripts_changed
+    }
+    diff["summary"] = {key: len(value) for key, value in diff.items() if isinstance(value, list)}
+    return diff
+
+
+def objects_to_recompute(diff, include_usage=False):
+    """Names of objects whose outputs are stale: added, or changed in signature/definition (optionally usage)."""
+    fields = {"signature", "definition", "usage"} if include_usage else {"signature", "definition"}
+    names = set(diff.get("objects_added", []))
+    names.update(change["object"] for change in diff.get("objects_changed", []) if fields & set(change["changed"]))
+    return names
+
+
+def scripts_to_recompute(diff):
+    """Keys ('source_table:action_id') of scripts that are new or whose content changed."""
+    return set(diff.get("scripts_added", [])) | set(diff.get("scripts_changed", []))
@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+import time
+from .usage_refs import json_default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pretty: indent=4 for humans; compact: no whitespace; gzip: compact + gzip
+JSON_FORMATS = ("pretty", "compact", "gzip")
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def default_json_format():
+    """Output format from JSON_OUTPUT_FORMAT (compact unless configured)."""
+    json_format = os.getenv("JSON_OUTPUT_FORMAT", "compact").lower()
+    return json_format if json_format in JSON_FORMATS else "compact"
+
+
+def encode_json(data, json_format="compact", default=json_default):
+    """Encode data to bytes in the given format. orjson is used for compact output when installed."""
+    if json_format == "pretty":
+        return json.dumps(data, indent=4, default=default, ensure_ascii=False).encode('utf-8')
+    if ORJSON_AVAILABLE:
+        try:
+            raw = orjson.dumps(data, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            raw = json.dumps(data, separators=(',', ':'), default=default, ensure_ascii=False).encode('utf-8')
+    else:
+        raw = json.dumps(data, separators=(',', ':'), default=default, ensure_ascii=False).encode('utf-8')
+    if json_format == "gzip":
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    return raw
+
+
+def decode_json(raw):
+    """Decode bytes written by encode_json; gzip is detected from the magic number."""
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def write_json(filepath, data, json_format=None, default=json_default):
+    """Write data to filepath; returns the number of bytes written."""
+    raw = encode_json(data, json_format or default_json_format(), default)
+    with open(filepath, 'wb') as f:
+        f.write(raw)
+    return len(raw)
+
+
+def read_json(filepath):
+    """Read a JSON file in any supported format (pretty, compact or gzip)."""
+    with open(filepath, 'rb') as f:
+        return decode_json(f.read())
+
+
+def benchmark_formats(filepaths, repeat=3):
+    """
+    Bytes on disk plus best-of-repeat encode/decode seconds for every format.
+    Returns [{file, format, bytes, encode_seconds, decode_seconds}].
+    """
+    results = []
+    for filepath in filepaths:
+        data = read_json(filepath)
+        for json_format in JSON_FORMATS:
+            encode_times, decode_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                raw = encode_json(data, json_format)
+                encode_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                decode_json(raw)
+                decode_times.append(time.perf_counter() - start)
+            results.append({
+                "file": os.path.basename(filepath),
+                "format": json_format + ("+orjson" if ORJSON_AVAILABLE and json_format != "pretty" else ""),
+                "bytes": len(raw),
+                "encode_seconds": round(min(encode_times), 4),
+                "decode_seconds": round(min(decode_times), 4)
+            })
+    return results
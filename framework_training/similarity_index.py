@@ -0,0 +1,163 @@
+import hashlib
+import math
+import re
+from array import array
+from collections import Counter
+
+TOKEN_REGEX = re.compile(r'[@#]?\w+', re.ASCII)
+
+
+def tokenize_sql(sql_text):
+    """Split SQL text into lowercase word tokens (variables keep their @ prefix)."""
+    return TOKEN_REGEX.findall(sql_text.lower()) if sql_text else []
+
+
+def corpus_version(action_scripts_corpus):
+    """Content hash identifying a corpus version."""
+    digest = hashlib.sha1()
+    for script_info in action_scripts_corpus:
+        digest.update(f"{script_info.get('source_table')}|{script_info.get('action_id')}|".encode('utf-8'))
+        digest.update((script_info.get('sql_source') or '').encode('utf-8', 'replace'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class ScriptSimilarityIndex:
+    """
+    Sparse TF-IDF index over action scripts.
+    Documents are stored as CSR arrays (offsets, term ids, weights) and every term
+    keeps a posting list, so both example selection and snippet queries only touch
+    documents that share terms with the query.
+    """
+
+    _cached_index = None
+
+    def __init__(self, action_scripts_corpus):
+        self.scripts = action_scripts_corpus
+        self.version = corpus_version(action_scripts_corpus)
+        self.term_ids = {}
+        self.idf = []
+        self.doc_offsets = array('l', [0])
+        self.doc_terms = array('l')
+        self.doc_weights = array('d')
+        self.postings = []
+        self._build()
+
+    @classmethod
+    def for_corpus(cls, action_scripts_corpus):
+        """Return the index for this corpus, rebuilding only when the corpus version changes."""
+        cached = cls._cached_index
+        if cached is not None and cached.scripts is action_scripts_corpus:
+            return cached
+        version = corpus_version(action_scripts_corpus)
+        if cached is not None and cached.version == version:
+            cached.scripts = action_scripts_corpus
+            return cached
+        cls._cached_index = cls(action_scripts_corpus)
+        return cls._cached_index
+
+    def _build(self):
+        """Tokenize every script once, then weight and normalize term vectors."""
+        term_ids = self.term_ids
+        document_frequency = []
+        doc_counts = array('d')
+
+        for script_info in self.scripts:
+            counts = Counter(tokenize_sql(script_info.get('sql_source')))
+            for term, count in counts.items():
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(document_frequency)
+                    document_frequency.append(0)
+                document_frequency[term_id] += 1
+                self.doc_terms.append(term_id)
+                doc_counts.append(count)
+            self.doc_offsets.append(len(self.doc_terms))
+
+        doc_total = len(self.scripts)
+        self.idf = [math.log((1 + doc_total) / (1 + df)) + 1.0 for df in document_frequency]
+        self.postings = [array('l') for _ in document_frequency]
+
+        for doc_id in range(doc_total):
+            start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+            weights = [(1.0 + math.log(doc_counts[i])) * self.idf[self.doc_terms[i]] for i in range(start, end)]
+            norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+            for offset, weight in enumerate(weights):
+                term_id = self.doc_terms[start + offset]
+                self.doc_weights.append(weight / norm)
+                self.postings[term_id].append(doc_id)
+
+    def document_vector(self, doc_id):
+        """Sparse vector {term_id: weight} for one document."""
+        start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+        return dict(zip(self.doc_terms[start:end], self.doc_weights[start:end]))
+
+    def _dot(self, doc_id, vector):
+        start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+        terms, weights = self.doc_terms, self.doc_weights
+        return sum(weights[i] * vector.get(terms[i], 0.0) for i in range(start, end))
+
+    def documents_containing(self, term):
+        """Ids of documents that contain the token."""
+        term_id = self.term_ids.get(term.lower())
+        return self.postings[term_id] if term_id is not None else array('l')
+
+    def query(self, sql_snippet, top_n=5):
+        """Return [(score, script_info)] for the scripts most similar to a snippet."""
+        counts = Counter(tokenize_sql(sql_snippet))
+        query_vector = {}
+        for term, count in counts.items():
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                query_vector[term_id] = (1.0 + math.log(count)) * self.idf[term_id]
+        if not query_vector:
+            return []
+
+        scores = {}
+        for term_id in query_vector:
+            for doc_id in self.postings[term_id]:
+                if doc_id not in scores:
+                    scores[doc_id] = self._dot(doc_id, query_vector)
+        norm = math.sqrt(sum(w * w for w in query_vector.values())) or 1.0
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+        return [(round(score / norm, 6), self.scripts[doc_id]) for doc_id, score in best]
+
+    def select_representative_examples(self, object_names, k=3, diversity=0.3, max_candidates=50):
+        """
+        Pick up to k representative, mutually diverse scripts for every object name
+        in one pass (MMR over the scripts that mention the object).
+        Returns {object_name: [script_info, ...]}.
+        """
+        selected_examples = {}
+        for object_name in object_names:
+            candidates = self.documents_containing(object_name.split('.')[-1])
+            if not candidates:
+                selected_examples[object_name] = []
+                continue
+            selected_ids = self._select_mmr(candidates, k, diversity, max_candidates)
+            selected_examples[object_name] = [self.scripts[doc_id] for doc_id in selected_ids]
+        return selected_examples
+
+    def _select_mmr(self, candidates, k, diversity, max_candidates):
+        """Maximal marginal relevance against the centroid of the candidate set."""
+        if len(candidates) <= k:
+            return list(candidates)
+
+        centroid = Counter()
+        for doc_id in candidates:
+            start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+            for i in range(start, end):
+                centroid[self.doc_terms[i]] += self.doc_weights[i]
+        relevance = {doc_id: self._dot(doc_id, centroid) / len(candidates) for doc_id in candidates}
+        shortlist = sorted(relevance, key=lambda doc_id: (-relevance[doc_id], doc_id))[:max_candidates]
+
+        selected = []
+        max_similarity = dict.fromkeys(shortlist, 0.0)
+        while shortlist and len(selected) < k:
+            best_id = max(shortlist, key=lambda doc_id: ((1 - diversity) * relevance[doc_id] - diversity * max_similarity[doc_id], -doc_id))
+            shortlist.remove(best_id)
+            selected.append(best_id)
+            best_vector = self.document_vector(best_id)
+            for doc_id in shortlist:
+                max_similarity[doc_id] = max(max_similarity[doc_id], self._dot(doc_id, best_vector))
+        return selected
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import time
+from .persistence import atomic_write_bytes, checksum_path, read_verified_json
+from .serialization import encode_json
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_SUFFIX = ".json.gz"
+
+
+def hash_value(value):
+    """sha256 of a value's compact JSON encoding (dict keys keep insertion order)."""
+    return hashlib.sha256(encode_json(value, "compact")).hexdigest()
+
+
+def hash_file(filepath):
+    """sha256 of a file's bytes, or None when it does not exist."""
+    if not filepath or not os.path.exists(filepath):
+        return None
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(*paths):
+    """
+    Version stamp for the code of one stage: sha256 over every .py file under the
+    given paths (files or directories, relative to the package directory).
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        full_path = os.path.join(PACKAGE_DIR, path)
+        if os.path.isdir(full_path):
+            files = sorted(
+                os.path.join(root, name)
+                for root, dirs, names in os.walk(full_path)
+                for name in names if name.endswith(".py")
+            )
+        else:
+            files = [full_path]
+        for filepath in files:
+            digest.update(os.path.relpath(filepath, PACKAGE_DIR).replace(os.sep, "/").encode('utf-8'))
+            digest.update(b'\x00')
+            digest.update((hash_file(filepath) or "missing").encode('ascii'))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed cache for pipeline stage outputs. The key of a stage is the
+    hash of its input hashes, its configuration and the code version of the modules
+    it runs, so a stage is only recomputed when one of those changes. Entries are
+    gzip JSON written atomically with a checksum sidecar; a hit refreshes the entry's
+    mtime, and gc() removes entries by age and then oldest-first down to max_bytes.
+    """
+
+    def __init__(self, cache_dir=".training_cache", max_age_days=30, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.hits = []
+        self.misses = []
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def stage_key(self, stage, inputs, config=None, code_paths=()):
+        return hash_value({
+            "stage": stage,
+            "inputs": inputs,
+            "config": config or {},
+            "code_version": code_version(*code_paths)
+        })
+
+    def _entry_path(self, stage, key):
+        return os.path.join(self.cache_dir, f"{stage}-{key[:32]}{CACHE_SUFFIX}")
+
+    def run(self, stage, inputs, compute, config=None, code_paths=()):
+        """
+        Return (output, output_hash) for a stage, computing it only on a miss.
+        inputs maps input names to hashes; output_hash can be passed on as an input
+        of the next stage.
+        """
+        key = self.stage_key(stage, inputs, config, code_paths)
+        entry_path = self._entry_path(stage, key)
+        if os.path.exists(entry_path):
+            entry, reason = read_verified_json(entry_path)
+            if entry is not None and entry.get("key") == key:
+                os.utime(entry_path)
+                self.hits.append(stage)
+                print(f"  ✓ Cache hit: {stage}")
+                return entry["output"], entry["output_hash"]
+            print(f"  ⚠ Discarding cache entry {entry_path}: {reason or 'key mismatch'}")
+
+        start = time.perf_counter()
+        output = compute()
+        output_hash = hash_value(output)
+        entry = {
+            "key": key,
+            "stage": stage,
+            "created": time.time(),
+            "compute_seconds": round(time.perf_counter() - start, 3),
+            "output_hash": output_hash,
+            "output": output
+        }
+        try:
+            atomic_write_bytes(entry_path, encode_json(entry, "gzip"))
+        except OSError as e:
+            print(f"  ⚠ Could not cache {stage}: {e}")
+        self.misses.append(stage)
+        return output, output_hash
+
+    def report(self):
+        return {"hits": list(self.hits), "misses": list(self.misses)}
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            sidecar = checksum_path(path)
+            size = os.path.getsize(path) + (os.path.getsize(sidecar) if os.path.exists(sidecar) else 0)
+            entries.append((os.path.getmtime(path), size, path))
+        return sorted(entries)
+
+    def _remove(self, path):
+        for filepath in (path, checksum_path(path)):
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    def gc(self):
+        """Drop entries unused for max_age_days, then the oldest until under max_bytes. Returns the count removed."""
+        removed = 0
+        cutoff = time.time() - self.max_age_days * 86400
+        remaining = []
+        for mtime, size, path in self._entries():
+            if mtime < cutoff:
+                self._remove(path)
+                removed += 1
+            else:
+                remaining.append((mtime, size, path))
+        total = sum(size for _, size, _ in remaining)
+        for mtime, size, path in remaining:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
@@ -1,4 +1,5 @@
 from generators.synthetic_training_generator import generate_all_training_materials
+from usage_refs import rehydrate_usage_examples
 
 import json
 
@@ -7,6 +8,10 @@ with open('../framework_api_details.json', 'r', encoding='utf-8') as f:
     api_data = json.load(f)
     framework_api_details = api_data['api_objects']
 
+# Usage examples are stored as (source_table, action_id) references into the corpus
+with open('../action_scripts_corpus.json', 'r', encoding='utf-8') as f:
+    rehydrate_usage_examples(framework_api_details, json.load(f)['scripts'])
+
 # Filter to get only stored procedures
 framework_api_details = [
     proc for proc in framework_api_details
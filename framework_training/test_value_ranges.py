@@ -0,0 +1,28 @@
+from generators.utils.value_generator import build_default_registry, numeric_bounds, parse_sql_type
+
+import random
+
+# Every numeric literal, sampled or drawn, must fit its declared type
+registry = build_default_registry()
+rng = random.Random(0)
+names = ['@id', '@user_id', '@card_id', '@amount', '@price', '@count', '@size', '@is_active', '@quantity']
+types = ['tinyint', 'smallint', 'int', 'bigint', 'decimal(3,2)', 'decimal(5,0)', 'numeric(4,1)', 'decimal(2,2)',
+         'decimal', 'numeric(9)']
+
+checked = 0
+for type_text in types:
+    sql_type = parse_sql_type(type_text)
+    low, high = numeric_bounds(sql_type)
+    for name in names:
+        for value in [registry.sample(name, type_text)] + registry.generate(name, type_text, 200, rng):
+            number = float(value)
+            assert low <= number <= high, f"{name} {type_text}: {value} outside [{low}, {high}]"
+            if sql_type.family == 'integer':
+                assert number == int(number), f"{name} {type_text}: {value} is not a whole number"
+            checked += 1
+
+assert registry.sample('@user_id', 'tinyint') == '255'
+assert registry.sample('@amount', 'decimal(3,2)') == '9.99'
+assert registry.sample('@amount', 'decimal(10,2)') == '99.99'
+
+print(f"{checked} numeric values fit their types")
@@ -1,5 +1,8 @@
 from datetime import datetime
 from .utils import generate_sample_value
+from .serialization import write_json
+from .generators.utils.api_model import ensure_api_model
+from .generators.generation_engine import GENERATOR_CLASSES
 from .generators.synthetic_training_generator import (
     analyze_script_patterns,
     generate_all_training_materials,
@@ -7,24 +10,18 @@ from .generators.synthetic_training_generator import (
     validate_difficulty_progression,
 )
 import json
+import os
 
 class TrainingExampleGenerator:
     """Generates training examples from framework usage patterns."""
     
     def __init__(self, framework_api_details):
-        self.framework_api = framework_api_details
-        self.framework_procedures = self._build_procedure_lookup()
+        self.framework_api = ensure_api_model(framework_api_details)
+        # "schema.procedure" -> ApiObject
+        self.framework_procedures = self.framework_api.procedures_by_full_name
     
-    def _build_procedure_lookup(self):
-        """Build lookup of framework procedures."""
-        procedures = {}
-        for obj in self.framework_api:
-            if obj.get('object_type_short') == 'P':
-                full_name = f"{obj['schema_name']}.{obj['object_name']}"
-                procedures[full_name] = obj
-        return procedures
-    
-    def generate_examples(self, usage_patterns, relationships, action_scripts_corpus=None):
+    def generate_examples(self, usage_patterns, relationships, action_scripts_corpus=None, output_format="json",
+                          seed=0, workers=1, coverage_target=None, min_examples=0, examples_per_category=10):
         """
         Generate training examples based on usage patterns and relationships.
         
@@ -32,6 +29,14 @@ class TrainingExampleGenerator:
             usage_patterns (dict): Patterns extracted from usage data
             relationships (dict): Procedure relationships
             action_scripts_corpus (list, optional): Action scripts corpus
+            output_format (str): "json", "markdown" or "jsonl" (examples streamed to
+                sharded JSON Lines under training_output/training_examples/)
+            seed (int): Master seed; the same seed reproduces the same examples
+            workers (int): Worker processes for example generation (None = all cores)
+            coverage_target (float, optional): Stop once this fraction of procedures is
+                covered (and min_examples generated), biasing picks toward uncovered ones
+            min_examples (int): Minimum number of examples before stopping at the target
+            examples_per_category (int): Examples generated for each generator category
         
         Returns:
             dict: Generated training materials
@@ -41,24 +46,32 @@ class TrainingExampleGenerator:
         # Analyze script patterns if corpus is provided
         script_patterns = analyze_script_patterns(action_scripts_corpus, self.framework_api)
         
+        output_dir = "training_output"
+        os.makedirs(output_dir, exist_ok=True)
+        
         # Generate comprehensive training materials
         results = generate_all_training_materials(
             self.framework_api,
             script_patterns,
             relationships,
-            args={"num_examples": 50}  # Pass args as required by generate_all_training_materials
+            args={"output_format": output_format, "output_dir": output_dir,
+                  **{f"{category}_count": examples_per_category for category in GENERATOR_CLASSES},
+                  "seed": seed, "workers": workers,
+                  "coverage_target": coverage_target, "min_examples": min_examples,
+                  # Sample procedures in proportion to how often the corpus calls them
+                  "usage_counts": usage_patterns.get("procedure_usage")}
         )
         
         # Save results to file
-        output_dir = "training_output"
-        os.makedirs(output_dir, exist_ok=True)
         output_file = os.path.join(output_dir, "training_materials.json")
         
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        write_json(output_file, results)
         
         print(f"\nFRAMEWORK_TRAINING: Training materials saved to {output_file}")
-        return results['metadata']['example_types']['synthetic']
+        return {
+            "examples": results["training_examples"],
+            "statistics": results["training_summary"]
+        }
     
     def _create_example_from_pattern(self, pattern, example_number):
         """Create a training example from a pattern."""
@@ -0,0 +1,82 @@
+from collections.abc import Sequence
+
+
+def script_ref(script_info):
+    """(source_table, action_id) key identifying a corpus script."""
+    return (script_info.get('source_table'), script_info.get('action_id'))
+
+
+def build_script_lookup(action_scripts_corpus):
+    """Map (source_table, action_id) -> script_info for a corpus list."""
+    return {script_ref(script_info): script_info for script_info in action_scripts_corpus}
+
+
+class UsageExampleRefs(Sequence):
+    """
+    Real usage examples stored as (source_table, action_id) references.
+    Items resolve lazily against the corpus lookup, so the object behaves like the
+    old list of script dicts while serializing as a short list of references.
+    """
+
+    __slots__ = ("refs", "script_lookup")
+
+    def __init__(self, refs, script_lookup):
+        self.refs = [tuple(ref) for ref in refs]
+        self.script_lookup = script_lookup
+
+    @classmethod
+    def from_scripts(cls, scripts, script_lookup):
+        return cls([script_ref(script_info) for script_info in scripts], script_lookup)
+
+    def _resolve(self, ref):
+        script_info = self.script_lookup.get(ref)
+        if script_info is None:
+            # Script no longer in the corpus: keep the reference itself
+            return {"source_table": ref[0], "action_id": ref[1]}
+        return script_info
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolve(ref) for ref in self.refs[index]]
+        return self._resolve(self.refs[index])
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __eq__(self, other):
+        if isinstance(other, UsageExampleRefs):
+            return self.refs == other.refs
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"UsageExampleRefs({self.refs!r})"
+
+    def to_json(self):
+        return [{"source_table": source_table, "action_id": action_id} for source_table, action_id in self.refs]
+
+
+def json_default(value):
+    """json.dump default hook: reference lists serialize compactly, everything else via str()."""
+    to_json = getattr(value, "to_json", None)
+    if to_json is not None:
+        return to_json()
+    return str(value)
+
+
+def rehydrate_usage_examples(framework_api_details, action_scripts_corpus):
+    """
+    Replace stored real_usage_examples (references or legacy full copies) with
+    UsageExampleRefs bound to the corpus. Returns the number of objects updated.
+    """
+    script_lookup = build_script_lookup(action_scripts_corpus)
+    updated = 0
+    for api_obj in framework_api_details:
+        examples = api_obj.get('real_usage_examples')
+        if examples is None:
+            continue
+        refs = examples.refs if isinstance(examples, UsageExampleRefs) else [script_ref(example) for example in examples]
+        api_obj['real_usage_examples'] = UsageExampleRefs(refs, script_lookup)
+        updated += 1
+    return updated
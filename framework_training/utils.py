@@ -2,34 +2,41 @@ import json
 import os
 import re
 from datetime import datetime
+from .serialization import read_json, write_json
+from .usage_refs import rehydrate_usage_examples
+from .generators.utils.value_generator import build_default_registry
 
-def save_json_file(filename, data):
-    """Save data to JSON file with proper formatting."""
+def save_json_file(filename, data, json_format=None):
+    """Save data to JSON file (format from JSON_OUTPUT_FORMAT unless given)."""
     # Create directory if it doesn't exist
     dir_path = os.path.dirname(filename)
     if dir_path:
         os.makedirs(dir_path, exist_ok=True)
     
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, default=str, ensure_ascii=False)
+        write_json(filename, data, json_format)
         print(f"  ✓ Saved: {filename}")
         return True
     except Exception as e:
         print(f"  ✗ Error saving {filename}: {e}")
         return False
 
-def load_json_file(filename):
-    """Load data from JSON file."""
+def load_json_file(filename, action_scripts_corpus=None):
+    """
+    Load data from JSON file (pretty, compact or gzip). Given the corpus, the usage
+    example references of an API details file are bound to its scripts.
+    """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        data = read_json(filename)
     except FileNotFoundError:
         print(f"  ⚠ File not found: {filename}")
         return None
     except Exception as e:
         print(f"  ✗ Error loading {filename}: {e}")
         return None
+    if action_scripts_corpus is not None and isinstance(data, dict) and "api_objects" in data:
+        rehydrate_usage_examples(data["api_objects"], action_scripts_corpus)
+    return data
 
 def clean_sql_text(sql_text):
     """Clean SQL text by removing comments and extra whitespace."""
@@ -57,38 +64,14 @@ def clean_sql_text(sql_text):
     
     return cleaned.strip()
 
+# Sample parameter values come from the shared typed value-provider registry,
+# with the literals this module has always used for numbers and free text
+SAMPLE_VALUES = build_default_registry({
+    "number": "100",
+    "description": "N'Sample Description'",
+    "default": "N'Sample Value'"
+})
+
 def generate_sample_value(param_name, param_type):
     """Generate sample values for parameters based on name and type."""
-    param_name_lower = param_name.lower() if param_name else ''
-    param_type_lower = param_type.lower() if param_type else ''
-    
-    # ID parameters
-    if 'id' in param_name_lower:
-        if 'user_id' in param_name_lower:
-            return "1001"
-        elif 'card_id' in param_name_lower:
-            return "2001" 
-        else:
-            return "123"
-    
-    # Boolean parameters
-    if param_type_lower == 'bit' or 'is_' in param_name_lower:
-        return "1"
-    
-    # Date parameters
-    if 'date' in param_name_lower or 'datetime' in param_type_lower:
-        return "GETDATE()"
-    
-    # Numeric parameters
-    if any(t in param_type_lower for t in ['int', 'decimal', 'numeric', 'float', 'money']):
-        return "100"
-    
-    # String parameters
-    if 'name' in param_name_lower:
-        return "N'Sample Name'"
-    elif 'description' in param_name_lower:
-        return "N'Sample Description'"
-    elif 'email' in param_name_lower:
-        return "N'user@example.com'"
-    else:
-        return "N'Sample Value'"
+    return SAMPLE_VALUES.sample(param_name, param_type)
@@ -16,6 +16,15 @@ import argparse
 from dotenv import load_dotenv
 from framework_training.training_generator import TrainingExampleGenerator
 from framework_training.utils import save_json_file
+from framework_training.dependency_graph import ProcedureDependencyGraph
+from framework_training.similarity_index import ScriptSimilarityIndex
+from framework_training.metadata_store import MetadataStore, STORE_KEYS
+from framework_training.usage_refs import UsageExampleRefs, build_script_lookup, rehydrate_usage_examples
+from framework_training.serialization import write_json
+from framework_training.persistence import BackgroundWriter, read_verified_json
+from framework_training.corpus_blob import CorpusBlobStore
+from framework_training.run_fingerprint import build_fingerprint, definition_hash, diff_fingerprints
+import atexit
 
 # Global variable for training availability
 TRAINING_AVAILABLE = True
@@ -72,6 +81,14 @@ API_DETAILS_MEMORY_FILE = "framework_api_details.json"
 ACTION_SCRIPTS_CORPUS_FILE = "action_scripts_corpus.json"
 TRAINING_GUIDE_OUTPUT_FILE = "tsql_app_training_guide_data.json"
 PREVIOUS_RUN_SUMMARY_FILE = "previous_run_summary.json"
+DEPENDENCY_GRAPH_FILE = "framework_dependency_graph.json"
+# Per-object/per-script hashes of the last run and the diff against the run before it
+RUN_FINGERPRINT_FILE = "run_fingerprint.json"
+RUN_DIFF_FILE = "run_diff.json"
+# Memory-mapped copy of the corpus (UTF-8 blob + offset index) shared by analysis workers
+CORPUS_BLOB_FILE = "action_scripts_corpus.blob"
+# SQLite store backing the schema/API/corpus memory files (set to empty to keep plain JSON files)
+METADATA_STORE_FILE = os.getenv("METADATA_STORE_FILE", "tsql_app_metadata.db")
 # Define the name of your SQL view for parameter info
 SQL_VIEW_FOR_PARAM_INFO = os.getenv("SQL_VIEW_FOR_PARAM_INFO", "dbo.tsql_app_parameter_info_3")
 
@@ -96,7 +113,9 @@ if missing_configs:
 _discovered_schema_cache = {}
 _framework_api_details_cache = {}
 _action_scripts_corpus_cache = {}
+_dependency_graph_cache = {}
 _previous_run_summary = {}
+_metadata_store = None
 
 # --- Helper Functions ---
 def execute_query(sql, params=None, fetch_one=False):
@@ -132,18 +151,58 @@ def execute_query(sql, params=None, fetch_one=False):
     return results
 
 
+def get_metadata_store():
+    global _metadata_store
+    if _metadata_store is None and METADATA_STORE_FILE:
+        _metadata_store = MetadataStore(METADATA_STORE_FILE)
+    return _metadata_store
+
+def memory_store_key(filepath):
+    return STORE_KEYS.get(os.path.basename(filepath)) if METADATA_STORE_FILE else None
+
 def load_memory_file(filepath, cache_dict_ref_to_update):
-    if os.path.exists(filepath):
+    store_key = memory_store_key(filepath)
+    if store_key:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                loaded_data = json.load(f)
-                cache_dict_ref_to_update.clear()
-                cache_dict_ref_to_update.update(loaded_data)
-            return True
+            store = get_metadata_store()
+            if not store.has_document(store_key) and os.path.exists(filepath):
+                store.import_json_file(store_key, filepath)
+                print(f"MEMORY_STORE: Imported '{filepath}' into '{METADATA_STORE_FILE}'.")
+            return store.load_into(store_key, cache_dict_ref_to_update)
         except Exception as e:
-            print(f"MEMORY_ERROR: Could not load '{filepath}': {e}")
+            print(f"MEMORY_ERROR: Could not load '{store_key}' from '{METADATA_STORE_FILE}': {e}")
+            return False
+    if os.path.exists(filepath):
+        loaded_data, rejection_reason = read_verified_json(filepath)
+        if rejection_reason:
+            print(f"MEMORY_ERROR: Rejected '{filepath}': {rejection_reason}")
+            return False
+        cache_dict_ref_to_update.clear()
+        cache_dict_ref_to_update.update(loaded_data)
+        if os.path.basename(filepath) in (API_DETAILS_MEMORY_FILE, ACTION_SCRIPTS_CORPUS_FILE):
+            rehydrate_memory_caches()
+        return True
     return False
 
+def rehydrate_memory_caches():
+    """Bind the API's stored usage example references to the corpus once both memory files are loaded."""
+    api_objects, scripts = _framework_api_details_cache.get("api_objects"), _action_scripts_corpus_cache.get("scripts")
+    if api_objects and scripts:
+        rehydrate_usage_examples(api_objects, scripts)
+
+def report_memory_save(filepath, bytes_written, error):
+    if error: print(f"MEMORY_ERROR: Could not save to '{filepath}': {error}")
+    else: print(f"MEMORY_SAVE: Saved data to '{filepath}' ({bytes_written:,} bytes).")
+
+# Memory files are encoded and written atomically on a background thread; flush_memory_writes() is the join point
+_memory_writer = BackgroundWriter(on_complete=report_memory_save)
+atexit.register(_memory_writer.join)
+
+def flush_memory_writes():
+    failed_writes = _memory_writer.join()
+    if failed_writes: print(f"MEMORY_ERROR: {len(failed_writes)} memory file(s) could not be saved.")
+    return not failed_writes
+
 def save_memory_file(filepath, data_dict_to_save):
     if not isinstance(data_dict_to_save, dict):
         return
@@ -157,12 +216,15 @@ def save_memory_file(filepath, data_dict_to_save):
     dict_to_actually_save["metadata"]["last_updated"] = datetime.now().isoformat()
     if "source" not in dict_to_actually_save["metadata"]:
         dict_to_actually_save["metadata"]["source"] = "script_save"
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(dict_to_actually_save, f, indent=4, default=str)
-        print(f"MEMORY_SAVE: Saved data to '{filepath}'.")
-    except Exception as e:
-        print(f"MEMORY_ERROR: Could not save to '{filepath}': {e}")
+    store_key = memory_store_key(filepath)
+    if store_key:
+        try:
+            get_metadata_store().save_document(store_key, dict_to_actually_save)
+            print(f"MEMORY_SAVE: Saved '{store_key}' to '{METADATA_STORE_FILE}'.")
+        except Exception as e:
+            print(f"MEMORY_ERROR: Could not save '{store_key}' to '{METADATA_STORE_FILE}': {e}")
+        return
+    _memory_writer.submit(filepath, dict_to_actually_save)
 
 def discover_table_schema_from_db(schema_name, table_name, local_args):
     global _discovered_schema_cache
@@ -476,10 +538,26 @@ def get_framework_objects_info(framework_object_name_patterns, local_args):
         objects_info.append({"schema_name": obj['SchemaName'], "object_name": obj['ObjectName'], "object_type": obj['ObjectTypeDesc'],
                              "object_type_short": obj_type_short, "parameters": sorted(final_params, key=lambda p: p.get('order', 999)),
                              "embedded_example": extract_special_comment_block(obj['DefinitionText'], "code"),
-                             "embedded_description": extract_special_comment_block(obj['DefinitionText'], "help.description"), "co_occurrence_stats": {}})
+                             "embedded_description": extract_special_comment_block(obj['DefinitionText'], "help.description"), "co_occurrence_stats": {},
+                             "definition_hash": definition_hash(obj['DefinitionText'])})
     _framework_api_details_cache["api_objects"], _framework_api_details_cache["metadata"]["source"] = objects_info, "db_discovery_full_with_view_attempt"
+    build_dependency_graph(objects_info, framework_objects, safe_object_ids_str)
     return objects_info
 
+def build_dependency_graph(objects_info, framework_objects, safe_object_ids_str):
+    global _dependency_graph_cache
+    sql_dependencies = f"""SELECT OBJECT_SCHEMA_NAME(d.referencing_id) AS ReferencingSchema, OBJECT_NAME(d.referencing_id) AS ReferencingName,
+                                ISNULL(d.referenced_schema_name, 'dbo') AS ReferencedSchema, d.referenced_entity_name AS ReferencedName
+                         FROM sys.sql_expression_dependencies AS d WHERE d.referencing_id IN ({safe_object_ids_str});"""
+    dependency_rows = execute_query(sql_dependencies)
+    if dependency_rows is None: print("FRAMEWORK_API: sys.sql_expression_dependencies unavailable. Using parsed definitions only.")
+    definitions = {f"{obj['SchemaName']}.{obj['ObjectName']}": obj['DefinitionText'] for obj in framework_objects if obj['DefinitionText']}
+    graph = ProcedureDependencyGraph.build(objects_info, definitions=definitions, dependency_rows=dependency_rows)
+    _dependency_graph_cache.clear()
+    _dependency_graph_cache.update(graph.to_dict())
+    print(f"FRAMEWORK_API: Dependency graph built with {graph.edge_count()} edges between {len(graph.names)} objects.")
+    return graph
+
 def get_action_scripts_source(table_name, sql_column_name_options, local_args, id_col_name='id', name_col_name='name', max_scripts=50):
     actual_cols_info = get_actual_columns_for_table('dbo', table_name, local_args)
     if not actual_cols_info: return []
@@ -518,15 +596,16 @@ def get_action_scripts_source(table_name, sql_column_name_options, local_args, i
 
 
 def get_real_usage_examples(sp_name_to_search, local_args, max_examples=3):
-    examples, corpus_to_search, found_count = [], _action_scripts_corpus_cache.get("scripts", []), 0
+    corpus_to_search = _action_scripts_corpus_cache.get("scripts", [])
     if not corpus_to_search: return []
-    pattern = r'\b(?:EXEC\s+)?(?:dbo\.)?' + re.escape(sp_name_to_search) + r'\b'
-    for script_info in corpus_to_search:
-        sql_text = script_info.get('sql_source')
-        if sql_text and re.search(pattern, sql_text, re.IGNORECASE):
-            examples.append(script_info); found_count +=1
-            if found_count >= max_examples: break
-    return examples
+    similarity_index = ScriptSimilarityIndex.for_corpus(corpus_to_search)
+    return similarity_index.select_representative_examples([sp_name_to_search], k=max_examples)[sp_name_to_search]
+
+def assign_real_usage_examples(framework_api_details, action_scripts_corpus, max_examples=3):
+    similarity_index = ScriptSimilarityIndex.for_corpus(action_scripts_corpus)
+    examples_by_object = similarity_index.select_representative_examples([api_obj['object_name'] for api_obj in framework_api_details], k=max_examples)
+    script_lookup = build_script_lookup(action_scripts_corpus)
+    for api_obj in framework_api_details: api_obj['real_usage_examples'] = UsageExampleRefs.from_scripts(examples_by_object[api_obj['object_name']], script_lookup)
 
 def analyze_action_script_content(sql_source_text, framework_api_ref):
     findings = {'sps_called': [], 'udfs_called': [], 'context_vars_found': set()}
@@ -648,8 +727,7 @@ def generate_simple_training_examples(framework_api_details, output_filename="si
     }
     
     try:
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(training_data, f, indent=4, default=str)
+        write_json(output_filename, training_data)
         print(f"TRAINING: Saved {len(training_examples)} examples to {output_filename}")
     except Exception as e:
         print(f"TRAINING: Error saving file: {e}")
@@ -758,8 +836,14 @@ if __name__ == "__main__":
         current_action_script_corpus = (get_action_scripts_source('api_card_actions', ['unparsed_sql', 'sql_script'], script_args_global, max_scripts=mca) or []) + \
                                        (get_action_scripts_source('api_actions', ['sql_script', 'unparsed_sql'], script_args_global, max_scripts=maa) or [])
         _action_scripts_corpus_cache["scripts"] = current_action_script_corpus
+    if current_action_script_corpus:
+        try:
+            corpus_blob = CorpusBlobStore.ensure(current_action_script_corpus, CORPUS_BLOB_FILE)
+            print(f"ACTION_SCRIPTS_CORPUS: {len(corpus_blob)} scripts available in '{CORPUS_BLOB_FILE}' ({corpus_blob.metadata.get('total_bytes', 0):,} bytes).")
+        except Exception as e:
+            print(f"MEMORY_ERROR: Could not write corpus blob '{CORPUS_BLOB_FILE}': {e}")
     if current_framework_api and current_action_script_corpus:
-        for api_obj in current_framework_api: api_obj['real_usage_examples'] = get_real_usage_examples(api_obj['object_name'], script_args_global, 3)
+        assign_real_usage_examples(current_framework_api, current_action_script_corpus, 3)
     analyzed_script_patterns_sample, all_script_findings_for_cooccurrence = [], []
     if current_action_script_corpus and current_framework_api:
         print(f"ANALYZING_SCRIPTS: Analyzing {len(current_action_script_corpus)} action scripts from corpus...")
@@ -828,6 +912,17 @@ if __name__ == "__main__":
         for key, current_val in current_run_summary.items():
             if key == "generation_timestamp": continue
             print(f"  {key.replace('_',' ').title()}: {current_val}")
+    print("\n--- Object Fingerprint Diff (Current vs. Previous) ---")
+    previous_fingerprint = {}; load_memory_file(RUN_FINGERPRINT_FILE, previous_fingerprint)
+    usage_counts = Counter(name for finding in all_script_findings_for_cooccurrence
+                           for name in set(finding["analysis_findings"].get('sps_called', [])) | set(finding["analysis_findings"].get('udfs_called', [])))
+    current_fingerprint = build_fingerprint(current_framework_api, current_action_script_corpus, usage_counts)
+    run_diff = diff_fingerprints(previous_fingerprint, current_fingerprint)
+    if run_diff["baseline"]: print("  No previous fingerprint found; this run is the baseline.")
+    else:
+        for key, count in run_diff["summary"].items():
+            names = [item["object"] if isinstance(item, dict) else item for item in run_diff[key][:5]]
+            print(f"  {key.replace('_',' ').title()}: {count}" + (f" ({', '.join(names)}{', ...' if count > 5 else ''})" if count else ""))
     final_output_data = {"metadata": {"run_summary": current_run_summary, "schema_memory_source": _discovered_schema_cache.get("metadata",{}).get("source","init"),
                                      "api_memory_source": _framework_api_details_cache.get("metadata",{}).get("source","init"),
                                      "scripts_corpus_source": _action_scripts_corpus_cache.get("metadata",{}).get("source","init"),
@@ -838,7 +933,12 @@ if __name__ == "__main__":
                                                             "analysis_samples": analyzed_script_patterns_sample}}
     save_memory_file(TRAINING_GUIDE_OUTPUT_FILE, final_output_data)
     if script_args_global.rediscover_schema or not schema_loaded : save_memory_file(SCHEMA_MEMORY_FILE, _discovered_schema_cache)
-    if script_args_global.rediscover_api or not api_loaded : save_memory_file(API_DETAILS_MEMORY_FILE, _framework_api_details_cache)
+    if script_args_global.rediscover_api or not api_loaded :
+        save_memory_file(API_DETAILS_MEMORY_FILE, _framework_api_details_cache)
+        if _dependency_graph_cache.get("objects"): save_memory_file(DEPENDENCY_GRAPH_FILE, _dependency_graph_cache)
     if script_args_global.refresh_action_scripts or not corpus_loaded : save_memory_file(ACTION_SCRIPTS_CORPUS_FILE, _action_scripts_corpus_cache)
     save_memory_file(PREVIOUS_RUN_SUMMARY_FILE, current_run_summary.copy())
+    save_memory_file(RUN_FINGERPRINT_FILE, current_fingerprint)
+    save_memory_file(RUN_DIFF_FILE, run_diff)
+    flush_memory_writes()
     print("\n--- Script Finished ---")
\ No newline at end of file